@@ -0,0 +1,8 @@
+"""Performance benchmarks for the loader and query client; run modules with `python -m benchmarks.<name>`."""
+import sys
+from pathlib import Path
+
+# The src modules import each other by bare name, as when running src/main.py.
+SRC_PATH = str(Path(__file__).resolve().parents[1] / "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
@@ -0,0 +1,93 @@
+"""
+Compare fanning out queries through AsyncClient with running them through Client in sequence.
+
+    python -m benchmarks.bench_async --data-path data --clip-groups 4 --pool-sizes 1 2 4 8
+
+Loads the data into a temporary database (or opens --db-path), then times one fan-out: a
+query_detection_stats call per vehicle type and clip group. Prints, as JSON, the median wall
+time of the sequential run and of AsyncClient at each pool size, with its speedup.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import duckdb
+
+from async_client import AsyncClient
+from client import Client
+from data_loader import DataLoader
+
+
+def fan_out_specs(conn: duckdb.DuckDBPyConnection, clip_groups: int) -> List[Dict[str, Any]]:
+    """One spec per vehicle type and group of clip names, like a service answering one request."""
+    vehicles = [v for (v,) in conn.execute("SELECT DISTINCT vehicle_type FROM interview_table ORDER BY 1").fetchall()]
+    clips = [c for (c,) in conn.execute("SELECT DISTINCT clip_name FROM interview_table ORDER BY 1").fetchall()]
+    groups = [clips[i::clip_groups] for i in range(min(clip_groups, len(clips)))]
+    return [{"vehicle_types": [vehicle], "clip_names": group} for vehicle in vehicles for group in groups]
+
+
+def _median_ms(run, repeat: int) -> float:
+    run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run(db_path: str, clip_groups: int, pool_sizes: List[int], repeat: int) -> Dict[str, Any]:
+    with duckdb.connect(db_path, read_only=True) as conn:
+        specs = fan_out_specs(conn, clip_groups)
+        client = Client(conn)
+        sequential_ms = _median_ms(lambda: [client.query_detection_stats(**spec, result_format="arrow") for spec in specs], repeat)
+
+        report: Dict[str, Any] = {"queries": len(specs), "sequential_ms": sequential_ms, "async": []}
+        for pool_size in pool_sizes:
+            async_client = AsyncClient(conn, pool_size=pool_size)
+            loop = asyncio.new_event_loop()
+
+            async def gather():
+                return await asyncio.gather(
+                    *(async_client.query_detection_stats(**spec, result_format="arrow") for spec in specs)
+                )
+
+            def fan_out():
+                return loop.run_until_complete(gather())
+
+            try:
+                elapsed_ms = _median_ms(fan_out, repeat)
+            finally:
+                loop.close()
+                async_client.close()
+            report["async"].append({"pool_size": pool_size, "median_ms": elapsed_ms, "speedup": sequential_ms / elapsed_ms})
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-path", type=str, default=None, help="Existing database to query (default: load --data-path into a temporary one)")
+    parser.add_argument("--data-path", type=str, default="data", help="Directory of parquet files (default: data)")
+    parser.add_argument("--clip-groups", type=int, default=4, help="Clip groups per vehicle type in the fan-out (default: 4)")
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8], help="AsyncClient pool sizes to time (default: 1 2 4 8)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per configuration (default: 5)")
+    args = parser.parse_args()
+
+    if args.db_path is not None:
+        report = run(args.db_path, args.clip_groups, args.pool_sizes, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "bench.duckdb")
+            with DataLoader(args.data_path, db_path) as loader:
+                loader.load_data()
+            report = run(db_path, args.clip_groups, args.pool_sizes, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare querying parquet files in place (Client.from_parquet_index) with the ingested table.
+
+    python -m benchmarks.bench_parquet_mode --data-path data --repeat 20
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import duckdb
+
+from client import Client
+from data_loader import DataLoader
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median_ms": statistics.median(samples) * 1000, "min_ms": min(samples) * 1000}
+
+
+def query_shapes(index_path: Path) -> Dict[str, Dict[str, Any]]:
+    """A handful of representative filters, with clip and vehicle values taken from the index."""
+    files = json.loads(index_path.read_text())["files"]
+    clip = files[0]["clip_names"][0]
+    vehicle = sorted({v for entry in files for v in entry["vehicle_types"]})[0]
+    return {
+        "all": {},
+        "one_clip": {"clip_names": [clip]},
+        "one_vehicle": {"vehicle_types": [vehicle]},
+        "clip_frame_window": {"clip_names": [clip], "min_frame_id": 100, "max_frame_id": 200},
+        "frame_window": {"min_frame_id": 100, "max_frame_id": 200},
+    }
+
+
+def run(data_path: str, repeat: int) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "bench.duckdb")
+        index_path = Path(tmpdir) / "index.json"
+
+        start = time.perf_counter()
+        with DataLoader(data_path, db_path) as loader:
+            loader.load_data()
+        ingest_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with DataLoader(data_path, ":memory:") as loader:
+            loader.build_parquet_index(str(index_path))
+        index_s = time.perf_counter() - start
+
+        print(f"ingest: {ingest_s:.2f}s, index only: {index_s:.2f}s")
+
+        results = []
+        with duckdb.connect(db_path, read_only=True) as conn:
+            ingested = Client(conn)
+            in_place = Client.from_parquet_index(str(index_path))
+            for name, params in query_shapes(index_path).items():
+                pruned = len(in_place._prune_files(
+                    params.get("vehicle_types"), params.get("clip_names"),
+                    params.get("min_frame_id"), params.get("max_frame_id"),
+                ))
+                row = {
+                    "shape": name,
+                    "files_scanned": f"{pruned}/{len(in_place.parquet_files)}",
+                    "ingested": _time(lambda: ingested.query_detection_stats(**params), repeat),
+                    "parquet": _time(lambda: in_place.query_detection_stats(**params), repeat),
+                }
+                results.append(row)
+                print(
+                    f"{name:<18} files {row['files_scanned']:>7}  "
+                    f"ingested {row['ingested']['median_ms']:8.1f} ms  "
+                    f"parquet {row['parquet']['median_ms']:8.1f} ms"
+                )
+            in_place.conn.close()
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-path", type=str, default="data", help="Directory of parquet files (default: data)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query shape (default: 10)")
+    args = parser.parse_args()
+    run(args.data_path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Measure how validation, loading and queries scale with the data size.
+
+    python -m benchmarks.bench_scaling --rows 10000000 --output results/10m.json
+    python -m benchmarks.bench_scaling --rows 10000000 --baseline results/10m.json
+
+Synthetic data is generated with benchmarks.generate unless --data-path points at existing
+parquet files. Each query shape is timed --repeat times after a warm-up run; the report gives
+p50/p95 latency, rows/sec over the loaded table and the peak RSS of each stage, and the time
+DuckDB spends planning each query, as JSON, with the git commit so runs can be compared
+across commits.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import duckdb
+
+from benchmarks.generate import add_generator_arguments, generate, generator_kwargs
+from client import Client
+from data_loader import DataLoader
+
+
+def _reset_peak_rss() -> None:
+    # Linux lets a process reset its own high-water mark; elsewhere the peak is cumulative.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB since the last reset."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 1024
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def measure(fn: Callable[[], Any], repeat: int, rows: int) -> Dict[str, float]:
+    """Time `fn` after one warm-up call; rows/sec is `rows` over the median latency."""
+    _reset_peak_rss()
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    p50 = percentile(samples, 50)
+    return {
+        "p50_ms": p50 * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "rows_per_sec": rows / p50 if p50 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure_once(fn: Callable[[], Any], rows: int) -> Dict[str, float]:
+    _reset_peak_rss()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed else None, "peak_rss_mb": peak_rss_mb()}
+
+
+def query_shapes(conn: duckdb.DuckDBPyConnection) -> Dict[str, Dict[str, Any]]:
+    """The query matrix: filter combinations, with clip and vehicle values taken from the data."""
+    clips = [row[0] for row in conn.execute(
+        "SELECT DISTINCT clip_name::VARCHAR FROM interview_table ORDER BY 1 LIMIT 100"
+    ).fetchall()]
+    vehicle = conn.execute(
+        "SELECT vehicle_type::VARCHAR FROM interview_table GROUP BY 1 ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()[0]
+    return {
+        "all": {},
+        "fine_bins": {"distance_bin_size": 1},
+        "one_clip": {"clip_names": clips[:1]},
+        "ten_clips": {"clip_names": clips[:10]},
+        "hundred_clips": {"clip_names": clips},
+        "top_vehicle": {"vehicle_types": [vehicle]},
+        "near_range": {"min_distance": 1, "max_distance": 20},
+        "min_frames": {"min_frames": 100},
+        "frame_window": {"min_frame_id": 100, "max_frame_id": 200},
+        "clip_frame_window": {"clip_names": clips[:1], "min_frame_id": 100, "max_frame_id": 200},
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    data_path: Optional[str],
+    repeat: int,
+    generator: Dict[str, Any],
+    clustered: bool = False,
+    validation_executor: str = "thread",
+) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report: Dict[str, Any] = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "duckdb": duckdb.__version__,
+            "cpu_count": os.cpu_count(),
+            "clustered": clustered,
+            "validation_executor": validation_executor,
+        }
+        stages: Dict[str, Any] = {}
+
+        if data_path is None:
+            data_path = str(Path(tmpdir) / "data")
+            report["generator"] = generator
+            stages["generate"] = measure_once(lambda: generate(data_path, **generator), generator["rows"])
+        else:
+            report["data_path"] = data_path
+
+        files = sorted(Path(data_path).resolve().glob("*.parquet"))
+        with duckdb.connect() as conn:
+            rows = conn.execute(
+                "SELECT SUM(num_rows) FROM parquet_file_metadata($1)", [[str(f) for f in files]]
+            ).fetchone()[0]
+        report["rows"], report["files"] = rows, len(files)
+
+        with DataLoader(data_path, ":memory:", validation_executor=validation_executor) as loader:
+            stages["validate"] = measure_once(lambda: loader._validate_files(files), rows)
+
+        db_path = str(Path(tmpdir) / "bench.duckdb")
+        with DataLoader(data_path, db_path, validation_executor=validation_executor, clustered=clustered) as loader:
+            stages["load"] = measure_once(loader.load_data, rows)
+        report["stages"] = stages
+
+        queries: Dict[str, Any] = {}
+        with duckdb.connect(db_path, read_only=True) as conn:
+            client = Client(conn)
+            profiled = Client(conn, profile=True)
+            shapes = query_shapes(conn)
+            for name, params in shapes.items():
+                queries[name] = measure(lambda: client.query_detection_stats(**params), repeat, rows)
+                profiled.query_detection_stats(**params)
+                queries[name]["planning_ms"] = profiled.last_profile["explain_analyze"]["planning_ms"]
+            queries["batch_all_shapes"] = measure(
+                lambda: client.query_detection_stats_batch(list(shapes.values())), repeat, rows
+            )
+            # The same shapes one call at a time, which the batch should beat.
+            queries["sequential_all_shapes"] = measure(
+                lambda: [client.query_detection_stats(**params) for params in shapes.values()], repeat, rows
+            )
+        report["queries"] = queries
+        return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """One line per stage and query with the p50 (or elapsed) change against `baseline`."""
+    lines = [f"vs {baseline.get('commit')} ({baseline.get('rows')} rows) -> {report.get('commit')} ({report.get('rows')} rows)"]
+    for section, key in (("stages", "seconds"), ("queries", "p50_ms")):
+        for name, result in report[section].items():
+            before = baseline.get(section, {}).get(name, {}).get(key)
+            if not before:
+                continue
+            change = (result[key] - before) / before * 100
+            lines.append(f"  {name:<18} {before:10.2f} -> {result[key]:10.2f} {key}  ({change:+.1f}%)")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-path", type=str, default=None, help="Benchmark existing parquet files instead of generating data")
+    add_generator_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query shape (default: 20)")
+    parser.add_argument("--cluster", action="store_true", help="Load with the clustered layout (see setup_db.py --cluster)")
+    parser.add_argument("--validation-executor", choices=DataLoader.VALIDATION_EXECUTORS, default="thread", help="Validation pool type (default: thread)")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", type=str, default=None, help="JSON report of an earlier run to compare against")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1.")
+
+    report = run(args.data_path, args.repeat, generator_kwargs(args), args.cluster, args.validation_executor)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print("\n".join(compare(report, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
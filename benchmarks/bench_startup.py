@@ -0,0 +1,75 @@
+"""
+Check the CLI's fixed startup cost against a budget.
+
+    python -m benchmarks.bench_startup --repeat 10 --budget-ms 100
+
+Reports, as JSON, the cumulative `python -X importtime` cost of importing main.py, the heavy
+modules that import pulls in, and wall times of `main.py --help` and of an argument error next
+to a bare interpreter start. Exits non-zero if the import time exceeds the budget or pandas,
+pyarrow or DuckDB is loaded before a query actually runs.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "duckdb")
+
+
+def _wall_ms(args: List[str], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=SRC_PATH, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def import_profile() -> Dict[str, object]:
+    """Cumulative import time of main in ms, and which heavy modules importing it loads."""
+    code = f"import json, sys, main; print(json.dumps(sorted(set({HEAVY_MODULES!r}) & set(sys.modules))))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=SRC_PATH, capture_output=True, text=True, check=True
+    )
+    # Lines look like "import time:  self [us] | cumulative | imported package".
+    cumulative = next(
+        int(line.split("|")[1]) for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[2].strip() == "main"
+    )
+    return {"import_main_ms": cumulative / 1000, "heavy_modules": json.loads(result.stdout)}
+
+
+def run(repeat: int) -> Dict[str, object]:
+    report = import_profile()
+    # The import time varies run to run; keep the best of a few like the wall times keep the median.
+    report["import_main_ms"] = min([report["import_main_ms"]] + [import_profile()["import_main_ms"] for _ in range(2)])
+    report["python_startup_ms"] = _wall_ms(["-c", "pass"], repeat)
+    report["help_ms"] = _wall_ms(["main.py", "--help"], repeat)
+    report["arg_error_ms"] = _wall_ms(["main.py", "--min-frames", "0"], repeat)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per timed command (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Maximum cumulative import time of main.py (default: 100)")
+    args = parser.parse_args()
+
+    report = run(args.repeat)
+    report["budget_ms"] = args.budget_ms
+    print(json.dumps(report, indent=2))
+
+    if report["heavy_modules"]:
+        sys.exit(f"Importing main.py loads {', '.join(report['heavy_modules'])}; keep them behind the query path.")
+    if report["import_main_ms"] > args.budget_ms:
+        sys.exit(f"Importing main.py took {report['import_main_ms']:.1f} ms, over the {args.budget_ms:.0f} ms budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Write synthetic detection parquet files matching DataLoader.REQUIRED_COLUMNS.
+
+    python -m benchmarks.generate --out-dir /tmp/detections --rows 10000000 --files 20
+
+Rows are split evenly across clips in order, and each clip's rows across its frames, so
+files hold contiguous runs of clips like the real data. Vehicle types follow a Zipf-like
+skew (mostly cars). Detection is a Bernoulli draw whose rate can fall off linearly with
+distance. Output is deterministic for a given seed, and memory stays bounded by
+`chunk_rows` however many rows are written.
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_loader import DataLoader
+
+VEHICLE_TYPES = ["car", "truck", "van", "trailer", "bicycle", "bike", "bus", "pickup", "scooter", "trike"]
+
+SCHEMA = pa.schema([
+    ("clip_name", pa.string()),
+    ("frame_id", pa.int64()),
+    ("vehicle_type", pa.string()),
+    ("detection", pa.bool_()),
+    ("distance", pa.int64()),
+])
+assert SCHEMA.names == list(DataLoader.REQUIRED_COLUMNS)
+
+
+def vehicle_names(count: int) -> List[str]:
+    """The first `count` real vehicle type names, then vehicle_<i> for any beyond them."""
+    return VEHICLE_TYPES[:count] + [f"vehicle_{i}" for i in range(len(VEHICLE_TYPES), count)]
+
+
+def _chunk(
+    start: int,
+    stop: int,
+    rows: int,
+    clips: int,
+    frames_per_clip: int,
+    vehicles: np.ndarray,
+    weights: np.ndarray,
+    detection_rate: float,
+    distance_decay: float,
+    rng: np.random.Generator,
+) -> pa.Table:
+    row = np.arange(start, stop, dtype=np.int64)
+    clip = row * clips // rows
+    first = -(-clip * rows // clips)
+    rows_in_clip = -(-(clip + 1) * rows // clips) - first
+    low, high = DataLoader.DISTANCE_RANGE
+    distance = rng.integers(low, high + 1, size=len(row))
+    rate = detection_rate * (1 - distance_decay * (distance - low) / max(high - low, 1))
+    names = np.array([f"SYN_clip_{i:06d}" for i in range(clip[0], clip[-1] + 1)])
+    return pa.Table.from_arrays(
+        [
+            pa.array(names[clip - clip[0]]),
+            pa.array((row - first) * frames_per_clip // rows_in_clip),
+            pa.array(vehicles[rng.choice(len(vehicles), size=len(row), p=weights)]),
+            pa.array(rng.random(len(row)) < rate),
+            pa.array(distance),
+        ],
+        schema=SCHEMA,
+    )
+
+
+def generate(
+    out_dir: str,
+    rows: int,
+    files: int = 10,
+    clips: int = 200,
+    frames_per_clip: int = 540,
+    vehicle_types: int = 8,
+    detection_rate: float = 0.75,
+    distance_decay: float = 0.0,
+    seed: int = 0,
+    chunk_rows: int = 1_000_000,
+    row_group_size: Optional[int] = None,
+) -> List[Path]:
+    """
+    Write `rows` rows across `files` parquet files in `out_dir` and return their paths.
+
+    `detection_rate` is the probability of a detection at the minimum distance; with
+    `distance_decay` d it falls linearly to `detection_rate * (1 - d)` at the maximum.
+    """
+    if rows < 1 or files < 1 or clips < 1 or frames_per_clip < 1 or vehicle_types < 1:
+        raise ValueError("rows, files, clips, frames_per_clip and vehicle_types must be positive.")
+    if not 0 <= detection_rate <= 1 or not 0 <= distance_decay <= 1:
+        raise ValueError("detection_rate and distance_decay must be between 0 and 1.")
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    vehicles = np.array(vehicle_names(vehicle_types))
+    weights = 1 / np.arange(1, vehicle_types + 1) ** 2
+    weights /= weights.sum()
+
+    paths = []
+    for file_index in range(files):
+        path = out / f"synthetic_{file_index:04d}.parquet"
+        file_start, file_stop = file_index * rows // files, (file_index + 1) * rows // files
+        with pq.ParquetWriter(path, SCHEMA) as writer:
+            for chunk_index, start in enumerate(range(file_start, file_stop, chunk_rows)):
+                rng = np.random.default_rng([seed, file_index, chunk_index])
+                table = _chunk(
+                    start, min(start + chunk_rows, file_stop), rows, clips, frames_per_clip,
+                    vehicles, weights, detection_rate, distance_decay, rng,
+                )
+                writer.write_table(table, row_group_size=row_group_size)
+        paths.append(path)
+    return paths
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Total rows to generate (default: 1000000)")
+    parser.add_argument("--files", type=int, default=10, help="Number of parquet files (default: 10)")
+    parser.add_argument("--clips", type=int, default=200, help="Number of distinct clips (default: 200)")
+    parser.add_argument("--frames-per-clip", type=int, default=540, help="Frames per clip (default: 540)")
+    parser.add_argument("--vehicle-types", type=int, default=8, help="Number of distinct vehicle types (default: 8)")
+    parser.add_argument("--detection-rate", type=float, default=0.75, help="Detection probability at the minimum distance (default: 0.75)")
+    parser.add_argument("--distance-decay", type=float, default=0.0, help="Fraction of the detection rate lost by the maximum distance (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+
+def generator_kwargs(args: argparse.Namespace) -> dict:
+    return {
+        "rows": args.rows,
+        "files": args.files,
+        "clips": args.clips,
+        "frames_per_clip": args.frames_per_clip,
+        "vehicle_types": args.vehicle_types,
+        "detection_rate": args.detection_rate,
+        "distance_decay": args.distance_decay,
+        "seed": args.seed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out-dir", type=str, required=True, help="Directory to write the parquet files to")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = generate(args.out_dir, **generator_kwargs(args))
+    print(f"Wrote {args.rows} rows to {len(paths)} file(s) in {args.out_dir} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+import duckdb
+from client import Client
+from snapshots import SnapshotStore, resolve
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+
+class AsyncClient:
+    """
+    asyncio front end to Client for fanning out many queries at once.
+
+    Holds `pool_size` Clients, each on its own cursor of one DuckDB connection, and runs
+    every query on an idle one in a worker thread, so up to `pool_size` queries execute
+    concurrently (DuckDB releases the GIL while it works) and the rest wait for a cursor.
+    Callers `await` the query methods or `asyncio.gather` many of them.
+
+    A query that is cancelled or exceeds its timeout is interrupted on its cursor, and the
+    cursor returns to the pool once the worker thread has stopped. Other keyword arguments
+    are passed to each Client; with `cache_size`, every cursor keeps its own result cache.
+
+    An AsyncClient from open() follows its snapshot pointer like the server's ClientPool:
+    once a load publishes a new snapshot, later queries run on a connection to it.
+    """
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        pool_size: int = 4,
+        timeout: Optional[float] = None,
+        **client_kwargs,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be a positive number of seconds.")
+        self.conn = conn
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._client_kwargs = client_kwargs
+        self.clients = [Client(conn.cursor(), **client_kwargs) for _ in range(pool_size)]
+        self._idle: "asyncio.Queue[Client]" = asyncio.Queue()
+        for client in self.clients:
+            self._idle.put_nowait(client)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="async-client")
+        self._owns_conn = False
+        self._store: Optional[SnapshotStore] = None
+        self._snapshot = None
+        # Connections of replaced snapshots, with their Clients still running a query.
+        self._retired: List[Tuple[duckdb.DuckDBPyConnection, Set[Client]]] = []
+        self._switch_lock = asyncio.Lock()
+
+    @classmethod
+    def open(cls, db_path: str, pool_size: int = 4, **kwargs) -> "AsyncClient":
+        """
+        Create an AsyncClient on a read-only connection to the current snapshot of `db_path`
+        (see Client.open); closing the AsyncClient closes the connection.
+        """
+        store = SnapshotStore(db_path)
+        # Read before opening, so a publish in between is picked up by the first query.
+        snapshot = store.current()
+        conn = duckdb.connect(database=resolve(db_path), read_only=True)
+        try:
+            client = cls(conn, pool_size, **kwargs)
+        except Exception:
+            conn.close()
+            raise
+        client._owns_conn = True
+        client._store, client._snapshot = store, snapshot
+        return client
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for client in self.clients:
+            client.conn.close()
+        for conn, busy in self._retired:
+            for client in busy:
+                client.conn.close()
+            conn.close()
+        if self._owns_conn:
+            self.conn.close()
+
+    @property
+    def result_columns(self) -> List[str]:
+        return self.clients[0].result_columns
+
+    def data_version(self) -> Optional[int]:
+        return self.clients[0].data_version()
+
+    def cache_stats(self) -> Optional[dict]:
+        """Result cache counters summed over the pooled Clients, or None if caching is disabled."""
+        stats = [client.cache_stats() for client in self.clients]
+        if stats[0] is None:
+            return None
+        return {name: sum(s[name] for s in stats) for name in stats[0]}
+
+    async def _follow_snapshot(self) -> None:
+        """
+        Move the pool to the snapshot the pointer names, if a load published a new one.
+
+        The pointer check, the new connection and closing the old cursors run in the worker
+        threads, so opening a large snapshot doesn't stall the event loop; the lock keeps
+        concurrent queries from both switching the pool.
+        """
+        if self._store is not None:
+            # Shielded so a query cancelled mid-switch doesn't leave the pool half switched.
+            await asyncio.shield(self._switch_snapshot())
+
+    async def _switch_snapshot(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._switch_lock:
+            current = await loop.run_in_executor(self._executor, self._store.current)
+            if current is None or current == self._snapshot:
+                return
+            conn, clients = await loop.run_in_executor(self._executor, self._connect, current)
+            retired = (self.conn, set(self.clients))
+            self.conn, self.clients = conn, clients
+            # Idle Clients of the old snapshot are closed now, busy ones when their query returns.
+            closing = []
+            while not self._idle.empty():
+                client = self._idle.get_nowait()
+                retired[1].discard(client)
+                closing.append(client.conn)
+            self._retired.append(retired)
+            for client in self.clients:
+                self._idle.put_nowait(client)
+            self._snapshot = current
+            closing.extend(self._drain_retired())
+            await loop.run_in_executor(self._executor, self._close_all, closing)
+        logging.info(f"Switched to snapshot '{current.name}'.")
+
+    def _connect(self, snapshot) -> Tuple[duckdb.DuckDBPyConnection, List[Client]]:
+        conn = duckdb.connect(database=str(snapshot), read_only=True)
+        return conn, [Client(conn.cursor(), **self._client_kwargs) for _ in range(self.pool_size)]
+
+    @staticmethod
+    def _close_all(conns: List[duckdb.DuckDBPyConnection]) -> None:
+        for conn in conns:
+            conn.close()
+
+    def _drain_retired(self) -> List[duckdb.DuckDBPyConnection]:
+        """Drop the retired connections no query is using any more and return them for closing."""
+        drained = [conn for conn, busy in self._retired if not busy]
+        self._retired = [entry for entry in self._retired if entry[1]]
+        return drained
+
+    def _release(self, client: Client) -> None:
+        retired = next((entry for entry in self._retired if client in entry[1]), None)
+        if retired is None:
+            self._idle.put_nowait(client)
+        else:
+            retired[1].discard(client)
+            self._close_all([client.conn] + self._drain_retired())
+
+    async def _run(self, method: str, timeout: Optional[float], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        timeout = timeout or self.timeout
+        deadline = None if timeout is None else loop.time() + timeout
+        await asyncio.wait_for(self._follow_snapshot(), timeout)
+        remaining = None if deadline is None else max(deadline - loop.time(), 0)
+        client = await asyncio.wait_for(self._idle.get(), remaining)
+        try:
+            call = functools.partial(getattr(client, method), *args, **kwargs)
+            future = loop.run_in_executor(self._executor, call)
+            try:
+                # Shielded so a timeout or cancellation doesn't abandon the thread still using the cursor.
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                return await asyncio.wait_for(asyncio.shield(future), remaining)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                client.conn.interrupt()
+                await asyncio.wait([future])
+                # Retrieve the worker's InterruptException so asyncio doesn't log it as unhandled.
+                future.exception()
+                logging.debug(f"Interrupted {method} after cancellation or timeout.")
+                raise
+        finally:
+            self._release(client)
+
+    async def query_detection_stats(
+        self, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Union["pd.DataFrame", "pa.Table", List[Dict[str, Any]]]:
+        """
+        Client.query_detection_stats on a pooled cursor, with the same arguments.
+
+        `timeout` (default: the AsyncClient's) bounds the query in seconds, including the
+        wait for a cursor; exceeding it interrupts the query and raises asyncio.TimeoutError.
+        The "reader" result format is not supported, as the reader would keep using its
+        cursor after it returns to the pool.
+        """
+        if kwargs.get("result_format") == "reader":
+            raise ValueError("AsyncClient does not support result_format='reader'; use 'arrow' or 'records'.")
+        return await self._run("query_detection_stats", timeout, *args, **kwargs)
+
+    async def query_detection_stats_batch(
+        self, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Union[List["pd.DataFrame"], List["pa.Table"], "pd.DataFrame", "pa.Table"]:
+        """Client.query_detection_stats_batch on a pooled cursor; `timeout` as for query_detection_stats."""
+        return await self._run("query_detection_stats_batch", timeout, *args, **kwargs)
+
+    async def query_grouped_stats(
+        self, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Union["pd.DataFrame", "pa.Table", List[Dict[str, Any]]]:
+        """Client.query_grouped_stats on a pooled cursor; `timeout` and result formats as for query_detection_stats."""
+        if kwargs.get("result_format") == "reader":
+            raise ValueError("AsyncClient does not support result_format='reader'; use 'arrow' or 'records'.")
+        return await self._run("query_grouped_stats", timeout, *args, **kwargs)
@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class QueryCache:
+    """
+    Bounded in-memory result cache with LRU eviction and an optional time-to-live.
+
+    Entries are tagged with the data version they were computed against; looking up a
+    different version clears the cache so stale results are never served.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._data_version: Any = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, data_version: Any) -> None:
+        if data_version != self._data_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._data_version = data_version
+
+    def get(self, key: Hashable, data_version: Any = None) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss."""
+        self._check_version(data_version)
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, data_version: Any = None) -> None:
+        """Store `value` under `key`, evicting the least recently used entry if full."""
+        self._check_version(data_version)
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, eviction, expiration and invalidation counters plus the current size."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
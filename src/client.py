@@ -1,6 +1,22 @@
-from typing import List, Optional
-import pandas as pd
+import json
+import logging
+import os
+import time
+from statistics import NormalDist
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import duckdb
+from cache import QueryCache
+import profiling
+from profiling import PhaseTimer
+from snapshots import resolve
+
+if TYPE_CHECKING:
+    from engine import ProcessEngine
+    # pandas and pyarrow are loaded on first use (by DuckDB's result conversion), keeping
+    # them off the import path of callers that only want records, like the CLI's table output.
+    import pandas as pd
+    import pyarrow as pa
 
 
 class Client:
@@ -10,12 +26,312 @@ class Client:
 
     GROUP_FIELDS = ["vehicle_type", "clip_name"]
 
-    def __init__(self, conn: duckdb.DuckDBPyConnection):
+    RESULT_FORMATS = ("pandas", "arrow", "reader", "records")
+
+    RESULT_COLUMNS = GROUP_FIELDS + ["distance_bin", "total_frames", "detected_frames", "success_rate"]
+
+    APPROX_RESULT_COLUMNS = RESULT_COLUMNS + ["success_rate_low", "success_rate_high", "estimated"]
+
+    # Approximate groups estimated at under this many times min_frames are answered exactly,
+    # as a sampling error that large would decide whether they pass min_frames.
+    APPROX_MIN_FRAMES_MARGIN = 2
+
+    COMPARE_RESULT_COLUMNS = GROUP_FIELDS + [
+        "distance_bin",
+        "baseline_total_frames", "baseline_detected_frames", "baseline_success_rate",
+        "candidate_total_frames", "candidate_detected_frames", "candidate_success_rate",
+        "delta", "significant",
+    ]
+
+    # Dimensions query_grouped_stats can group by: SQL over the columns the raw rows and the
+    # rollup share (vehicle_type, clip_name, distance), where `?` stands for distance_bin_size.
+    # Clip names look like PNT1_Det4_210125_152642_0000_..., so the family is the first two
+    # fields and the recording date the third (yymmdd); names that don't parse give NULL.
+    DIMENSIONS: Dict[str, str] = {
+        "vehicle_type": "CAST(vehicle_type AS VARCHAR)",
+        "clip_name": "CAST(clip_name AS VARCHAR)",
+        "clip_family": "NULLIF(regexp_extract(CAST(clip_name AS VARCHAR), '^([^_]+_[^_]+)', 1), '')",
+        "clip_date": (
+            "CAST(try_strptime(regexp_extract(CAST(clip_name AS VARCHAR), '^[^_]+_[^_]+_([0-9]{6})_', 1), '%y%m%d') AS DATE)"
+        ),
+        "distance_bin": "FLOOR(distance / ?) * ?",
+    }
+
+    SUBTOTALS = ("rollup", "cube")
+
+    FILTER_DEFAULTS: Dict[str, Any] = {
+        "vehicle_types": None,
+        "clip_names": None,
+        "min_frame_id": None,
+        "max_frame_id": None,
+        "min_distance": 1,
+        "max_distance": 100,
+        "distance_bin_size": 10,
+        "min_frames": 1,
+    }
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        profile: bool = False,
+        approximate: bool = False,
+        confidence: float = 0.95,
+        min_samples: int = 30,
+        dimensions: Optional[Dict[str, str]] = None,
+    ):
         """
         Initialize the Client with a DuckDB connection.
+
+        If the loader's distance-level rollup exists next to the table, queries without a
+        frame-id filter are answered from it instead of the raw rows. Queries with one first
+        look up the clips that can have rows in the frame window in the loader's clip index
+        (see _resolve_clips), and skip the scan when there are none.
+
+        A positive `cache_size` enables an LRU result cache (entries optionally expiring after
+        `cache_ttl` seconds) that is invalidated whenever the loader bumps the data version.
+
+        Every query records phase timings in `last_profile` and publishes them to profiling
+        listeners. With `profile=True` the profile also includes DuckDB's EXPLAIN ANALYZE
+        summary, which runs the query a second time.
+
+        With `approximate=True`, query_detection_stats answers from the loader's stratified
+        sample instead (see _build_approx_query): totals are estimates, and each row carries
+        a `confidence` interval on its success rate. Groups with fewer than `min_samples`
+        sampled rows, including none, or estimated close to `min_frames`, are answered exactly.
+
+        `dimensions` adds group-by dimensions for query_grouped_stats to DIMENSIONS (or
+        overrides them), as name: SQL expression over vehicle_type, clip_name and distance.
+
+        Raises:
+            ValueError: If `approximate` is set but the database has no sample, or a
+                dimension name is not a valid identifier.
         """
         self.conn = conn
         self.table_name = "interview_table"
+        self.rollup_table_name = f"{self.table_name}_rollup"
+        self.data_version_table_name = f"{self.table_name}_data_version"
+        self.has_rollup = self._table_exists(self.rollup_table_name)
+        self.clip_index_table_name = f"{self.table_name}_clip_index"
+        self.has_clip_index = self._table_exists(self.clip_index_table_name)
+        self.has_data_version = self._table_exists(self.data_version_table_name)
+        self.cache: Optional[QueryCache] = QueryCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self.parquet_files: Optional[List[Dict[str, Any]]] = None
+        self.profile = profile
+        self.last_profile: Optional[Dict[str, Any]] = None
+        self._enum_columns: Optional[Tuple[Optional[int], Dict[str, str]]] = None
+        self.sample_table_name = f"{self.table_name}_sample"
+        self.partials_view_name = f"{self.table_name}_partials"
+        self.approximate = approximate
+        self.confidence = confidence
+        self.min_samples = min_samples
+        if approximate and not self._table_exists(self.sample_table_name):
+            raise ValueError("Approximate queries need a sample; load the data with a sample rate (setup_db.py --sample-rate).")
+        self.engine: Optional["ProcessEngine"] = None
+        self.dimensions = {**self.DIMENSIONS, **(dimensions or {})}
+        invalid = [name for name in self.dimensions if not name.isidentifier()]
+        if invalid:
+            raise ValueError(f"Dimension names must be identifiers (they name result columns), got {', '.join(invalid)}.")
+
+    @classmethod
+    def open(cls, db_path: str, **kwargs) -> "Client":
+        """
+        Create a Client on a read-only connection to the current snapshot of `db_path` (see
+        snapshots.SnapshotStore), or to `db_path` itself if it is a plain database file.
+
+        The connection stays on that snapshot while loads publish newer ones.
+        """
+        conn = duckdb.connect(database=resolve(db_path), read_only=True)
+        try:
+            return cls(conn, **kwargs)
+        except Exception:
+            conn.close()
+            raise
+
+    @classmethod
+    def from_parquet_index(
+        cls,
+        index_path: str,
+        conn: Optional[duckdb.DuckDBPyConnection] = None,
+        engine: Optional["ProcessEngine"] = None,
+        **kwargs,
+    ) -> "Client":
+        """
+        Create a Client that queries validated parquet files in place, without ingesting them.
+
+        `index_path` is the sidecar written by DataLoader.build_parquet_index. The table is a
+        view over read_parquet of the indexed files; each query only reads the files whose
+        clip names, vehicle types and frame-id range can match its filters, and DuckDB skips
+        row groups within them using the parquet min/max statistics.
+
+        With an `engine`, query_detection_stats computes partial aggregates of those files in
+        the engine's worker processes and merges them on `conn` (see _partial_queries), so
+        no single connection reads every file. Batch queries still run on `conn`.
+        """
+        with open(index_path) as f:
+            files = json.load(f)["files"]
+
+        for entry in files:
+            path = Path(entry["path"])
+            if not path.exists():
+                raise FileNotFoundError(f"Indexed file '{path}' no longer exists; rebuild the parquet index.")
+            stat = path.stat()
+            if (stat.st_size, stat.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+                logging.warning(f"Indexed file '{path.name}' changed since indexing; rebuild the parquet index.")
+
+        conn = conn if conn is not None else duckdb.connect(database=":memory:")
+        client = cls(conn, **kwargs)
+        client.parquet_files = files
+        client.engine = engine
+        conn.execute(
+            f"CREATE OR REPLACE TEMP VIEW {client.table_name} AS "
+            f"SELECT clip_name, frame_id, vehicle_type, detection, distance "
+            f"FROM {client._read_parquet([entry['path'] for entry in files])}"
+        )
+        logging.info(f"Querying {len(files)} parquet file(s) in place from '{index_path}'.")
+        return client
+
+    @staticmethod
+    def _read_parquet(paths: List[str]) -> str:
+        return "read_parquet([" + ", ".join("'" + p.replace("'", "''") + "'" for p in paths) + "])"
+
+    def _prune_files(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        files: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """
+        Paths of the indexed parquet files (by default this Client's) that can contain rows
+        matching the filters.
+        """
+        vehicles = set(vehicle_types or [])
+        clips = set(clip_names or [])
+        return [
+            entry["path"]
+            for entry in (self.parquet_files if files is None else files)
+            if entry["num_rows"] > 0
+            and (not vehicles or vehicles.intersection(entry["vehicle_types"]))
+            and (not clips or clips.intersection(entry["clip_names"]))
+            and (min_frame_id is None or entry["max_frame_id"] >= min_frame_id)
+            and (max_frame_id is None or entry["min_frame_id"] <= max_frame_id)
+            # Indexes written before per-clip summaries only have the file-level ones.
+            and ("clips" not in entry or any(
+                self._clip_matches(clip, vehicles, clips, min_frame_id, max_frame_id) for clip in entry["clips"]
+            ))
+        ]
+
+    @staticmethod
+    def _clip_matches(
+        clip: Dict[str, Any], vehicles: set, clips: set, min_frame_id: Optional[int], max_frame_id: Optional[int]
+    ) -> bool:
+        """Whether a per-clip summary of the parquet index can have rows matching the filters."""
+        return (
+            (not vehicles or bool(vehicles.intersection(clip["vehicle_types"])))
+            and (not clips or clip["clip_name"] in clips)
+            and (min_frame_id is None or clip["max_frame_id"] >= min_frame_id)
+            and (max_frame_id is None or clip["min_frame_id"] <= max_frame_id)
+        )
+
+    def _resolve_clips(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+    ) -> Optional[List[str]]:
+        """
+        The clips that can have rows matching a frame-window query, from the loader's clip
+        index (min/max frame_id and vehicle types of each clip in each file) or the parquet
+        index's per-clip summaries. None if there is no frame window or no index.
+        """
+        if min_frame_id is None and max_frame_id is None:
+            return None
+        vehicles = set(vehicle_types or [])
+        clips = set(clip_names or [])
+
+        if self.parquet_files is not None:
+            if not all("clips" in entry for entry in self.parquet_files):
+                return None
+            return sorted({
+                clip["clip_name"] for entry in self.parquet_files for clip in entry["clips"]
+                if self._clip_matches(clip, vehicles, clips, min_frame_id, max_frame_id)
+            })
+        if not self.has_clip_index:
+            return None
+
+        conditions, params = [], []
+        if min_frame_id is not None:
+            conditions.append("max_frame_id >= ?")
+            params.append(min_frame_id)
+        if max_frame_id is not None:
+            conditions.append("min_frame_id <= ?")
+            params.append(max_frame_id)
+        if clips:
+            conditions.append("list_contains(?::VARCHAR[], clip_name)")
+            params.append(sorted(clips))
+        if vehicles:
+            conditions.append("list_has_any(vehicle_types, ?::VARCHAR[])")
+            params.append(sorted(vehicles))
+        rows = self.conn.execute(
+            f"SELECT DISTINCT clip_name FROM {self.clip_index_table_name} WHERE {' AND '.join(conditions)} ORDER BY 1",
+            params,
+        ).fetchall()
+        return [clip_name for (clip_name,) in rows]
+
+    def _raw_source(self, pruned_paths: Optional[List[str]]) -> str:
+        """
+        The raw rows to scan: the table itself, or in parquet mode only the files that can match.
+        """
+        if self.parquet_files is None or pruned_paths is None:
+            return self.table_name
+        if len(pruned_paths) == len(self.parquet_files):
+            return self.table_name
+        if not pruned_paths:
+            return f"(SELECT * FROM {self.table_name} WHERE false)"
+        logging.debug(f"Pruned parquet scan to {len(pruned_paths)} of {len(self.parquet_files)} file(s).")
+        return self._read_parquet(pruned_paths)
+
+    def _table_exists(self, name: str, catalog: Optional[str] = None) -> bool:
+        # Databases attached by compare_detection_stats have tables of the same names.
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables "
+            "WHERE table_name = ? AND table_catalog IN (COALESCE(?, current_database()), 'temp')",
+            [name, catalog],
+        ).fetchone()[0] > 0
+
+    def data_version(self) -> Optional[int]:
+        """The version stamp written by DataLoader, or None for tables it did not load."""
+        if not self.has_data_version:
+            return None
+        return self.conn.execute(f"SELECT version FROM {self.data_version_table_name}").fetchone()[0]
+
+    def enum_columns(self) -> Dict[str, str]:
+        """
+        Group columns the loader stores as ENUMs (see DataLoader.optimize_layout), mapped to
+        their type names. Re-read whenever the data version changes, as loads may re-layout.
+        """
+        version = self.data_version()
+        if self._enum_columns is None or self._enum_columns[0] != version:
+            rows = self.conn.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = ? AND table_catalog = current_database() AND data_type LIKE 'ENUM%'",
+                [self.table_name],
+            ).fetchall()
+            self._enum_columns = (version, {name: f"{self.table_name}_{name}_enum" for (name,) in rows})
+        return self._enum_columns[1]
+
+    @property
+    def result_columns(self) -> List[str]:
+        """Columns of query_detection_stats results, which depend on `approximate`."""
+        return self.APPROX_RESULT_COLUMNS if self.approximate else self.RESULT_COLUMNS
+
+    def cache_stats(self) -> Optional[dict]:
+        """Hit, miss and eviction counters of the result cache, or None if caching is disabled."""
+        return self.cache.stats() if self.cache is not None else None
 
     def query_detection_stats(
         self,
@@ -27,26 +343,414 @@ class Client:
         max_distance: int = 100,
         distance_bin_size: int = 10,
         min_frames: int = 1,
-    ) -> pd.DataFrame:
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        result_format: str = "pandas",
+        batch_size: int = 1_000_000,
+    ) -> Union["pd.DataFrame", "pa.Table", "pa.RecordBatchReader", List[Dict[str, Any]]]:
         """
         Query detection statistics grouped by vehicle type, clip name, and distance bins.
+
+        Rows are ordered by the group columns and distance bin, or by the result column
+        `order_by` (descending with `descending`) and then those. `limit` and `offset` page
+        through that order in SQL, so e.g. the 20 bins with the lowest success rate are
+        `order_by="success_rate", limit=20` and DuckDB keeps only those 20 while sorting.
+
+        `result_format` selects a pandas DataFrame ("pandas"), a `pyarrow.Table` ("arrow"), a
+        `pyarrow.RecordBatchReader` streaming batches of up to `batch_size` rows ("reader") or a
+        list of row dicts that needs neither pandas nor pyarrow ("records"). `success_rate` is
+        computed in SQL for all of them.
+
+        With `approximate` set on the Client, the rows are estimates from the loader's sample
+        with `success_rate_low`/`success_rate_high` confidence bounds and an `estimated` flag
+        (false for groups answered exactly); see _build_approx_query.
+
+        The "query" profile event has build, execute, fetch and convert timings; a reader
+        is fetched by its consumer, so its fetch time is not included.
         """
-        group_fields = self.GROUP_FIELDS
-        group_select = ", ".join(group_fields)
-        group_by = ", ".join(group_fields + ["distance_bin"])
+        if result_format not in self.RESULT_FORMATS:
+            raise ValueError(f"result_format must be one of {self.RESULT_FORMATS}, got '{result_format}'")
 
-        base_query = f"""
-        SELECT
-            {group_select},
-            FLOOR(distance / ?) * ? AS distance_bin,
-            COUNT(*) AS total_frames,
-            SUM(CASE WHEN detection THEN 1 ELSE 0 END) AS detected_frames
-        FROM {self.table_name}
-        WHERE distance BETWEEN ? AND ?
+        filters = {
+            "vehicle_types": vehicle_types, "clip_names": clip_names,
+            "min_frame_id": min_frame_id, "max_frame_id": max_frame_id,
+            "min_distance": min_distance, "max_distance": max_distance,
+            "distance_bin_size": distance_bin_size, "min_frames": min_frames,
+        }
+        paging = self._paging(order_by, descending, limit, offset)
+        event_filters = dict(filters, **paging)
+        timer = PhaseTimer()
+
+        if result_format == "reader":
+            query, params = self._build(filters, paging, timer)
+            # Profile first: running another statement on the connection would end the stream.
+            explain = self._explain_analyze(query, params)
+            with timer.phase("execute"):
+                reader = self.conn.execute(query, params).to_arrow_reader(batch_size)
+            self._publish("query", event_filters, result_format, timer, explain, cache="bypass")
+            return reader
+
+        if self.cache is None:
+            query, params = self._build(filters, paging, timer)
+            result = self._fetch(query, params, result_format, timer)
+            self._publish("query", event_filters, result_format, timer, self._explain_analyze(query, params), rows=len(result))
+            return result
+
+        key = (
+            tuple(sorted(set(vehicle_types or []))),
+            tuple(sorted(set(clip_names or []))),
+            min_frame_id,
+            max_frame_id,
+            min_distance,
+            max_distance,
+            distance_bin_size,
+            min_frames,
+            tuple(paging.values()),
+            result_format,
+        )
+        result, cache_status, explain = self._cached_fetch(
+            key, lambda: self._build(filters, paging, timer), result_format, timer
+        )
+        self._publish("query", event_filters, result_format, timer, explain, rows=len(result), cache=cache_status)
+        return result
+
+    def _cached_fetch(
+        self, key: tuple, build: Callable[[], Tuple[str, list]], result_format: str, timer: PhaseTimer
+    ) -> Tuple[Any, str, Optional[Dict[str, Any]]]:
+        """
+        The result of the query `build` returns, from the result cache if it holds `key` for
+        the current data version, with the cache status ("hit" or "miss") and, for a miss,
+        the EXPLAIN ANALYZE summary.
+        """
+        with timer.phase("cache_lookup"):
+            version = self.data_version()
+            result = self.cache.get(key, version)
+        cache_status, explain = "hit", None
+        if result is None:
+            cache_status = "miss"
+            query, params = build()
+            result = self._fetch(query, params, result_format, timer)
+            self.cache.put(key, result, version)
+            explain = self._explain_analyze(query, params)
+        # Arrow tables are immutable; DataFrames and records are copied so callers can't alter cached entries.
+        if result_format == "pandas":
+            result = result.copy()
+        elif result_format == "records":
+            result = [dict(row) for row in result]
+        return result, cache_status, explain
+
+    def query_grouped_stats(
+        self,
+        group_by: List[str],
+        subtotals: Optional[str] = None,
+        vehicle_types: Optional[List[str]] = None,
+        clip_names: Optional[List[str]] = None,
+        min_frame_id: Optional[int] = None,
+        max_frame_id: Optional[int] = None,
+        min_distance: int = 1,
+        max_distance: int = 100,
+        distance_bin_size: int = 10,
+        min_frames: int = 1,
+        result_format: str = "pandas",
+        batch_size: int = 1_000_000,
+    ) -> Union["pd.DataFrame", "pa.Table", "pa.RecordBatchReader", List[Dict[str, Any]]]:
+        """
+        Query detection statistics grouped by any of the Client's `dimensions` (see
+        DIMENSIONS): e.g. per vehicle type across all clips with `group_by=["vehicle_type"]`,
+        or per clip family and recording date with `group_by=["clip_family", "clip_date"]`.
+
+        `subtotals="rollup"` adds, in the same query, a subtotal row for every leading prefix
+        of `group_by` and a grand total; `"cube"` adds one for every subset of it. The
+        dimensions a row is totalled over are NULL and set in its `grouping_id` bitmask (the
+        last dimension is bit 0), which tells subtotals apart from groups whose value is NULL.
+        Rows are ordered by the dimensions, each subtotal after the groups it sums, and
+        `min_frames` applies to subtotals too.
+
+        Without a frame-id filter the groups are summed from the loader's rollup rather than
+        the raw rows, so drilling down from one level to the next stays cheap, and with a
+        result cache the results are cached like query_detection_stats's. The filters,
+        `result_format` and `batch_size` are as for query_detection_stats.
+
+        Raises:
+            ValueError: On an unknown or repeated dimension, unknown `subtotals` or
+                `result_format`, or on an approximate Client.
+        """
+        if self.approximate:
+            raise ValueError("query_grouped_stats is exact only; use a Client without approximate=True.")
+        if result_format not in self.RESULT_FORMATS:
+            raise ValueError(f"result_format must be one of {self.RESULT_FORMATS}, got '{result_format}'")
+        if not group_by:
+            raise ValueError("group_by needs at least one dimension.")
+        unknown = [name for name in group_by if name not in self.dimensions]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s) {', '.join(unknown)}; choose from {', '.join(self.dimensions)}.")
+        if len(set(group_by)) != len(group_by):
+            raise ValueError("group_by must not repeat a dimension.")
+        if subtotals is not None and subtotals not in self.SUBTOTALS:
+            raise ValueError(f"subtotals must be one of {self.SUBTOTALS}, got '{subtotals}'")
+
+        filters = {
+            "vehicle_types": vehicle_types, "clip_names": clip_names,
+            "min_frame_id": min_frame_id, "max_frame_id": max_frame_id,
+            "min_distance": min_distance, "max_distance": max_distance,
+            "distance_bin_size": distance_bin_size, "min_frames": min_frames,
+        }
+        event_filters = dict(filters, group_by=list(group_by), subtotals=subtotals)
+        timer = PhaseTimer()
+
+        def build() -> Tuple[str, list]:
+            with timer.phase("build"):
+                return self._build_grouped_query(list(group_by), subtotals, **filters)
+
+        if result_format == "reader":
+            query, params = build()
+            explain = self._explain_analyze(query, params)
+            with timer.phase("execute"):
+                reader = self.conn.execute(query, params).to_arrow_reader(batch_size)
+            self._publish("grouped_query", event_filters, result_format, timer, explain, cache="bypass")
+            return reader
+
+        if self.cache is None:
+            query, params = build()
+            result = self._fetch(query, params, result_format, timer)
+            self._publish("grouped_query", event_filters, result_format, timer, self._explain_analyze(query, params), rows=len(result))
+            return result
+
+        key = (
+            "grouped",
+            tuple(group_by),
+            subtotals,
+            tuple(sorted(set(vehicle_types or []))),
+            tuple(sorted(set(clip_names or []))),
+            min_frame_id,
+            max_frame_id,
+            min_distance,
+            max_distance,
+            distance_bin_size,
+            min_frames,
+            result_format,
+        )
+        result, cache_status, explain = self._cached_fetch(key, build, result_format, timer)
+        self._publish("grouped_query", event_filters, result_format, timer, explain, rows=len(result), cache=cache_status)
+        return result
+
+    @staticmethod
+    def grouped_result_columns(group_by: List[str], subtotals: Optional[str] = None) -> List[str]:
+        """Columns of query_grouped_stats results for these arguments."""
+        return list(group_by) + (["grouping_id"] if subtotals else []) + ["total_frames", "detected_frames", "success_rate"]
+
+    def iter_detection_stats(
+        self,
+        vehicle_types: Optional[List[str]] = None,
+        clip_names: Optional[List[str]] = None,
+        min_frame_id: Optional[int] = None,
+        max_frame_id: Optional[int] = None,
+        min_distance: int = 1,
+        max_distance: int = 100,
+        distance_bin_size: int = 10,
+        min_frames: int = 1,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        result_format: str = "records",
+        batch_size: int = 10_000,
+    ) -> Iterator[Union[List[Dict[str, Any]], "pa.RecordBatch"]]:
         """
+        Yield the rows of query_detection_stats (same arguments) in chunks of up to
+        `batch_size` rows as DuckDB produces them, so only one chunk is held at a time.
 
-        filters = []
-        params = [distance_bin_size, distance_bin_size, min_distance, max_distance]
+        "records" chunks are lists of row dicts from DuckDB's fetchmany and need neither
+        pandas nor pyarrow; "arrow" chunks are `pyarrow.RecordBatch`es. Results bypass the
+        cache. The "query" profile event is published when the iterator is exhausted or
+        closed, with the fetch time of the chunks consumed.
+        """
+        if result_format not in ("records", "arrow"):
+            raise ValueError(f"result_format must be 'records' or 'arrow', got '{result_format}'")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        filters = {
+            "vehicle_types": vehicle_types, "clip_names": clip_names,
+            "min_frame_id": min_frame_id, "max_frame_id": max_frame_id,
+            "min_distance": min_distance, "max_distance": max_distance,
+            "distance_bin_size": distance_bin_size, "min_frames": min_frames,
+        }
+        paging = self._paging(order_by, descending, limit, offset)
+        timer = PhaseTimer()
+        query, params = self._build(filters, paging, timer)
+        # Profile first: running another statement on the connection would end the stream.
+        explain = self._explain_analyze(query, params)
+        with timer.phase("execute"):
+            result = self.conn.execute(query, params)
+        return self._iter_chunks(result, result_format, batch_size, timer, dict(filters, **paging), explain)
+
+    def _iter_chunks(
+        self,
+        result: duckdb.DuckDBPyConnection,
+        result_format: str,
+        batch_size: int,
+        timer: PhaseTimer,
+        filters: Dict[str, Any],
+        explain: Optional[Dict[str, Any]],
+    ) -> Iterator[Union[List[Dict[str, Any]], "pa.RecordBatch"]]:
+        rows = 0
+        try:
+            if result_format == "arrow":
+                with timer.phase("fetch"):
+                    batches = iter(result.to_arrow_reader(batch_size))
+            columns = [column[0] for column in result.description]
+            while True:
+                with timer.phase("fetch"):
+                    if result_format == "arrow":
+                        chunk = next(batches, None)
+                    else:
+                        chunk = [dict(zip(columns, row)) for row in result.fetchmany(batch_size)] or None
+                if chunk is None:
+                    break
+                rows += len(chunk)
+                yield chunk
+        finally:
+            self._publish("query", filters, result_format, timer, explain, rows=rows, cache="bypass")
+
+    def _paging(
+        self, order_by: Optional[str], descending: bool, limit: Optional[int], offset: int
+    ) -> Dict[str, Any]:
+        """
+        Validate the ordering and paging arguments of query_detection_stats.
+
+        Raises:
+            ValueError: On an unknown `order_by` column or a negative `limit` or `offset`.
+        """
+        if order_by is not None and order_by not in self.result_columns:
+            raise ValueError(f"order_by must be one of {self.result_columns}, got '{order_by}'")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        if offset < 0:
+            raise ValueError("offset must not be negative.")
+        return {"order_by": order_by, "descending": descending, "limit": limit, "offset": offset}
+
+    def _order_clause(
+        self, order_by: Optional[str], descending: bool, limit: Optional[int], offset: int
+    ) -> Tuple[str, list]:
+        """
+        ORDER BY, LIMIT and OFFSET for a query_detection_stats result. The group keys break
+        ties, so pages never overlap; with a limit DuckDB runs a top-N instead of a full sort.
+        """
+        keys = self.GROUP_FIELDS + ["distance_bin"]
+        if order_by is not None:
+            keys = [f"{order_by} {'DESC' if descending else 'ASC'}"] + [key for key in keys if key != order_by]
+        clause, params = f"ORDER BY {', '.join(keys)}", []
+        if limit is not None:
+            clause += " LIMIT ?"
+            params.append(limit)
+        if offset:
+            clause += " OFFSET ?"
+            params.append(offset)
+        return clause, params
+
+    def _build(self, filters: Dict[str, Any], paging: Dict[str, Any], timer: PhaseTimer) -> Tuple[str, list]:
+        """
+        The SQL for one query_detection_stats call. With a process engine, the partial
+        aggregates are computed first (the "map" phase) and the query merges them.
+        """
+        if self.engine is not None:
+            with timer.phase("map"):
+                partials = self.engine.map(self._partial_queries(**filters))
+            with timer.phase("build"):
+                query, params = self._build_merge_query(partials, filters["min_frames"])
+        else:
+            with timer.phase("build"):
+                build = self._build_approx_query if self.approximate else self._build_query
+                query, params = build(**filters)
+        order, order_params = self._order_clause(**paging)
+        return f"{query}{order}\n", params + order_params
+
+    def _fetch(
+        self, query: str, params: list, result_format: str, timer: PhaseTimer
+    ) -> Union["pd.DataFrame", "pa.Table", List[Dict[str, Any]]]:
+        with timer.phase("execute"):
+            result = self.conn.execute(query, params)
+        if result_format == "records":
+            with timer.phase("fetch"):
+                columns = [column[0] for column in result.description]
+                return [dict(zip(columns, row)) for row in result.fetchall()]
+        with timer.phase("fetch"):
+            table = result.to_arrow_table()
+        if result_format != "pandas":
+            return table
+        with timer.phase("convert"):
+            return table.to_pandas()
+
+    def _explain_analyze(self, query: str, params: list) -> Optional[Dict[str, Any]]:
+        return profiling.explain_analyze(self.conn, query, params) if self.profile else None
+
+    def _publish(
+        self,
+        event: str,
+        filters: Any,
+        result_format: str,
+        timer: PhaseTimer,
+        explain: Optional[Dict[str, Any]],
+        rows: Optional[int] = None,
+        cache: Optional[str] = None,
+    ) -> None:
+        """Record the profile of the query just run in `last_profile` and send it to listeners."""
+        self.last_profile = {
+            "event": event,
+            "filters": filters,
+            "result_format": result_format,
+            "rows": rows,
+            "cache": cache if cache is not None else ("disabled" if self.cache is None else None),
+            "phases_ms": timer.phases_ms,
+        }
+        if explain is not None:
+            self.last_profile["explain_analyze"] = explain
+        profiling.publish(self.last_profile)
+
+    @staticmethod
+    def _group_output(group_fields: List[str]) -> str:
+        """
+        Select list for the group columns; the loader may store them as ENUMs, which are
+        returned as plain strings.
+        """
+        return ", ".join(f"CAST({field} AS VARCHAR) AS {field}" for field in group_fields)
+
+    def _source(self, use_rollup: bool, raw_source: Optional[str] = None) -> Tuple[str, str, str]:
+        """
+        The table to aggregate and the expressions for total and detected frames over it.
+        """
+        if use_rollup:
+            return self.rollup_table_name, "CAST(SUM(total_frames) AS BIGINT)", "SUM(detected_frames)"
+        return raw_source or self.table_name, "COUNT(*)", "SUM(CASE WHEN detection THEN 1 ELSE 0 END)"
+
+    def _where(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        enum_columns: Optional[Dict[str, str]] = None,
+    ) -> Tuple[str, list]:
+        """
+        Build the row filter for one set of query parameters.
+
+        A list filter with several values is a single list parameter (`list_contains(?, col)`),
+        so the SQL text doesn't change with the number of values and DuckDB plans a cheap
+        per-row lookup instead of the hash join it builds for a long IN list. A single value
+        is an equality, which DuckDB pushes into the scan to skip row groups.
+
+        Values compared against `enum_columns` are cast to the column's ENUM type so DuckDB
+        filters (and skips row groups) on the ENUM itself; values outside it match nothing.
+        """
+        enum_columns = enum_columns or {}
+
+        filters = ["distance BETWEEN ? AND ?"]
+        params = [min_distance, max_distance]
 
         def add_filter(condition: str, values):
             filters.append(condition)
@@ -55,42 +759,657 @@ class Client:
             else:
                 params.append(values)
 
+        def add_list_filter(column: str, values: List[str]):
+            enum_type = enum_columns.get(column)
+            if len(values) == 1:
+                placeholder = f"TRY_CAST(? AS {enum_type})" if enum_type else "?"
+                add_filter(f"{column} = {placeholder}", values[0])
+            else:
+                placeholder = f"TRY_CAST(? AS {enum_type}[])" if enum_type else "?::VARCHAR[]"
+                add_filter(f"list_contains({placeholder}, {column})", [list(values)])
+
         if vehicle_types:
-            placeholders = ", ".join(["?"] * len(vehicle_types))
-            add_filter(f"vehicle_type IN ({placeholders})", vehicle_types)
+            add_list_filter("vehicle_type", vehicle_types)
 
         if clip_names:
-            placeholders = ", ".join(["?"] * len(clip_names))
-            add_filter(f"clip_name IN ({placeholders})", clip_names)
+            add_list_filter("clip_name", clip_names)
 
-        if min_frame_id is not None:
-            add_filter("frame_id >= ?", min_frame_id)
+        frame_filter, frame_params = self._frame_where(min_frame_id, max_frame_id)
+        if frame_filter:
+            add_filter(frame_filter, frame_params)
 
+        return " AND ".join(filters), params
+
+    @staticmethod
+    def _frame_where(min_frame_id: Optional[int], max_frame_id: Optional[int]) -> Tuple[str, list]:
+        """
+        Build the frame-id window condition, empty if neither bound is set.
+        """
+        filters, params = [], []
+        if min_frame_id is not None:
+            filters.append("frame_id >= ?")
+            params.append(min_frame_id)
         if max_frame_id is not None:
-            add_filter("frame_id <= ?", max_frame_id)
+            filters.append("frame_id <= ?")
+            params.append(max_frame_id)
+        return " AND ".join(filters), params
+
+    def _exact_source(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+    ) -> Tuple[str, str, str, str, list]:
+        """
+        The source, total and detected expressions, and row filter of an exact query.
+        """
+        # The rollup has one row per (vehicle_type, clip_name, distance) and cannot filter on frame_id.
+        use_rollup = self.has_rollup and min_frame_id is None and max_frame_id is None
+        pruned = (
+            self._prune_files(vehicle_types, clip_names, min_frame_id, max_frame_id)
+            if self.parquet_files is not None else None
+        )
+        source, total_expr, detected_expr = self._source(use_rollup, self._raw_source(pruned))
+        where, where_params = self._indexed_where(
+            vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance,
+            None if use_rollup else self.enum_columns(),
+        )
+        return source, total_expr, detected_expr, where, where_params
+
+    def _indexed_where(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        enum_columns: Optional[Dict[str, str]] = None,
+    ) -> Tuple[str, list]:
+        """
+        _where, with the clip index applied to a frame window: a clip filter shrinks to the
+        listed clips that can match, and the WHERE becomes false when none can, so the scan
+        is skipped. Without a clip filter the frame predicates stay as they are; DuckDB's
+        zone maps on frame_id skip the same row groups an IN list of clips would, for less.
+        """
+        clips = self._resolve_clips(vehicle_types, clip_names, min_frame_id, max_frame_id)
+        where, params = self._where(
+            vehicle_types, clips if clips and clip_names else clip_names, min_frame_id, max_frame_id,
+            min_distance, max_distance, enum_columns,
+        )
+        if clips == []:
+            logging.debug("Clip index: no clip can match the frame window.")
+            where += " AND false"
+        return where, params
+
+    def _build_query(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        distance_bin_size: int,
+        min_frames: int,
+    ) -> Tuple[str, list]:
+        group_fields = self.GROUP_FIELDS
+        group_select = self._group_output(group_fields)
+        group_by = ", ".join(group_fields + ["distance_bin"])
+        source, total_expr, detected_expr, where, where_params = self._exact_source(
+            vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance
+        )
+
+        query = f"""
+        SELECT
+            {group_select},
+            FLOOR(distance / ?) * ? AS distance_bin,
+            {total_expr} AS total_frames,
+            CAST({detected_expr} AS BIGINT) AS detected_frames,
+            {detected_expr} / {total_expr} AS success_rate
+        FROM {source}
+        WHERE {where}
+        GROUP BY {group_by}
+        HAVING {total_expr} >= ?
+        """
+        params = [distance_bin_size, distance_bin_size] + where_params + [min_frames]
+
+        return query, params
+
+    def _build_grouped_query(
+        self,
+        group_by: List[str],
+        subtotals: Optional[str],
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        distance_bin_size: int,
+        min_frames: int,
+    ) -> Tuple[str, list]:
+        """
+        The query_grouped_stats query: the inner query evaluates the dimensions and sums the
+        source per distinct combination of them, and the outer one groups those (few) rows
+        with ROLLUP or CUBE when subtotals are asked for.
+        """
+        source, total_expr, detected_expr, where, where_params = self._exact_source(
+            vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance
+        )
+        expressions, params = [], []
+        for name in group_by:
+            expression = self.dimensions[name]
+            expressions.append(f"{expression} AS {name}")
+            params.extend([distance_bin_size] * expression.count("?"))
+
+        dimensions = ", ".join(group_by)
+        grouping = f"{subtotals.upper()} ({dimensions})" if subtotals else dimensions
+        order = ", ".join(f"{name} NULLS LAST" for name in group_by)
+        query = f"""
+        SELECT
+            {dimensions},
+            {f"GROUPING({dimensions}) AS grouping_id," if subtotals else ""}
+            CAST(SUM(total_frames) AS BIGINT) AS total_frames,
+            CAST(SUM(detected_frames) AS BIGINT) AS detected_frames,
+            SUM(detected_frames) / SUM(total_frames) AS success_rate
+        FROM (
+            SELECT {", ".join(expressions)}, {total_expr} AS total_frames, {detected_expr} AS detected_frames
+            FROM {source}
+            WHERE {where}
+            GROUP BY ALL
+        )
+        GROUP BY {grouping}
+        HAVING SUM(total_frames) >= ?
+        ORDER BY {order}{", grouping_id" if subtotals else ""}
+        """
+        return query, params + where_params + [min_frames]
+
+    def _partial_queries(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        distance_bin_size: int,
+        min_frames: int,
+    ) -> List[Tuple[str, list]]:
+        """
+        One partial-aggregate query per engine shard of the files that can match.
+
+        Each returns the (vehicle_type, clip_name, distance_bin, total, detected) rows of its
+        files. Totals and detected counts are sums, so merging partials gives exactly the
+        single-connection result; min_frames applies only after the merge.
+        """
+        where, where_params = self._indexed_where(vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance)
+        paths = self._prune_files(vehicle_types, clip_names, min_frame_id, max_frame_id)
+        queries = []
+        for shard in self.engine.shards(paths):
+            query = f"""
+            SELECT
+                {self._group_output(self.GROUP_FIELDS)},
+                FLOOR(distance / ?) * ? AS distance_bin,
+                COUNT(*) AS total_frames,
+                CAST(SUM(CASE WHEN detection THEN 1 ELSE 0 END) AS BIGINT) AS detected_frames
+            FROM {self._read_parquet(shard)}
+            WHERE {where}
+            GROUP BY ALL
+            """
+            queries.append((query, [distance_bin_size, distance_bin_size] + where_params))
+        return queries
 
-        if filters:
-            base_query += " AND " + " AND ".join(filters)
+    def _build_merge_query(self, partials: List["pa.Table"], min_frames: int) -> Tuple[str, list]:
+        """Sum the partial aggregates into the same result _build_query would give."""
+        import pyarrow as pa
 
-        base_query += f"""
+        schema = pa.schema([
+            (field, pa.string()) for field in self.GROUP_FIELDS
+        ] + [("distance_bin", pa.float64()), ("total_frames", pa.int64()), ("detected_frames", pa.int64())])
+        # Re-registering replaces the previous query's partials.
+        self.conn.register(self.partials_view_name, pa.concat_tables([p.cast(schema) for p in partials]) if partials else schema.empty_table())
+
+        group_by = ", ".join(self.GROUP_FIELDS + ["distance_bin"])
+        query = f"""
+        SELECT
+            {group_by},
+            CAST(SUM(total_frames) AS BIGINT) AS total_frames,
+            CAST(SUM(detected_frames) AS BIGINT) AS detected_frames,
+            SUM(detected_frames) / SUM(total_frames) AS success_rate
+        FROM {self.partials_view_name}
         GROUP BY {group_by}
-        HAVING COUNT(*) >= ?
-        ORDER BY {group_by}
+        HAVING SUM(total_frames) >= ?
         """
-        params.append(min_frames)
+        return query, [min_frames]
 
-        result = self.conn.execute(base_query, params).df()
+    def _build_approx_query(
+        self,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        distance_bin_size: int,
+        min_frames: int,
+    ) -> Tuple[str, list]:
+        """
+        Estimate the stats of each group from the sample.
 
-        if not result.empty:
-            result["success_rate"] = result["detected_frames"] / result["total_frames"]
+        Each sampled row counts `weight` times, the inverse of its sampling probability. The
+        standard error of a success rate is the linearized variance of the ratio estimator
+        under independent sampling, sum(w * (w - 1) * (detection - rate)^2) / total^2, so rows
+        of strata kept whole (weight 1) add no uncertainty and groups made only of them are
+        exact.
+
+        The other groups are answered exactly from the rollup or the raw rows when the sample
+        can't be trusted with them: those with fewer than `min_samples` sampled rows, which
+        includes groups with none (typically ones much smaller than 1 / sample_rate frames),
+        and those estimated at under APPROX_MIN_FRAMES_MARGIN * `min_frames`, whose estimate
+        could decide `min_frames` either way. The groups to check come from the rollup, whose
+        keys are a superset of the filtered result's even with a frame window, so only the
+        clips of those groups are read exactly.
+        """
+        group_fields = self.GROUP_FIELDS
+        group_select = self._group_output(group_fields)
+        group_by = ", ".join(group_fields + ["distance_bin"])
+        sample_where, sample_params = self._where(
+            vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance
+        )
+        source, total_expr, detected_expr, where, where_params = self._exact_source(
+            vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance
+        )
+        if self.has_rollup:
+            # The rollup can't apply the frame window, so its keys include every group that can match.
+            key_source = self.rollup_table_name
+            key_where, key_params = self._where(vehicle_types, clip_names, None, None, min_distance, max_distance)
         else:
-            columns = group_fields + [
-                "distance_bin",
-                "total_frames",
-                "detected_frames",
-                "success_rate",
-            ]
+            key_source, key_where, key_params = source, where, where_params
+
+        query = f"""
+        WITH sampled AS (
+            SELECT
+                {group_select},
+                FLOOR(distance / ?) * ? AS distance_bin,
+                COUNT(*) AS sampled_frames,
+                COUNT(*) FILTER (WHERE weight > 1) AS weighted_frames,
+                SUM(weight) AS total_frames,
+                SUM(CASE WHEN detection THEN weight ELSE 0 END) AS detected_frames,
+                SUM(weight * (weight - 1)) AS total_variance,
+                SUM(CASE WHEN detection THEN weight * (weight - 1) ELSE 0 END) AS detected_variance
+            FROM {self.sample_table_name}
+            WHERE {sample_where}
+            GROUP BY {group_by}
+        ),
+        groups AS (
+            SELECT {group_select}, FLOOR(distance / ?) * ? AS distance_bin
+            FROM {key_source}
+            WHERE {key_where}
+            GROUP BY {group_by}
+        ),
+        thin AS (
+            SELECT {", ".join(group_fields)}, distance_bin
+            FROM groups LEFT JOIN sampled USING ({group_by})
+            WHERE sampled.sampled_frames IS NULL
+               OR (sampled.weighted_frames > 0 AND (sampled.sampled_frames < ? OR sampled.total_frames < ?))
+        ),
+        exact AS (
+            SELECT
+                {group_select},
+                FLOOR(distance / ?) * ? AS distance_bin,
+                {total_expr} AS total_frames,
+                CAST({detected_expr} AS BIGINT) AS detected_frames
+            FROM {source}
+            WHERE {where} AND clip_name IN (SELECT clip_name FROM thin)
+            GROUP BY {group_by}
+        ),
+        estimates AS (
+            SELECT
+                {", ".join(group_fields)}, distance_bin,
+                CAST(ROUND(total_frames) AS BIGINT) AS total_frames,
+                CAST(ROUND(detected_frames) AS BIGINT) AS detected_frames,
+                detected_frames / total_frames AS success_rate,
+                SQRT(
+                    detected_variance * (1 - success_rate) ^ 2 + (total_variance - detected_variance) * success_rate ^ 2
+                ) / total_frames AS standard_error,
+                total_variance > 0 AS estimated
+            FROM sampled ANTI JOIN thin USING ({group_by})
+            UNION ALL
+            SELECT {", ".join(group_fields)}, distance_bin, total_frames, detected_frames,
+                   detected_frames / total_frames, 0.0, false
+            FROM exact SEMI JOIN thin USING ({group_by})
+        )
+        SELECT
+            {", ".join(group_fields)}, distance_bin, total_frames, detected_frames, success_rate,
+            GREATEST(success_rate - ? * standard_error, 0) AS success_rate_low,
+            LEAST(success_rate + ? * standard_error, 1) AS success_rate_high,
+            estimated
+        FROM estimates
+        WHERE total_frames >= ?
+        """
+        z = NormalDist().inv_cdf((1 + self.confidence) / 2)
+        params = (
+            [distance_bin_size, distance_bin_size] + sample_params
+            + [distance_bin_size, distance_bin_size] + key_params
+            + [self.min_samples, self.APPROX_MIN_FRAMES_MARGIN * min_frames]
+            + [distance_bin_size, distance_bin_size] + where_params + [z, z, min_frames]
+        )
+
+        return query, params
+
+    def query_detection_stats_batch(
+        self, specs: List[Dict[str, Any]], result_format: str = "pandas", split: bool = True
+    ) -> Union[List["pd.DataFrame"], List["pa.Table"], "pd.DataFrame", "pa.Table"]:
+        """
+        Answer many query_detection_stats parameter sets in one query.
+
+        Each spec is a dict of query_detection_stats keyword arguments (missing keys take the
+        usual defaults), and gets its own branch of a UNION ALL. Specs that read raw rows (a
+        frame window, or no rollup) and select the same rows, differing only in distance range,
+        bin size or min_frames, share one scan aggregated to 1-unit distances that each of them
+        re-bins, so a report over a few filters reads the raw rows once per filter. Every other
+        spec's branch is the query it would run alone; specs the rollup answers gain nothing
+        from sharing, as the rollup already is that aggregate.
+
+        Returns one result per spec, identical to what query_detection_stats would return for
+        that spec alone, or with `split=False` a single result with a leading `spec_id` column.
+        `result_format` is "pandas" or "arrow". Batches are always exact, even on a Client
+        created with `approximate=True`.
+        """
+        if result_format not in ("pandas", "arrow"):
+            raise ValueError(f"result_format must be 'pandas' or 'arrow', got '{result_format}'")
+        if not specs:
+            return [] if split else self._empty_batch_result(result_format)
+
+        timer = PhaseTimer()
+        build_start = time.perf_counter()
+        resolved = []
+        for spec in specs:
+            unknown = set(spec) - set(self.FILTER_DEFAULTS)
+            if unknown:
+                raise ValueError(f"Unknown query parameter(s): {', '.join(sorted(unknown))}")
+            resolved.append({**self.FILTER_DEFAULTS, **spec})
+
+        # Specs that read raw rows and select the same ones, differing only in distance range,
+        # bin size or min_frames, share one aggregate of them. The rollup is already that
+        # aggregate, so specs it answers run their own query.
+        shared: Dict[tuple, List[int]] = {}
+        for spec_id, spec in enumerate(resolved):
+            key = (
+                tuple(sorted(set(spec["vehicle_types"]))) if spec["vehicle_types"] else None,
+                tuple(sorted(set(spec["clip_names"]))) if spec["clip_names"] else None,
+                spec["min_frame_id"],
+                spec["max_frame_id"],
+            )
+            shared.setdefault(key, []).append(spec_id)
+
+        group_select = ", ".join(self.GROUP_FIELDS)
+        scans, scan_params, branches = [], [], []
+        for spec_ids in shared.values():
+            first = resolved[spec_ids[0]]
+            reads_rollup = self.has_rollup and first["min_frame_id"] is None and first["max_frame_id"] is None
+            if len(spec_ids) == 1 or reads_rollup:
+                # The query query_detection_stats would run for the spec alone.
+                for spec_id in spec_ids:
+                    query, params = self._build_query(**resolved[spec_id])
+                    branches.append((spec_id, f"SELECT {spec_id} AS spec_id, * FROM ({query})", params))
+                continue
+
+            source, total_expr, detected_expr, where, where_params = self._exact_source(
+                first["vehicle_types"], first["clip_names"], first["min_frame_id"], first["max_frame_id"],
+                min(resolved[spec_id]["min_distance"] for spec_id in spec_ids),
+                max(resolved[spec_id]["max_distance"] for spec_id in spec_ids),
+            )
+            scan = f"scan_{len(scans)}"
+            scans.append(
+                f"""
+                {scan} AS MATERIALIZED (
+                    SELECT {group_select}, distance, {total_expr} AS total_frames, {detected_expr} AS detected_frames
+                    FROM {source}
+                    WHERE {where}
+                    GROUP BY ALL
+                )
+                """
+            )
+            scan_params.extend(where_params)
+            for spec_id in spec_ids:
+                spec = resolved[spec_id]
+                branches.append((spec_id, f"""
+                    SELECT {spec_id} AS spec_id, {self._group_output(self.GROUP_FIELDS)},
+                           FLOOR(distance / ?) * ? AS distance_bin,
+                           CAST(SUM(total_frames) AS BIGINT) AS total_frames,
+                           CAST(SUM(detected_frames) AS BIGINT) AS detected_frames,
+                           SUM(detected_frames) / SUM(total_frames) AS success_rate
+                    FROM {scan}
+                    WHERE distance BETWEEN ? AND ?
+                    GROUP BY ALL
+                    HAVING SUM(total_frames) >= ?
+                    """, [spec["distance_bin_size"]] * 2 + [spec["min_distance"], spec["max_distance"], spec["min_frames"]]))
+
+        branches.sort(key=lambda branch: branch[0])
+        query = f"""
+        {"WITH " + ", ".join(scans) if scans else ""}
+        {" UNION ALL ".join(f"({sql})" for _spec_id, sql, _params in branches)}
+        ORDER BY spec_id, {group_select}, distance_bin
+        """
+        params = scan_params + [param for _spec_id, _sql, branch in branches for param in branch]
+        timer.add("build", (time.perf_counter() - build_start) * 1000)
+        table = self._fetch(query, params, "arrow", timer)
+
+        with timer.phase("convert"):
+            if not split:
+                result = table.to_pandas() if result_format == "pandas" else table
+            else:
+                import pyarrow.compute as pc
+
+                # Rows are ordered by spec_id, so each spec's result is a zero-copy slice.
+                counts = pc.value_counts(table.column("spec_id"))
+                lengths = dict(zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()))
+                table = table.drop_columns(["spec_id"])
+                result, offset = [], 0
+                for spec_id in range(len(resolved)):
+                    result.append(table.slice(offset, lengths.get(spec_id, 0)))
+                    offset += lengths.get(spec_id, 0)
+                if result_format == "pandas":
+                    result = [r.to_pandas() for r in result]
+        self._publish("batch_query", resolved, result_format, timer, self._explain_analyze(query, params), rows=table.num_rows)
+        return result
+
+    def _empty_batch_result(self, result_format: str) -> Union["pd.DataFrame", "pa.Table"]:
+        query, params = self._build_query(**self.FILTER_DEFAULTS)
+        table = self.conn.execute(f"SELECT 0 AS spec_id, * FROM ({query}) LIMIT 0", params).to_arrow_table()
+        return table.to_pandas() if result_format == "pandas" else table
 
-            result = pd.DataFrame(columns=columns)
+    def compare_detection_stats(
+        self,
+        baseline: str,
+        candidate: str,
+        vehicle_types: Optional[List[str]] = None,
+        clip_names: Optional[List[str]] = None,
+        min_frame_id: Optional[int] = None,
+        max_frame_id: Optional[int] = None,
+        min_distance: int = 1,
+        max_distance: int = 100,
+        distance_bin_size: int = 10,
+        min_frames: int = 1,
+        confidence: float = 0.95,
+        result_format: str = "pandas",
+        batch_size: int = 1_000_000,
+    ) -> Union["pd.DataFrame", "pa.Table", "pa.RecordBatchReader", List[Dict[str, Any]]]:
+        """
+        Compare the detection stats of two datasets, e.g. a new detector build against the
+        current one, in a single query.
+
+        `baseline` and `candidate` are each a database written by DataLoader (attached
+        read-only at its current snapshot), a parquet index written by
+        DataLoader.build_parquet_index, or a directory of parquet files. Each is aggregated
+        with the same filters, exactly as query_detection_stats would aggregate it alone
+        (including `min_frames`), and the two are full-outer-joined on (vehicle_type,
+        clip_name, distance_bin), so a bin present in only one dataset has NULLs for the other.
+
+        `delta` is the candidate success rate minus the baseline's, and `significant` flags a
+        two-sided two-proportion z-test rejecting equal rates at `confidence`; it is false
+        when either side is missing. `result_format` and `batch_size` are as for
+        query_detection_stats, and the profile event is "compare".
+
+        Raises:
+            FileNotFoundError: If a dataset path does not exist.
+            ValueError: On an unsupported result format or confidence, or an empty dataset.
+        """
+        if result_format not in self.RESULT_FORMATS:
+            raise ValueError(f"result_format must be one of {self.RESULT_FORMATS}, got '{result_format}'")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1.")
 
+        filters = {
+            "vehicle_types": vehicle_types, "clip_names": clip_names,
+            "min_frame_id": min_frame_id, "max_frame_id": max_frame_id,
+            "min_distance": min_distance, "max_distance": max_distance,
+            "distance_bin_size": distance_bin_size, "min_frames": min_frames,
+        }
+        timer = PhaseTimer()
+        with timer.phase("build"):
+            query, params = self._build_compare_query(baseline, candidate, confidence, **filters)
+        event_filters = dict(filters, baseline=baseline, candidate=candidate, confidence=confidence)
+
+        if result_format == "reader":
+            explain = self._explain_analyze(query, params)
+            with timer.phase("execute"):
+                reader = self.conn.execute(query, params).to_arrow_reader(batch_size)
+            self._publish("compare", event_filters, result_format, timer, explain, cache="bypass")
+            return reader
+
+        result = self._fetch(query, params, result_format, timer)
+        self._publish("compare", event_filters, result_format, timer, self._explain_analyze(query, params), rows=len(result), cache="bypass")
         return result
+
+    def _compare_source(
+        self,
+        alias: str,
+        path: str,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+    ) -> Tuple[str, str, str, str, list]:
+        """
+        The source, total and detected expressions, and row filter for one dataset of a
+        comparison. A database is attached as `alias` unless the connection already has it.
+        """
+        target = Path(path)
+        use_rollup = False
+        if target.suffix == ".json":
+            with open(target) as f:
+                files = json.load(f)["files"]
+            if not files:
+                raise ValueError(f"Parquet index '{path}' lists no files.")
+            pruned = self._prune_files(vehicle_types, clip_names, min_frame_id, max_frame_id, files)
+            source = (
+                self._read_parquet(pruned) if pruned
+                else f"(SELECT * FROM {self._read_parquet([files[0]['path']])} WHERE false)"
+            )
+        elif target.is_dir():
+            files = sorted(str(p) for p in target.resolve().glob("*.parquet"))
+            if not files:
+                raise ValueError(f"No parquet files in '{path}'.")
+            source = self._read_parquet(files)
+        elif target.exists():
+            db_file = os.path.abspath(resolve(path))
+            attached = self.conn.execute(
+                "SELECT database_name FROM duckdb_databases() WHERE path = ?", [db_file]
+            ).fetchone()
+            if attached is None:
+                self.conn.execute(f"ATTACH '{db_file.replace(chr(39), chr(39) * 2)}' AS {alias} (READ_ONLY)")
+            catalog = alias if attached is None else attached[0]
+            # As in _exact_source, the rollup can't filter on frame_id.
+            use_rollup = (
+                min_frame_id is None and max_frame_id is None
+                and self._table_exists(self.rollup_table_name, catalog)
+            )
+            source = f'"{catalog}".{self.rollup_table_name if use_rollup else self.table_name}'
+        else:
+            raise FileNotFoundError(f"'{path}' is not a database, parquet index or directory of parquet files.")
+
+        _, total_expr, detected_expr = self._source(use_rollup)
+        where, where_params = self._where(
+            vehicle_types, clip_names, min_frame_id, max_frame_id, min_distance, max_distance
+        )
+        return source, total_expr, detected_expr, where, where_params
+
+    def _build_compare_query(
+        self,
+        baseline: str,
+        candidate: str,
+        confidence: float,
+        vehicle_types: Optional[List[str]],
+        clip_names: Optional[List[str]],
+        min_frame_id: Optional[int],
+        max_frame_id: Optional[int],
+        min_distance: int,
+        max_distance: int,
+        distance_bin_size: int,
+        min_frames: int,
+    ) -> Tuple[str, list]:
+        # Databases attached by an earlier comparison may be other files now.
+        for name in ("baseline", "candidate"):
+            self.conn.execute(f"DETACH DATABASE IF EXISTS compare_{name}")
+
+        group_select = self._group_output(self.GROUP_FIELDS)
+        keys = ", ".join(self.GROUP_FIELDS + ["distance_bin"])
+        sides, params = [], []
+        for name, path in (("baseline", baseline), ("candidate", candidate)):
+            source, total_expr, detected_expr, where, where_params = self._compare_source(
+                f"compare_{name}", path, vehicle_types, clip_names, min_frame_id, max_frame_id,
+                min_distance, max_distance,
+            )
+            sides.append(f"""
+            {name} AS (
+                SELECT
+                    {group_select},
+                    FLOOR(distance / ?) * ? AS distance_bin,
+                    {total_expr} AS total_frames,
+                    CAST({detected_expr} AS BIGINT) AS detected_frames
+                FROM {source}
+                WHERE {where}
+                GROUP BY ALL
+                HAVING {total_expr} >= ?
+            )""")
+            params += [distance_bin_size, distance_bin_size] + where_params + [min_frames]
+
+        # Two-proportion z-test with the pooled rate; bins where both rates are 0 or 1 never differ.
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        query = f"""
+        WITH {",".join(sides)},
+        joined AS (
+            SELECT
+                {keys},
+                b.total_frames AS baseline_total_frames,
+                b.detected_frames AS baseline_detected_frames,
+                b.detected_frames / b.total_frames AS baseline_success_rate,
+                c.total_frames AS candidate_total_frames,
+                c.detected_frames AS candidate_detected_frames,
+                c.detected_frames / c.total_frames AS candidate_success_rate,
+                (b.detected_frames + c.detected_frames) / (b.total_frames + c.total_frames) AS pooled_rate
+            FROM baseline b
+            FULL OUTER JOIN candidate c USING ({keys})
+        )
+        SELECT
+            * EXCLUDE (pooled_rate),
+            candidate_success_rate - baseline_success_rate AS delta,
+            COALESCE(
+                pooled_rate > 0 AND pooled_rate < 1
+                AND ABS(candidate_success_rate - baseline_success_rate) >= ? * SQRT(
+                    pooled_rate * (1 - pooled_rate) * (1 / baseline_total_frames + 1 / candidate_total_frames)
+                ),
+                false
+            ) AS significant
+        FROM joined
+        ORDER BY {keys}
+        """
+        return query, params + [z]
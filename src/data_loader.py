@@ -1,10 +1,80 @@
+import hashlib
+import json
+import multiprocessing
+import threading
+import time
 import pyarrow.parquet as pq
+import pyarrow.compute as pc
 import pyarrow as pa
 import duckdb
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from duckdb import DuckDBPyConnection
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+import profiling
+from profiling import PhaseTimer
+
+
+def _count_out_of_range(parquet_file: pq.ParquetFile, distance_range: Tuple[int, int], batch_rows: int) -> int:
+    """
+    Count the rows whose distance is null or outside the range, trusting the footer min/max
+    statistics of each row group and streaming only row groups without conclusive statistics,
+    one batch of the distance column at a time, so memory stays bounded by `batch_rows`.
+    """
+    low, high = distance_range
+    column_index = parquet_file.schema_arrow.get_field_index("distance")
+    out_of_range = 0
+
+    for i in range(parquet_file.metadata.num_row_groups):
+        stats = parquet_file.metadata.row_group(i).column(column_index).statistics
+        if (
+            stats is not None and stats.has_min_max and stats.has_null_count
+            and stats.null_count == 0 and stats.min >= low and stats.max <= high
+        ):
+            continue
+
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, row_groups=[i], columns=["distance"]):
+            column = batch.column(0)
+            in_range = pc.fill_null(pc.and_(pc.greater_equal(column, low), pc.less_equal(column, high)), False)
+            out_of_range += len(column) - (pc.sum(in_range).as_py() or 0)
+
+    return out_of_range
+
+
+def check_parquet_file(
+    file_str: str,
+    required_columns: Dict[str, pa.DataType],
+    distance_range: Tuple[int, int],
+    batch_rows: int = 65_536,
+) -> Tuple[Optional[str], int, float]:
+    """
+    Validate a parquet file against the required schema and count the rows whose distance
+    is outside the range; those rows are quarantined on load rather than failing the file.
+
+    Module-level so it can run in a process pool. Returns the validation error (None if the
+    file is valid), the number of out-of-range rows and the time spent validating in seconds.
+    """
+    start = time.perf_counter()
+    out_of_range = 0
+    try:
+        parquet_file = pq.ParquetFile(file_str)
+        schema = parquet_file.schema_arrow
+
+        for col, expected_type in required_columns.items():
+            if schema.get_field_index(col) < 0:
+                raise ValueError(f"Missing required column '{col}'")
+            actual_type = schema.field(col).type
+            if actual_type != expected_type:
+                raise TypeError(f"Column '{col}' has wrong type. Expected {expected_type}, got {actual_type}")
+
+        out_of_range = _count_out_of_range(parquet_file, distance_range, batch_rows)
+        error = None
+    except Exception as e:
+        error = str(e)
+
+    return error, out_of_range, time.perf_counter() - start
 
 
 class DataLoader:
@@ -18,9 +88,63 @@ class DataLoader:
         "distance": pa.int64(),
     }
 
-    def __init__(self, data_path: str, db_path: str):
+    DUCKDB_TYPES = {
+        pa.string(): "VARCHAR",
+        pa.int64(): "BIGINT",
+        pa.bool_(): "BOOLEAN",
+    }
+
+    DISTANCE_RANGE = (1, 100)
+
+    VALIDATION_EXECUTORS = ("thread", "process")
+
+    HASH_CHUNK_SIZE = 1 << 20
+
+    # Rows of the distance column read at a time when validation has to scan it.
+    VALIDATION_BATCH_ROWS = 65_536
+
+    PARQUET_INDEX_NAME = "_detection_index.json"
+
+    CLUSTER_KEY = ("clip_name", "vehicle_type", "frame_id")
+
+    ENUM_COLUMNS = ("clip_name", "vehicle_type")
+
+    # Validation guarantees distance is within DISTANCE_RANGE, so it fits in one byte.
+    COMPACT_TYPES = {"distance": "UTINYINT"}
+
+    # The approximate-query sample is stratified by vehicle type and distance bins of this size;
+    # strata with fewer rows than SAMPLE_MIN_STRATUM_ROWS are kept whole.
+    SAMPLE_BIN_SIZE = 10
+
+    SAMPLE_MIN_STRATUM_ROWS = 1000
+
+    def __init__(
+        self,
+        data_path: str,
+        db_path: str,
+        validation_workers: Optional[int] = None,
+        validation_executor: str = "thread",
+        clustered: bool = False,
+        sample_rate: Optional[float] = None,
+    ):
+        if validation_executor not in self.VALIDATION_EXECUTORS:
+            raise ValueError(f"validation_executor must be one of {self.VALIDATION_EXECUTORS}, got '{validation_executor}'")
+        if sample_rate is not None and not 0 < sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
         self.data_path: Path = Path(data_path)
         self.db_path: str = db_path
+        self.validation_workers: Optional[int] = validation_workers
+        self.validation_executor: str = validation_executor
+        self.validation_timings: Dict[str, float] = {}
+        # Rows with a null or out-of-range distance in each validated file, quarantined on load.
+        self.quarantined_rows: Dict[str, int] = {}
+        self.hash_timings: Dict[str, float] = {}
+        self.last_profile: Optional[Dict[str, Any]] = None
+        # Files that failed validation, by path, with the (size, mtime_ns) they were rejected at.
+        self.rejected_files: Dict[str, Tuple[int, int]] = {}
+        self.clustered: bool = clustered
+        self.sample_rate: Optional[float] = sample_rate
+        self.layout_report: Optional[Dict[str, float]] = None
         self.conn: DuckDBPyConnection = duckdb.connect(database=db_path)
         logging.debug(f"Connected to DuckDB database at '{db_path}'")
 
@@ -34,65 +158,897 @@ class DataLoader:
         self.close()
 
     def close(self) -> None:
-        if self.conn:
+        if getattr(self, "conn", None):
             self.conn.close()
             logging.debug("DuckDB connection closed.")
 
-    def _validate_file(self, file_path: Path) -> bool:
-        """Validate if a parquet file matches the required schema and distance range."""
-        file_str = str(file_path)
-        try:
-            parquet_file = pq.ParquetFile(file_str)
-            schema = parquet_file.schema_arrow
-
-            for col, expected_type in self.REQUIRED_COLUMNS.items():
-                if schema.get_field_index(col) < 0:
-                    raise ValueError(f"Missing required column '{col}'")
-                actual_type = schema.field(col).type
-                if actual_type != expected_type:
-                    raise TypeError(f"Column '{col}' has wrong type. Expected {expected_type}, got {actual_type}")
-
-            table = pq.read_table(file_str, columns=["distance"])
-            distance_series = table.column("distance").to_pandas()
-            if not distance_series.between(1, 100).all():
-                raise ValueError("'distance' column has values outside the allowed range 1 to 100")
-
-            logging.debug(f"File '{file_path.name}' passed validation.")
-            return True
-
-        except Exception as e:
-            logging.warning(f"Validation failed for '{file_path.name}': {e}")
+    def _record_validation(self, file_path: Path, error: Optional[str], out_of_range: int, elapsed: float) -> bool:
+        self.validation_timings[str(file_path)] = elapsed
+        if error is not None:
+            logging.warning(f"Validation failed for '{file_path.name}': {error}")
             return False
+        self.quarantined_rows[str(file_path)] = out_of_range
+        if out_of_range:
+            low, high = self.DISTANCE_RANGE
+            logging.warning(
+                f"File '{file_path.name}' has {out_of_range} row(s) with a distance outside {low} to {high}; "
+                "they will be quarantined."
+            )
+        logging.debug(f"File '{file_path.name}' passed validation in {elapsed * 1000:.1f} ms.")
+        return True
+
+    def _validate_file(self, file_path: Path) -> bool:
+        """
+        Validate if a parquet file matches the required schema, counting the rows whose
+        distance is out of range in `quarantined_rows`.
+        """
+        error, out_of_range, elapsed = check_parquet_file(
+            str(file_path), self.REQUIRED_COLUMNS, self.DISTANCE_RANGE, self.VALIDATION_BATCH_ROWS
+        )
+        return self._record_validation(file_path, error, out_of_range, elapsed)
+
+    def _validate_files(self, files: List[Path]) -> List[Path]:
+        """Validate files across the configured thread or process pool, returning the valid ones."""
+        if not files:
+            return []
+
+        start = time.perf_counter()
+        if self.validation_executor == "process" and len(files) > 1:
+            # Spawned rather than forked, as this process already holds a DuckDB connection whose
+            # threads may hold locks that would deadlock a forked child.
+            with ProcessPoolExecutor(
+                max_workers=self.validation_workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                results = pool.map(
+                    check_parquet_file,
+                    [str(f) for f in files],
+                    repeat(self.REQUIRED_COLUMNS),
+                    repeat(self.DISTANCE_RANGE),
+                    repeat(self.VALIDATION_BATCH_ROWS),
+                )
+                passed = [self._record_validation(f, *result) for f, result in zip(files, results)]
+        else:
+            with ThreadPoolExecutor(max_workers=self.validation_workers) as pool:
+                passed = list(pool.map(self._validate_file, files))
+
+        logging.info(
+            f"Validated {len(files)} file(s) in {time.perf_counter() - start:.2f}s "
+            f"using a {self.validation_executor} pool."
+        )
+        return [f for f, ok in zip(files, passed) if ok]
+
+    @staticmethod
+    def rows_table(table_name: str) -> str:
+        """Name of the physical table holding the rows behind the `table_name` view."""
+        return f"{table_name}_rows"
+
+    @staticmethod
+    def manifest_table(table_name: str) -> str:
+        """Name of the table recording which file versions are loaded into `table_name`."""
+        return f"{table_name}_manifest"
+
+    @staticmethod
+    def rollup_table(table_name: str) -> str:
+        """Name of the (vehicle_type, clip_name, distance) rollup maintained alongside `table_name`."""
+        return f"{table_name}_rollup"
+
+    @staticmethod
+    def clip_index_table(table_name: str) -> str:
+        """Name of the per-file, per-clip summary of frame-id range, row count and vehicle types."""
+        return f"{table_name}_clip_index"
+
+    @staticmethod
+    def data_version_table(table_name: str) -> str:
+        """Name of the single-row table holding a counter bumped whenever `table_name` changes."""
+        return f"{table_name}_data_version"
+
+    @staticmethod
+    def quarantine_table(table_name: str) -> str:
+        """Name of the table holding rows rejected from `table_name`, with the reason and source file."""
+        return f"{table_name}_quarantine"
+
+    @staticmethod
+    def sample_table(table_name: str) -> str:
+        """Name of the stratified sample of `table_name` used for approximate queries."""
+        return f"{table_name}_sample"
+
+    @staticmethod
+    def sample_rate_table(table_name: str) -> str:
+        """Name of the single-row table recording the rate the sample was drawn at."""
+        return f"{table_name}_sample_rate"
+
+    def data_version(self, table_name: str = "interview_table") -> Optional[int]:
+        """The counter bumped by every load that changes `table_name`, or None before its first load."""
+        if not self._table_exists(self.data_version_table(table_name)):
+            return None
+        return self.conn.execute(f"SELECT version FROM {self.data_version_table(table_name)}").fetchone()[0]
+
+    def _table_exists(self, name: str) -> bool:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", [name]
+        ).fetchone()[0] > 0
+
+    def _file_hash(self, file_path: Path) -> str:
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        self.hash_timings[str(file_path)] = time.perf_counter() - start
+        return digest.hexdigest()
+
+    def _ensure_storage(self, table_name: str) -> bool:
+        """
+        Create whichever of the rows table, manifest, rollup, clip index and public view are
+        missing. Returns True when `table_name` is a table from before the manifest existed,
+        which holds the rows directly and is left in place until a load replaces it.
+        """
+        rows_table = self.rows_table(table_name)
+        manifest_table = self.manifest_table(table_name)
+        rollup_table = self.rollup_table(table_name)
+
+        existing = self.conn.execute(
+            "SELECT table_type FROM information_schema.tables WHERE table_name = ?", [table_name]
+        ).fetchone()
+        legacy = bool(existing) and existing[0] == "BASE TABLE"
+
+        columns = ", ".join(f"{col} {self.DUCKDB_TYPES[dtype]}" for col, dtype in self.REQUIRED_COLUMNS.items())
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {rows_table} (file_id INTEGER, {columns})")
+        self.conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {manifest_table} (
+                file_id INTEGER,
+                path VARCHAR,
+                size BIGINT,
+                mtime_ns BIGINT,
+                content_hash VARCHAR,
+                row_count BIGINT,
+                loaded_at TIMESTAMP DEFAULT current_timestamp
+            )
+            """
+        )
+        # row_count is the rows loaded; rows quarantined from the same file are counted separately.
+        self.conn.execute(f"ALTER TABLE {manifest_table} ADD COLUMN IF NOT EXISTS quarantined_rows BIGINT DEFAULT 0")
+        self.conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.quarantine_table(table_name)} (
+                file_id INTEGER,
+                path VARCHAR,
+                file_row_number BIGINT,
+                {columns},
+                reason VARCHAR,
+                quarantined_at TIMESTAMP DEFAULT current_timestamp
+            )
+            """
+        )
+        if not legacy:
+            self.conn.execute(
+                f"CREATE OR REPLACE VIEW {table_name} AS SELECT {', '.join(self.REQUIRED_COLUMNS)} FROM {rows_table}"
+            )
+
+        # Kept across full rebuilds so the version never repeats for readers caching results.
+        if not self._table_exists(self.data_version_table(table_name)):
+            self.conn.execute(
+                f"CREATE TABLE {self.data_version_table(table_name)} AS "
+                "SELECT CAST(0 AS BIGINT) AS version, current_timestamp AS updated_at"
+            )
+
+        if not self._table_exists(rollup_table):
+            self.conn.execute(
+                f"""
+                CREATE TABLE {rollup_table} AS
+                SELECT CAST(vehicle_type AS VARCHAR) AS vehicle_type,
+                       CAST(clip_name AS VARCHAR) AS clip_name,
+                       CAST(distance AS BIGINT) AS distance,
+                       CAST(COUNT(*) AS BIGINT) AS total_frames,
+                       CAST(SUM(CASE WHEN detection THEN 1 ELSE 0 END) AS BIGINT) AS detected_frames
+                FROM {rows_table}
+                GROUP BY vehicle_type, clip_name, distance
+                """
+            )
+
+        if not self._table_exists(self.clip_index_table(table_name)):
+            self.conn.execute(
+                f"CREATE TABLE {self.clip_index_table(table_name)} AS {self._clip_summary(table_name)}"
+            )
+        return legacy
+
+    def _drop_storage(self, table_name: str) -> None:
+        """Drop the loaded rows, manifest, rollup, clip index, sample and quarantine of `table_name`."""
+        existing = self.conn.execute(
+            "SELECT table_type FROM information_schema.tables WHERE table_name = ?", [table_name]
+        ).fetchone()
+        if existing:
+            self.conn.execute(f"DROP {'TABLE' if existing[0] == 'BASE TABLE' else 'VIEW'} {table_name}")
+        for name in (
+            self.rows_table(table_name),
+            self.manifest_table(table_name),
+            self.rollup_table(table_name),
+            self.clip_index_table(table_name),
+            self.sample_table(table_name),
+            self.quarantine_table(table_name),
+        ):
+            self.conn.execute(f"DROP TABLE IF EXISTS {name}")
+
+    def _clip_summary(self, table_name: str, file_ids: bool = False) -> str:
+        """
+        SELECT of one clip-index row per (file_id, clip_name) of the loaded rows, limited to
+        the files in the $1 list parameter when `file_ids` is set.
+        """
+        return f"""
+            SELECT file_id,
+                   CAST(clip_name AS VARCHAR) AS clip_name,
+                   CAST(MIN(frame_id) AS BIGINT) AS min_frame_id,
+                   CAST(MAX(frame_id) AS BIGINT) AS max_frame_id,
+                   CAST(COUNT(*) AS BIGINT) AS row_count,
+                   list_sort(list(DISTINCT CAST(vehicle_type AS VARCHAR))) AS vehicle_types
+            FROM {self.rows_table(table_name)}
+            {"WHERE file_id IN (SELECT UNNEST($1))" if file_ids else ""}
+            GROUP BY file_id, clip_name
+        """
+
+    def _bump_data_version(self, table_name: str) -> None:
+        self.conn.execute(
+            f"UPDATE {self.data_version_table(table_name)} SET version = version + 1, updated_at = current_timestamp"
+        )
+
+    def _stage_rollup_delta(self, table_name: str, file_ids: List[int], sign: int) -> None:
+        """Add the rollup contribution of `file_ids` (negated when `sign` is -1) to the pending delta."""
+        self.conn.execute(
+            f"""
+            INSERT INTO rollup_delta
+            SELECT vehicle_type, clip_name, distance,
+                   {sign} * COUNT(*),
+                   {sign} * SUM(CASE WHEN detection THEN 1 ELSE 0 END)
+            FROM {self.rows_table(table_name)}
+            WHERE file_id IN (SELECT UNNEST($1))
+            GROUP BY vehicle_type, clip_name, distance
+            """,
+            (file_ids,),
+        )
+
+    def _merge_rollup_delta(self, table_name: str) -> None:
+        """Fold the pending delta into the rollup without rescanning the loaded rows."""
+        rollup_table = self.rollup_table(table_name)
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE TABLE {rollup_table} AS
+            SELECT vehicle_type, clip_name, distance,
+                   CAST(SUM(total_frames) AS BIGINT) AS total_frames,
+                   CAST(SUM(detected_frames) AS BIGINT) AS detected_frames
+            FROM (SELECT * FROM {rollup_table} UNION ALL SELECT * FROM rollup_delta)
+            GROUP BY vehicle_type, clip_name, distance
+            HAVING SUM(total_frames) > 0
+            """
+        )
+        self.conn.execute("DROP TABLE rollup_delta")
+
+    def _stored_sample_rate(self, table_name: str) -> Optional[float]:
+        if not self._table_exists(self.sample_table(table_name)):
+            return None
+        return self.conn.execute(f"SELECT sample_rate FROM {self.sample_rate_table(table_name)}").fetchone()[0]
+
+    def _sample_rows(self, table_name: str, sample_rate: float, file_ids: Optional[List[int]] = None) -> None:
+        """
+        Add a sample of the rows of `file_ids` (all rows if None) to the sample table.
+
+        Each row is kept independently with its stratum's probability: `sample_rate`, raised
+        to keep about SAMPLE_MIN_STRATUM_ROWS rows of small strata (up to all of them), based
+        on the stratum sizes in the rollup. Rows are picked by a hash of their values, so the
+        same data always gives the same sample. Every sampled row stores its weight, the
+        inverse of its probability, which is what estimates are scaled by.
+        """
+        bin_size = self.SAMPLE_BIN_SIZE
+        self.conn.execute(
+            f"""
+            INSERT INTO {self.sample_table(table_name)}
+            SELECT r.file_id, {', '.join(f'r.{col}' for col in self.REQUIRED_COLUMNS)}, 1 / s.probability AS weight
+            FROM {self.rows_table(table_name)} AS r
+            JOIN (
+                SELECT vehicle_type, distance // {bin_size} AS stratum,
+                       LEAST(1, GREATEST($1, {self.SAMPLE_MIN_STRATUM_ROWS} / SUM(total_frames))) AS probability
+                FROM {self.rollup_table(table_name)}
+                GROUP BY ALL
+            ) AS s ON s.vehicle_type = CAST(r.vehicle_type AS VARCHAR) AND s.stratum = r.distance // {bin_size}
+            WHERE {"r.file_id IN (SELECT UNNEST($2)) AND" if file_ids is not None else ""}
+                hash(r.file_id, CAST(r.clip_name AS VARCHAR), r.frame_id, CAST(r.vehicle_type AS VARCHAR),
+                     CAST(r.distance AS BIGINT), r.detection) / 18446744073709551616.0 < s.probability
+            """,
+            [sample_rate] if file_ids is None else [sample_rate, file_ids],
+        )
+
+    def _quarantine_rows(self, table_name: str, paths: List[str]) -> None:
+        """
+        Copy the rows of `paths` that load_data leaves out, those with a null or out-of-range
+        distance, to the quarantine table with their position in the file and the reason.
+        """
+        low, high = self.DISTANCE_RANGE
+        self.conn.execute(
+            f"""
+            INSERT INTO {self.quarantine_table(table_name)}
+                (file_id, path, file_row_number, {', '.join(self.REQUIRED_COLUMNS)}, reason)
+            SELECT m.file_id, p.filename, p.file_row_number, {', '.join(f'p.{col}' for col in self.REQUIRED_COLUMNS)},
+                   CASE WHEN p.distance IS NULL THEN 'distance is null'
+                        ELSE 'distance ' || p.distance || ' outside {low} to {high}' END
+            FROM read_parquet($1, filename = true, file_row_number = true) AS p
+            JOIN {self.manifest_table(table_name)} AS m ON m.path = p.filename
+            WHERE p.distance IS NULL OR p.distance NOT BETWEEN {low} AND {high}
+            """,
+            (paths,),
+        )
+
+    def _update_sample(self, table_name: str, added_ids: List[int], removed_ids: List[int]) -> None:
+        """
+        Keep the approximate-query sample in step with a load: drop the sampled rows of
+        removed files and sample the added ones. The whole table is resampled when the
+        configured rate differs from the rate the existing sample was drawn at.
+        """
+        stored_rate = self._stored_sample_rate(table_name)
+        sample_rate = self.sample_rate if self.sample_rate is not None else stored_rate
+        if sample_rate is None:
+            return
+
+        sample_table = self.sample_table(table_name)
+        if stored_rate != sample_rate:
+            columns = ", ".join(f"{col} {self.DUCKDB_TYPES[dtype]}" for col, dtype in self.REQUIRED_COLUMNS.items())
+            self.conn.execute(f"CREATE OR REPLACE TABLE {sample_table} (file_id INTEGER, {columns}, weight DOUBLE)")
+            self.conn.execute(f"CREATE OR REPLACE TABLE {self.sample_rate_table(table_name)} AS SELECT CAST($1 AS DOUBLE) AS sample_rate", [sample_rate])
+            self._sample_rows(table_name, sample_rate)
+            return
+        if removed_ids:
+            self.conn.execute(f"DELETE FROM {sample_table} WHERE file_id IN (SELECT UNNEST($1))", (removed_ids,))
+        if added_ids:
+            self._sample_rows(table_name, sample_rate, added_ids)
 
-    def load_data(self, table_name: str = "interview_table") -> None:
+    def _plan_changes(
+        self, files: List[Path], manifest: Dict[str, Tuple[int, int, int, str]], min_file_age: float = 0.0
+    ) -> Tuple[List[Tuple[Path, int, int, str]], List[int], List[Tuple[int, int, int]]]:
         """
-        Loads validated parquet files into DuckDB as a single table.
+        Compare files on disk against the manifest.
+
+        Returns the files that need validating and loading (with their size, mtime and hash),
+        the file ids whose rows must be dropped, and (file_id, size, mtime) updates for files
+        that were touched without their content changing. Files modified less than
+        `min_file_age` seconds ago may still be being written and are left for a later load.
+        """
+        pending, stale_ids, touched = [], [], []
+        settled_before = time.time_ns() - int(min_file_age * 1e9)
+
+        for file_path in files:
+            path = str(file_path)
+            stat = file_path.stat()
+            known = manifest.get(path)
+            if min_file_age > 0 and stat.st_mtime_ns > settled_before:
+                continue
+            if self.rejected_files.get(path) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            if known is not None:
+                file_id, size, mtime_ns, content_hash = known
+                if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                new_hash = self._file_hash(file_path)
+                if new_hash == content_hash:
+                    touched.append((file_id, stat.st_size, stat.st_mtime_ns))
+                    continue
+                stale_ids.append(file_id)
+                pending.append((file_path, stat.st_size, stat.st_mtime_ns, new_hash))
+            else:
+                pending.append((file_path, stat.st_size, stat.st_mtime_ns, self._file_hash(file_path)))
+
+        on_disk = {str(f) for f in files}
+        stale_ids.extend(file_id for path, (file_id, *_rest) in manifest.items() if path not in on_disk)
+        return pending, stale_ids, touched
+
+    def load_data(self, table_name: str = "interview_table", full_rebuild: bool = False, min_file_age: float = 0.0) -> None:
+        """
+        Incrementally loads validated parquet files into DuckDB.
+
+        A manifest table records the size, mtime, content hash and row count of every loaded
+        file, so only new files are validated and appended, and the rows of changed or deleted
+        files are dropped (and re-inserted for changed files). The distance-level rollup and
+        the per-clip frame-range index are updated from the added and removed files only.
+        `full_rebuild` replaces the existing rows, manifest, rollup, clip index and sample in
+        the load transaction, so they are kept if validation or the load fails. Files modified within the last `min_file_age` seconds are skipped until a
+        later load.
+
+        With a `sample_rate`, or once a sample exists, the stratified sample for approximate
+        queries is updated in the same transaction (see _sample_rows).
+
+        Phase timings and per-file hash and validation timings are kept in `last_profile` and
+        published to profiling listeners as a "load" event.
 
         Raises:
             FileNotFoundError: If no parquet files found.
             RuntimeError: If no valid parquet files after validation.
             RuntimeError: If DuckDB fails to read parquet files.
         """
-        files: List[Path] = list(self.data_path.glob("*.parquet"))
+        files: List[Path] = sorted(self.data_path.resolve().glob("*.parquet"))
         if not files:
             raise FileNotFoundError(f"No Parquet files found in directory '{self.data_path.resolve()}'")
 
-        valid_files: List[str] = [str(f) for f in files if self._validate_file(f)]
-        if not valid_files:
+        timer = PhaseTimer()
+        self.validation_timings, self.hash_timings, self.quarantined_rows = {}, {}, {}
+        with timer.phase("prepare"):
+            # A pre-manifest table is replaced like a full rebuild, once there is something valid to load.
+            full_rebuild = self._ensure_storage(table_name) or full_rebuild
+        rows_table = self.rows_table(table_name)
+        manifest_table = self.manifest_table(table_name)
+
+        with timer.phase("plan"):
+            # A full rebuild reloads every file; the old rows are only dropped once validation passes.
+            manifest = {} if full_rebuild else {
+                path: (file_id, size, mtime_ns, content_hash)
+                for file_id, path, size, mtime_ns, content_hash in self.conn.execute(
+                    f"SELECT file_id, path, size, mtime_ns, content_hash FROM {manifest_table}"
+                ).fetchall()
+            }
+            pending, stale_ids, touched = self._plan_changes(files, manifest, min_file_age)
+
+        with timer.phase("validate"):
+            valid_paths = set(self._validate_files([entry[0] for entry in pending]))
+        valid = [entry for entry in pending if entry[0] in valid_paths]
+        for file_path, size, mtime_ns, _hash in pending:
+            if file_path not in valid_paths:
+                self.rejected_files[str(file_path)] = (size, mtime_ns)
+        if pending and not valid and len(manifest) == len(stale_ids):
             raise RuntimeError("No valid Parquet files found after validation.")
 
+        next_id = max((file_id for file_id, *_rest in manifest.values()), default=0) + 1
+        new_entries = []
+        for i, (file_path, size, mtime_ns, content_hash) in enumerate(valid):
+            quarantined = self.quarantined_rows[str(file_path)]
+            row_count = pq.read_metadata(file_path).num_rows - quarantined
+            new_entries.append((next_id + i, str(file_path), size, mtime_ns, content_hash, row_count, quarantined))
+
+        resample = self.sample_rate is not None and self._stored_sample_rate(table_name) != self.sample_rate
+        # A table loaded without clustering is clustered by the first clustered load, even an unchanged one.
+        relayout = self.clustered and bool(stale_ids or new_entries or full_rebuild or not self._is_compact(table_name))
+        if not (stale_ids or touched or new_entries or full_rebuild or resample or relayout):
+            logging.debug(f"No changes to load into '{table_name}'.")
+            self.last_profile = self._load_profile(table_name, full_rebuild, timer, files, manifest, stale_ids, touched, new_entries)
+            profiling.publish(self.last_profile)
+            return
+
+        expand = bool(new_entries) and not full_rebuild and self._is_compact(table_name) and self._has_new_enum_values(
+            table_name, [entry[1] for entry in new_entries]
+        )
+        relayout = relayout or expand
+
+        low, high = self.DISTANCE_RANGE
         try:
+            self.conn.execute("BEGIN TRANSACTION")
+            if full_rebuild:
+                with timer.phase("prepare"):
+                    self._drop_storage(table_name)
+                    self._ensure_storage(table_name)
+            if expand:
+                # New clip names or vehicle types don't fit the ENUMs; widen back to VARCHAR for the insert.
+                with timer.phase("expand_layout"):
+                    self._expand_layout(table_name)
             self.conn.execute(
-                f"""
-                CREATE OR REPLACE TABLE {table_name} AS
-                SELECT * FROM read_parquet($1);
-                """,
-                (valid_files,),
+                "CREATE OR REPLACE TEMP TABLE rollup_delta "
+                "(vehicle_type VARCHAR, clip_name VARCHAR, distance BIGINT, total_frames BIGINT, detected_frames BIGINT)"
             )
-            logging.info(f"Loaded {len(valid_files)} file(s) into DuckDB table '{table_name}'.")
+            if stale_ids:
+                with timer.phase("delete"):
+                    self._stage_rollup_delta(table_name, stale_ids, -1)
+                    self.conn.execute(f"DELETE FROM {rows_table} WHERE file_id IN (SELECT UNNEST($1))", (stale_ids,))
+                    self.conn.execute(f"DELETE FROM {manifest_table} WHERE file_id IN (SELECT UNNEST($1))", (stale_ids,))
+                    self.conn.execute(
+                        f"DELETE FROM {self.quarantine_table(table_name)} WHERE file_id IN (SELECT UNNEST($1))", (stale_ids,)
+                    )
+                    self.conn.execute(
+                        f"DELETE FROM {self.clip_index_table(table_name)} WHERE file_id IN (SELECT UNNEST($1))", (stale_ids,)
+                    )
+            if touched:
+                self.conn.executemany(f"UPDATE {manifest_table} SET size = ?, mtime_ns = ? WHERE file_id = ?", [
+                    (size, mtime_ns, file_id) for file_id, size, mtime_ns in touched
+                ])
+            if new_entries:
+                with timer.phase("insert"):
+                    self.conn.executemany(
+                        f"""
+                        INSERT INTO {manifest_table} (file_id, path, size, mtime_ns, content_hash, row_count, quarantined_rows)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        new_entries,
+                    )
+                    self.conn.execute(
+                        f"""
+                        INSERT INTO {rows_table}
+                        SELECT m.file_id, {', '.join(f'p.{col}' for col in self.REQUIRED_COLUMNS)}
+                        FROM read_parquet($1, filename = true) AS p
+                        JOIN {manifest_table} AS m ON m.path = p.filename
+                        WHERE p.distance BETWEEN {low} AND {high}
+                        {"ORDER BY " + ", ".join(f"p.{col}" for col in self.CLUSTER_KEY) if self.clustered else ""}
+                        """,
+                        ([entry[1] for entry in new_entries],),
+                    )
+                quarantine_paths = [entry[1] for entry in new_entries if entry[6]]
+                if quarantine_paths:
+                    with timer.phase("quarantine"):
+                        self._quarantine_rows(table_name, quarantine_paths)
+                with timer.phase("rollup"):
+                    self._stage_rollup_delta(table_name, [entry[0] for entry in new_entries], 1)
+                with timer.phase("clip_index"):
+                    self.conn.execute(
+                        f"INSERT INTO {self.clip_index_table(table_name)} {self._clip_summary(table_name, file_ids=True)}",
+                        ([entry[0] for entry in new_entries],),
+                    )
+            with timer.phase("rollup"):
+                self._merge_rollup_delta(table_name)
+            with timer.phase("sample"):
+                self._update_sample(table_name, [entry[0] for entry in new_entries], stale_ids)
+            if stale_ids or new_entries or full_rebuild or resample:
+                self._bump_data_version(table_name)
+            with timer.phase("commit"):
+                self.conn.execute("COMMIT")
+            committed_at = time.time()
         except duckdb.Error as e:
+            self.conn.execute("ROLLBACK")
             raise RuntimeError(f"Failed to load Parquet files into DuckDB: {e}")
 
+        logging.info(
+            f"Loaded {len(new_entries)} new file(s), dropped {len(stale_ids)} stale file(s) "
+            f"into DuckDB table '{table_name}'."
+        )
+
+        if relayout:
+            with timer.phase("relayout"):
+                self.optimize_layout(table_name)
+
+        self.last_profile = self._load_profile(
+            table_name, full_rebuild, timer, files, manifest, stale_ids, touched, new_entries, committed_at
+        )
+        profiling.publish(self.last_profile)
+
+    def verify(self, table_name: str = "interview_table") -> int:
+        """
+        Check that the loaded rows match the manifest's per-file row counts and the totals of
+        the rollup and clip index, and return the row count.
+
+        Raises:
+            RuntimeError: If the counts disagree or nothing is loaded.
+        """
+        rows, manifest_rows, rollup_rows, clip_index_rows = self.conn.execute(
+            f"""
+            SELECT (SELECT COUNT(*) FROM {self.rows_table(table_name)}),
+                   (SELECT COALESCE(SUM(row_count), 0) FROM {self.manifest_table(table_name)}),
+                   (SELECT COALESCE(SUM(total_frames), 0) FROM {self.rollup_table(table_name)}),
+                   (SELECT COALESCE(SUM(row_count), 0) FROM {self.clip_index_table(table_name)})
+            """
+        ).fetchone()
+        if not rows or not rows == manifest_rows == rollup_rows == clip_index_rows:
+            raise RuntimeError(
+                f"Row count check failed for '{table_name}': {rows} rows, {manifest_rows} in the manifest, "
+                f"{rollup_rows} in the rollup, {clip_index_rows} in the clip index."
+            )
+        return rows
+
+    def watch(
+        self,
+        table_name: str = "interview_table",
+        interval: float = 2.0,
+        min_file_age: float = 1.0,
+        stop: Optional[threading.Event] = None,
+        hold_connection: bool = True,
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """
+        Poll the data directory every `interval` seconds and load new, changed and deleted
+        files until `stop` is set (or after `max_polls` polls).
+
+        Each poll is one incremental load_data call: new files are appended and the rollup
+        updated from their rows in a single transaction, so readers of this database see a
+        batch either entirely or not at all. Files modified within `min_file_age` seconds may
+        still be being written and wait for a later poll; files that fail validation are
+        skipped until they change.
+
+        DuckDB allows one writing process. With `hold_connection=False` the database is
+        closed between polls so short-lived readers in other processes can open it, and a
+        poll that finds it locked is retried on the next one.
+
+        Raises:
+            ValueError: For a clustered loader, as re-clustering rewrites the whole table and
+                would rescan all of it on every poll; cluster with a separate load instead.
+        """
+        if self.clustered:
+            raise ValueError("watch does not re-cluster; run a clustered load (setup_db.py --cluster) separately.")
+        stop = stop if stop is not None else threading.Event()
+        polls = 0
+        while not stop.is_set():
+            try:
+                if self.conn is None:
+                    self.conn = duckdb.connect(database=self.db_path)
+                if polls == 0:
+                    # Readers can open the (empty) table before the first file arrives.
+                    self._ensure_storage(table_name)
+                self.load_data(table_name, min_file_age=min_file_age)
+            except duckdb.IOException as e:
+                logging.warning(f"Database is busy, retrying on the next poll: {e}")
+            except FileNotFoundError as e:
+                logging.debug(str(e))
+            except RuntimeError as e:
+                logging.warning(str(e))
+            finally:
+                if not hold_connection and self.conn is not None:
+                    self.conn.close()
+                    self.conn = None
+
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            stop.wait(interval)
+
+    def _load_profile(
+        self,
+        table_name: str,
+        full_rebuild: bool,
+        timer: PhaseTimer,
+        files: List[Path],
+        manifest: Dict[str, Tuple[int, int, int, str]],
+        stale_ids: List[int],
+        touched: List[Tuple[int, int, int]],
+        new_entries: List[tuple],
+        committed_at: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        The "load" profile event: phase timings, ingest throughput, and what happened to each
+        file. The lag of a loaded file is the time from its last modification to the commit.
+        Each loaded file reports the rows it added and the rows it sent to quarantine.
+        """
+        loaded = {entry[1]: entry[5] for entry in new_entries}
+        quarantined = {entry[1]: entry[6] for entry in new_entries}
+        lag = {entry[1]: committed_at - entry[3] / 1e9 for entry in new_entries} if committed_at else {}
+        elapsed_s = sum(timer.phases_ms.values()) / 1000
+        touched_ids = {file_id for file_id, *_rest in touched}
+        dropped = set(stale_ids)
+
+        def status(path: str) -> str:
+            if path in loaded:
+                return "loaded"
+            if path in self.validation_timings or path in self.rejected_files:
+                return "invalid"
+            known = manifest.get(path)
+            if known is None or known[0] in dropped:
+                return "dropped"
+            return "touched" if known[0] in touched_ids else "unchanged"
+
+        paths = [str(f) for f in files] + sorted(
+            path for path, (file_id, *_rest) in manifest.items() if file_id in dropped and path not in loaded
+        )
+        return {
+            "event": "load",
+            "table": table_name,
+            "full_rebuild": full_rebuild,
+            "loaded_files": len(new_entries),
+            "dropped_files": len(dropped),
+            "loaded_rows": sum(loaded.values()),
+            "quarantined_rows": sum(quarantined.values()),
+            "rows_per_sec": sum(loaded.values()) / elapsed_s if loaded and elapsed_s else None,
+            "max_lag_s": max(lag.values(), default=None),
+            "phases_ms": timer.phases_ms,
+            "files": [
+                {
+                    "path": path,
+                    "status": status(path),
+                    "hash_ms": self.hash_timings[path] * 1000 if path in self.hash_timings else None,
+                    "validate_ms": self.validation_timings[path] * 1000 if path in self.validation_timings else None,
+                    "rows": loaded.get(path),
+                    "quarantined_rows": quarantined.get(path),
+                    "lag_s": lag.get(path),
+                }
+                for path in dict.fromkeys(paths)
+            ],
+        }
+
+    def _enum_type(self, table_name: str, column: str) -> str:
+        return f"{table_name}_{column}_enum"
+
+    def _is_compact(self, table_name: str) -> bool:
+        data_type = self.conn.execute(
+            "SELECT data_type FROM information_schema.columns WHERE table_name = ? AND column_name = ?",
+            [self.rows_table(table_name), self.ENUM_COLUMNS[0]],
+        ).fetchone()
+        return data_type is not None and data_type[0].startswith("ENUM")
+
+    def _has_new_enum_values(self, table_name: str, paths: List[str]) -> bool:
+        for column in self.ENUM_COLUMNS:
+            new_values = self.conn.execute(
+                f"""
+                SELECT COUNT(*) FROM (
+                    SELECT DISTINCT {column} FROM read_parquet($1)
+                    EXCEPT
+                    SELECT UNNEST(enum_range(NULL::{self._enum_type(table_name, column)}))
+                )
+                """,
+                (paths,),
+            ).fetchone()[0]
+            if new_values:
+                return True
+        return False
+
+    def _expand_layout(self, table_name: str) -> None:
+        """Convert the compact ENUM and narrow integer columns back to their plain types."""
+        rows_table = self.rows_table(table_name)
+        for column in self.ENUM_COLUMNS:
+            self.conn.execute(f"ALTER TABLE {rows_table} ALTER {column} TYPE VARCHAR")
+            self.conn.execute(f"DROP TYPE IF EXISTS {self._enum_type(table_name, column)}")
+        for column in self.COMPACT_TYPES:
+            self.conn.execute(
+                f"ALTER TABLE {rows_table} ALTER {column} TYPE {self.DUCKDB_TYPES[self.REQUIRED_COLUMNS[column]]}"
+            )
+
+    def _storage_bytes(self) -> int:
+        self.conn.execute("CHECKPOINT")
+        if self.db_path == ":memory:":
+            return self.conn.execute(
+                "SELECT COALESCE(SUM(memory_usage_bytes), 0) FROM duckdb_memory() WHERE tag = 'IN_MEMORY_TABLE'"
+            ).fetchone()[0]
+        return self.conn.execute("SELECT used_blocks * block_size FROM pragma_database_size()").fetchone()[0]
+
+    def _time_queries(self, table_name: str, clip_name: Optional[str]) -> Dict[str, float]:
+        """Best-of-three timings (ms) of the Client's raw group-by and a clip/frame-window filter."""
+        # Match the Client, which casts filter values to the ENUM so the column isn't cast instead.
+        clip_param = f"TRY_CAST(? AS {self._enum_type(table_name, 'clip_name')})" if self._is_compact(table_name) else "?"
+        queries = {
+            "group_by_ms": (
+                f"""
+                SELECT vehicle_type, clip_name, FLOOR(distance / 10) * 10 AS distance_bin,
+                       COUNT(*), SUM(CASE WHEN detection THEN 1 ELSE 0 END)
+                FROM {table_name} GROUP BY ALL
+                """,
+                [],
+            ),
+            "clip_frame_filter_ms": (
+                f"SELECT COUNT(*), SUM(CASE WHEN detection THEN 1 ELSE 0 END) FROM {table_name} "
+                f"WHERE clip_name = {clip_param} AND frame_id BETWEEN 100 AND 200",
+                [clip_name],
+            ),
+        }
+        timings = {}
+        for name, (query, params) in queries.items():
+            samples = []
+            for _ in range(3):
+                start = time.perf_counter()
+                self.conn.execute(query, params).fetchall()
+                samples.append(time.perf_counter() - start)
+            timings[name] = min(samples) * 1000
+        return timings
+
+    def optimize_layout(self, table_name: str = "interview_table") -> Dict[str, float]:
+        """
+        Rewrite the loaded rows sorted by (clip_name, vehicle_type, frame_id), so DuckDB's
+        per-row-group min/max zone maps can skip data for clip and frame filters, with clip_name
+        and vehicle_type stored as ENUMs and distance as a single byte.
+
+        Returns (and logs) the storage size and representative query timings before and after.
+        """
+        rows_table = self.rows_table(table_name)
+        clip_name = self.conn.execute(f"SELECT MIN(clip_name) FROM {rows_table}").fetchone()[0]
+        report = {"bytes_before": self._storage_bytes()}
+        report.update({f"{k}_before": v for k, v in self._time_queries(table_name, clip_name).items()})
+
+        # One transaction, so readers sharing the database never see the ENUMs half re-created.
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            if self._is_compact(table_name):
+                self._expand_layout(table_name)
+
+            columns = []
+            for col in ["file_id"] + list(self.REQUIRED_COLUMNS):
+                if col in self.ENUM_COLUMNS:
+                    enum_type = self._enum_type(table_name, col)
+                    self.conn.execute(f"DROP TYPE IF EXISTS {enum_type}")
+                    self.conn.execute(
+                        f"CREATE TYPE {enum_type} AS ENUM "
+                        f"(SELECT DISTINCT {col} FROM {rows_table} WHERE {col} IS NOT NULL ORDER BY 1)"
+                    )
+                    columns.append(f"CAST({col} AS {enum_type}) AS {col}")
+                elif col in self.COMPACT_TYPES:
+                    columns.append(f"CAST({col} AS {self.COMPACT_TYPES[col]}) AS {col}")
+                else:
+                    columns.append(col)
+
+            self.conn.execute(
+                f"""
+                CREATE OR REPLACE TABLE {rows_table} AS
+                SELECT {', '.join(columns)} FROM {rows_table}
+                ORDER BY {', '.join(self.CLUSTER_KEY)}
+                """
+            )
+            self.conn.execute(
+                f"CREATE OR REPLACE VIEW {table_name} AS SELECT {', '.join(self.REQUIRED_COLUMNS)} FROM {rows_table}"
+            )
+            # Readers re-check column types when the version changes.
+            self._bump_data_version(table_name)
+            self.conn.execute("COMMIT")
+        except duckdb.Error:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        report["bytes_after"] = self._storage_bytes()
+        report.update({f"{k}_after": v for k, v in self._time_queries(table_name, clip_name).items()})
+        self.layout_report = report
+        logging.info(
+            f"Clustered '{table_name}': {report['bytes_before'] / 2**20:.1f} MiB -> {report['bytes_after'] / 2**20:.1f} MiB, "
+            f"group-by {report['group_by_ms_before']:.1f} -> {report['group_by_ms_after']:.1f} ms, "
+            f"clip/frame filter {report['clip_frame_filter_ms_before']:.1f} -> {report['clip_frame_filter_ms_after']:.1f} ms."
+        )
+        return report
+
+    def _index_entry(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Summarize the clip names, vehicle types and frame-id range of one parquet file, and
+        the frame-id range, row count and vehicle types of each clip in it.
+        """
+        parquet_file = pq.ParquetFile(str(file_path))
+        table = parquet_file.read(columns=["clip_name", "vehicle_type", "frame_id"])
+        frame_bounds = pc.min_max(table.column("frame_id"))
+        clips = table.group_by("clip_name").aggregate([
+            ("frame_id", "min"), ("frame_id", "max"), ("frame_id", "count"), ("vehicle_type", "distinct"),
+        ])
+        stat = file_path.stat()
+        return {
+            "path": str(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "num_rows": parquet_file.metadata.num_rows,
+            "num_row_groups": parquet_file.metadata.num_row_groups,
+            "clip_names": sorted(pc.unique(table.column("clip_name")).to_pylist()),
+            "vehicle_types": sorted(pc.unique(table.column("vehicle_type")).to_pylist()),
+            "min_frame_id": frame_bounds["min"].as_py(),
+            "max_frame_id": frame_bounds["max"].as_py(),
+            "clips": sorted(
+                (
+                    {
+                        "clip_name": clip["clip_name"],
+                        "min_frame_id": clip["frame_id_min"],
+                        "max_frame_id": clip["frame_id_max"],
+                        "num_rows": clip["frame_id_count"],
+                        "vehicle_types": sorted(clip["vehicle_type_distinct"]),
+                    }
+                    for clip in clips.to_pylist()
+                ),
+                key=lambda clip: clip["clip_name"],
+            ),
+        }
+
+    def build_parquet_index(self, index_path: Optional[str] = None) -> Path:
+        """
+        Validate the parquet files and write a sidecar JSON index of the valid ones, recording
+        each file's clip names, vehicle types and frame-id range, overall and per clip, so
+        queries can run directly on the files and skip those that cannot match. Nothing is
+        loaded into DuckDB. Files with out-of-range distances are left out, as their rows
+        can't be quarantined in place.
+
+        Raises:
+            FileNotFoundError: If no parquet files found.
+            RuntimeError: If no valid parquet files after validation.
+        """
+        files: List[Path] = sorted(self.data_path.resolve().glob("*.parquet"))
+        if not files:
+            raise FileNotFoundError(f"No Parquet files found in directory '{self.data_path.resolve()}'")
+
+        self.quarantined_rows = {}
+        # Files are queried as they are, so there is nowhere to quarantine rows to.
+        valid_files = [f for f in self._validate_files(files) if not self.quarantined_rows[str(f)]]
+        for f in files:
+            if self.quarantined_rows.get(str(f)):
+                logging.warning(f"Leaving '{f.name}' out of the index: it has rows with a distance out of range.")
+        if not valid_files:
+            raise RuntimeError("No valid Parquet files found after validation.")
+
+        with ThreadPoolExecutor(max_workers=self.validation_workers) as pool:
+            entries = list(pool.map(self._index_entry, valid_files))
+
+        path = Path(index_path) if index_path else self.data_path / self.PARQUET_INDEX_NAME
+        with open(path, "w") as f:
+            json.dump({"files": entries}, f, indent=1)
+        logging.info(f"Indexed {len(entries)} file(s) into '{path}'.")
+        return path
+
     def get_connection(self) -> DuckDBPyConnection:
         """Returns the active DuckDB connection."""
         return self.conn
@@ -0,0 +1,101 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import duckdb
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+_worker_conn: Optional[duckdb.DuckDBPyConnection] = None
+
+
+def _init_worker(settings: Dict[str, object]) -> None:
+    """Open the worker's own DuckDB connection with its thread, memory and spill settings."""
+    global _worker_conn
+    config = {name: value for name, value in settings.items() if value is not None}
+    # Partial aggregates are merged and sorted by the caller, so rows may come back in any order.
+    config["preserve_insertion_order"] = False
+    _worker_conn = duckdb.connect(database=":memory:", config=config)
+
+
+def partial_aggregate(query: str, params: list) -> "pa.Table":
+    """
+    Run one partial-aggregate query on the worker's connection.
+
+    Module-level so it can run in a process pool.
+    """
+    return _worker_conn.execute(query, params).to_arrow_table()
+
+
+class ProcessEngine:
+    """
+    Runs partial aggregates of a query_detection_stats call in a pool of worker processes.
+
+    Each worker has its own DuckDB connection, limited to `threads` threads and
+    `memory_limit` (e.g. "2GB") of memory and spilling to `temp_directory`, so the memory
+    of a query over many files is bounded by `workers` times the per-worker limit no
+    matter how much data it reads. The Client sends one task per `files_per_task` parquet
+    files and merges the (group keys, distance_bin, total, detected) partials.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        threads: Optional[int] = 1,
+        memory_limit: Optional[str] = None,
+        temp_directory: Optional[str] = None,
+        files_per_task: int = 1,
+    ):
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if threads is not None and threads < 1:
+            raise ValueError("threads must be at least 1.")
+        if files_per_task < 1:
+            raise ValueError("files_per_task must be at least 1.")
+        self.workers = workers or os.cpu_count() or 1
+        self.settings = {"threads": threads, "memory_limit": memory_limit, "temp_directory": temp_directory}
+        self.files_per_task = files_per_task
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ProcessEngine":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Kept across queries so workers start once; spawned rather than forked, as forking a
+        # process whose DuckDB threads may hold locks can deadlock the child.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.settings,),
+            )
+        return self._pool
+
+    def shards(self, paths: List[str]) -> List[List[str]]:
+        """Split `paths` into the groups of files each task reads."""
+        return [paths[i:i + self.files_per_task] for i in range(0, len(paths), self.files_per_task)]
+
+    def map(self, queries: List[tuple]) -> List["pa.Table"]:
+        """Run (query, params) pairs across the pool and return their results in order."""
+        if not queries:
+            return []
+        start = time.perf_counter()
+        results = list(self._get_pool().map(partial_aggregate, *zip(*queries)))
+        logging.debug(
+            f"Computed {len(results)} partial aggregate(s) on {self.workers} worker(s) "
+            f"in {time.perf_counter() - start:.2f}s."
+        )
+        return results
@@ -1,48 +1,250 @@
 import argparse
+import json
 import logging
 import os
-import duckdb
-from client import Client
-from utils import validate_args, configure_logging
+import sys
+from typing import TYPE_CHECKING
+from output import BINARY_FORMATS, OUTPUT_FORMATS, emit_chunks, emit_stream, emit_text, format_table, iter_table
+from profiling import PhaseTimer, subscribe
+from utils import add_query_arguments, load_specs, query_kwargs, validate_args, configure_logging
+
+if TYPE_CHECKING:
+    from client import Client
 
 DB_PATH = os.environ.get("DB_PATH", "duckdb/interview_table.duckdb")
 
+# Client.RESULT_COLUMNS and the extra APPROX_RESULT_COLUMNS, listed here so parsing arguments
+# doesn't import the client and DuckDB.
+APPROX_ORDER_COLUMNS = ("success_rate_low", "success_rate_high", "estimated")
+ORDER_COLUMNS = ("vehicle_type", "clip_name", "distance_bin", "total_frames", "detected_frames", "success_rate") + APPROX_ORDER_COLUMNS
+# Client.DIMENSIONS and Client.SUBTOTALS, for the same reason.
+GROUP_DIMENSIONS = ("vehicle_type", "clip_name", "clip_family", "clip_date", "distance_bin")
+SUBTOTALS = ("rollup", "cube")
 
-def main():
-    parser = argparse.ArgumentParser(description="Detection Success Analyzer")
-
-    parser.add_argument("--vehicles", type=str, nargs="*", default=None, help="Vehicle types to include, e.g. --vehicles car truck")
-    parser.add_argument("--clip-names", type=str, nargs="*", default=None, help="Clip names to filter, e.g. --clip-names clip1 clip2")
-    parser.add_argument("--min-frame-id", type=int, default=None, help="Minimum frame index to include")
-    parser.add_argument("--max-frame-id", type=int, default=None, help="Maximum frame index to include")
-    parser.add_argument("--min-distance", type=int, default=1, help="Minimum distance to consider (default: 1)")
-    parser.add_argument("--max-distance", type=int, default=100, help="Maximum distance to consider (default: 100)")
-    parser.add_argument("--distance-bin-size", type=int, default=10, help="Distance bin size (default: 10)")
-    parser.add_argument("--min-frames", type=int, default=1, help="Minimum number of frames per bin to consider.")
+
+def _env_int(name: str):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def run_batch(client: "Client", specs: list, args: argparse.Namespace, timer: PhaseTimer) -> None:
+    """Answer every spec in one query; tables are printed per spec, other formats get a spec_id column."""
+    if args.output == "table":
+        results = client.query_detection_stats_batch(specs, result_format="arrow")
+        with timer.phase("output"):
+            emit_text("\n\n".join(
+                f"# spec {i}\n{format_table(result.column_names, result.to_pylist())}" for i, result in enumerate(results)
+            ), args.output_file)
+        return
+
+    import pyarrow as pa
+
+    table = client.query_detection_stats_batch(specs, result_format="arrow", split=False)
+    with timer.phase("output"):
+        reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches())
+        rows = emit_stream(reader, args.output, args.output_file)
+    logging.info(f"Batch of {len(specs)} spec(s) executed successfully. Wrote {rows} row(s) as {args.output}.")
+
+
+def paging_kwargs(args: argparse.Namespace) -> dict:
+    return {"order_by": args.order_by, "descending": args.descending, "limit": args.limit, "offset": args.offset}
+
+
+def run_query(client: "Client", args: argparse.Namespace, timer: PhaseTimer) -> None:
+    if args.output == "table":
+        # Records keep the common path free of pandas and pyarrow imports, and each chunk is
+        # printed as it is fetched, so memory stays flat however many groups there are.
+        chunks = client.iter_detection_stats(**query_kwargs(args), **paging_kwargs(args), result_format="records")
+        logging.info("Query executed successfully. Showing results:")
+        # Fetching happens while printing, so "output" includes it.
+        with timer.phase("output"):
+            emit_chunks(iter_table(client.result_columns, chunks), args.output_file)
+        return
+
+    reader = client.query_detection_stats(**query_kwargs(args), **paging_kwargs(args), result_format="reader")
+    # The reader is consumed while writing, so "output" includes fetching the result.
+    with timer.phase("output"):
+        rows = emit_stream(reader, args.output, args.output_file)
+    logging.info(f"Query executed successfully. Wrote {rows} row(s) as {args.output}.")
+
+
+def run_grouped(client: "Client", args: argparse.Namespace, timer: PhaseTimer) -> None:
+    grouping = {"group_by": args.group_by, "subtotals": args.subtotals}
+    if args.output == "table":
+        records = client.query_grouped_stats(**grouping, **query_kwargs(args), result_format="records")
+        with timer.phase("output"):
+            emit_text(format_table(client.grouped_result_columns(**grouping), records), args.output_file)
+        logging.info(f"Grouped query executed successfully. Showed {len(records)} row(s).")
+        return
+
+    reader = client.query_grouped_stats(**grouping, **query_kwargs(args), result_format="reader")
+    # The reader is consumed while writing, so "output" includes fetching the result.
+    with timer.phase("output"):
+        rows = emit_stream(reader, args.output, args.output_file)
+    logging.info(f"Grouped query executed successfully. Wrote {rows} row(s) as {args.output}.")
+
+
+def add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", choices=OUTPUT_FORMATS, default="table", help="Output format (default: table)")
+    parser.add_argument("--output-file", type=str, default=None, help="Write results to this file instead of stdout")
+    parser.add_argument("--profile", action="store_true", help="Print phase timings and DuckDB's EXPLAIN ANALYZE profile as JSON to stderr")
     parser.add_argument("-v", "--verbose", action="store_const", dest="loglevel", const=logging.INFO, default=logging.WARNING, help="Enable INFO level logging")
 
+
+def check_output_arguments(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    if args.output in BINARY_FORMATS and args.output_file is None and sys.stdout.isatty():
+        parser.error(f"--output {args.output} is binary; use --output-file or redirect stdout.")
+
+
+def compare(argv: list) -> None:
+    """`main.py compare`: detection stats of two datasets side by side, with deltas, in one query."""
+    parser = argparse.ArgumentParser(prog="main.py compare", description="Compare the detection stats of a candidate dataset with a baseline")
+    parser.add_argument("--baseline", type=str, required=True, help="Baseline dataset: a database from setup_db.py, a parquet index (.json) or a directory of parquet files")
+    parser.add_argument("--candidate", type=str, required=True, help="Candidate dataset, in any of the --baseline forms")
+    add_query_arguments(parser)
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the 'significant' flag (default: 0.95)")
+    add_output_arguments(parser)
+
+    args = parser.parse_args(argv)
+    validate_args(args, parser)
+    check_output_arguments(args, parser)
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1.")
+
+    configure_logging(args.loglevel)
+
+    timer = PhaseTimer()
+    events: list = []
+    if args.profile:
+        subscribe(events.append)
+
+    with timer.phase("connect"):
+        import duckdb
+        from client import Client
+
+        # A scratch connection that attaches or scans both datasets.
+        conn = duckdb.connect(database=":memory:")
+        client = Client(conn, profile=args.profile)
+
+    result_format = "records" if args.output == "table" else "reader"
+    with conn:
+        try:
+            result = client.compare_detection_stats(
+                args.baseline, args.candidate, **query_kwargs(args), confidence=args.confidence, result_format=result_format
+            )
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+
+        with timer.phase("output"):
+            if args.output == "table":
+                emit_text(format_table(Client.COMPARE_RESULT_COLUMNS, result), args.output_file)
+            else:
+                # The reader is consumed while writing, so "output" includes fetching the result.
+                rows = emit_stream(result, args.output, args.output_file)
+                logging.info(f"Comparison executed successfully. Wrote {rows} row(s) as {args.output}.")
+
+    if args.profile:
+        print(json.dumps({"phases_ms": timer.phases_ms, "events": events}, indent=2), file=sys.stderr)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from server import main as serve
+
+        return serve(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        return compare(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(
+        description="Detection Success Analyzer",
+        epilog="Run 'main.py serve --help' for the query server and 'main.py compare --help' to compare two datasets.",
+    )
+
+    add_query_arguments(parser)
+    parser.add_argument("--specs", type=str, default=None, help="JSON or YAML file with a list of filter sets to answer in one query (overrides the filter options)")
+    parser.add_argument("--parquet-index", type=str, default=None, help="Query parquet files in place using this sidecar index (see setup_db.py --index-only) instead of the DuckDB database")
+    parser.add_argument("--engine", choices=["duckdb", "process"], default=os.environ.get("ENGINE", "duckdb"), help="With --parquet-index, 'process' aggregates each file in a pool of worker processes with bounded memory and merges the partial results (default: duckdb, or $ENGINE)")
+    parser.add_argument("--workers", type=int, default=_env_int("ENGINE_WORKERS"), help="Worker processes for --engine process (default: CPU count, or $ENGINE_WORKERS)")
+    parser.add_argument("--worker-threads", type=int, default=_env_int("ENGINE_WORKER_THREADS") or 1, help="DuckDB threads per worker (default: 1, or $ENGINE_WORKER_THREADS)")
+    parser.add_argument("--worker-memory-limit", type=str, default=os.environ.get("ENGINE_WORKER_MEMORY_LIMIT"), help="DuckDB memory_limit per worker, e.g. 2GB (default: DuckDB's, or $ENGINE_WORKER_MEMORY_LIMIT)")
+    parser.add_argument("--worker-temp-dir", type=str, default=os.environ.get("ENGINE_WORKER_TEMP_DIR"), help="Directory workers spill to beyond their memory limit (default: DuckDB's, or $ENGINE_WORKER_TEMP_DIR)")
+    parser.add_argument("--order-by", choices=ORDER_COLUMNS, default=None, help="Order rows by this result column, then by the group columns (default: group columns)")
+    parser.add_argument("--descending", action="store_true", help="With --order-by, sort that column in descending order")
+    parser.add_argument("--limit", type=int, default=None, help="Return at most this many rows, e.g. --order-by success_rate --limit 20 for the 20 worst bins")
+    parser.add_argument("--offset", type=int, default=0, help="Skip this many rows first, to page through results with --limit (default: 0)")
+    parser.add_argument("--approx", action="store_true", help="Estimate the stats from the sample built by setup_db.py --sample-rate, with confidence intervals on success_rate")
+    parser.add_argument("--group-by", choices=GROUP_DIMENSIONS, nargs="+", default=None, metavar="DIMENSION", help=f"Group by these dimensions instead of vehicle type, clip and distance bin; choose from {', '.join(GROUP_DIMENSIONS)}")
+    parser.add_argument("--subtotals", choices=SUBTOTALS, default=None, help="With --group-by, add subtotal rows in the same query: 'rollup' for each leading prefix of the dimensions and a grand total, 'cube' for every combination")
+    add_output_arguments(parser)
+
     args = parser.parse_args()
     validate_args(args, parser)
+    check_output_arguments(args, parser)
+    if args.approx and (args.specs or args.parquet_index):
+        parser.error("--approx cannot be combined with --specs or --parquet-index.")
+    if args.order_by in APPROX_ORDER_COLUMNS and not args.approx:
+        parser.error(f"--order-by {args.order_by} needs --approx.")
+    if (args.limit is not None and args.limit < 0) or args.offset < 0:
+        parser.error("--limit and --offset must not be negative.")
+    if args.specs and (args.order_by or args.limit is not None or args.offset):
+        parser.error("--order-by, --limit and --offset cannot be combined with --specs.")
+    if args.subtotals and not args.group_by:
+        parser.error("--subtotals needs --group-by.")
+    if args.group_by and (args.specs or args.approx or args.order_by or args.limit is not None or args.offset):
+        parser.error("--group-by cannot be combined with --specs, --approx, --order-by, --limit or --offset.")
+    if args.group_by and args.engine == "process":
+        parser.error("--group-by cannot be combined with --engine process.")
+    if args.engine == "process" and not args.parquet_index:
+        parser.error("--engine process needs --parquet-index.")
+    if (args.workers is not None and args.workers < 1) or args.worker_threads < 1:
+        parser.error("--workers and --worker-threads must be at least 1.")
+    if args.specs:
+        try:
+            specs = [query_kwargs(spec) for spec in load_specs(args.specs)]
+        except (OSError, ValueError) as e:
+            parser.error(f"--specs: {e}")
 
     configure_logging(args.loglevel)
-        
-    with duckdb.connect(database=DB_PATH) as conn:
+
+    timer = PhaseTimer()
+    events: list = []
+    if args.profile:
+        subscribe(events.append)
+
+    with timer.phase("connect"):
+        # Deferred so --help and argument errors don't pay for loading DuckDB.
+        import duckdb
+        from client import Client
+
+        if args.parquet_index:
+            engine = None
+            if args.engine == "process":
+                from engine import ProcessEngine
+
+                engine = ProcessEngine(args.workers, args.worker_threads, args.worker_memory_limit, args.worker_temp_dir)
+            conn = duckdb.connect(database=":memory:")
+            client = Client.from_parquet_index(args.parquet_index, conn, engine, profile=args.profile)
+        else:
+            try:
+                client = Client.open(DB_PATH, profile=args.profile, approximate=args.approx)
+            except ValueError as e:
+                parser.error(str(e))
+            conn = client.conn
+
+    with conn:
         logging.info("DuckDB connection established.")
 
-        client = Client(conn)
-        result = client.query_detection_stats(
-            vehicle_types=args.vehicles,
-            clip_names=args.clip_names,
-            min_frame_id=args.min_frame_id,
-            max_frame_id=args.max_frame_id,
-            min_distance=args.min_distance,
-            max_distance=args.max_distance,
-            distance_bin_size=args.distance_bin_size,
-            min_frames=args.min_frames,
-        )
+        if args.specs:
+            run_batch(client, specs, args, timer)
+        elif args.group_by:
+            run_grouped(client, args, timer)
+        else:
+            run_query(client, args, timer)
+    if client.engine is not None:
+        client.engine.close()
 
-        logging.info("Query executed successfully. Showing results:")
-        print(result.to_string())
+    if args.profile:
+        print(json.dumps({"phases_ms": timer.phases_ms, "events": events}, indent=2), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+import json
+import sys
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+OUTPUT_FORMATS = ("table", "csv", "json", "parquet", "arrow")
+
+BINARY_FORMATS = ("parquet", "arrow")
+
+
+def _format_column(values: List[Any]) -> List[str]:
+    if values and all(isinstance(v, float) for v in values):
+        # Six decimals, trimming the trailing zeros all values share but keeping one decimal.
+        texts = [f"{v:.6f}" for v in values]
+        trim = min(min(len(t) - len(t.rstrip("0")) for t in texts), 5)
+        return [" " + t[: len(t) - trim] for t in texts]
+    return [" " + str(v) for v in values]
+
+
+def _table_lines(
+    columns: Sequence[str], rows: List[Dict[str, Any]], start: int = 0, min_widths: Optional[List[int]] = None
+) -> Tuple[List[str], List[int]]:
+    """Header and row lines for `rows` numbered from `start`, and the width of each column."""
+    min_widths = min_widths or [0] * (len(columns) + 1)
+    index = [str(i) for i in range(start, start + len(rows))]
+    index_width = max(min_widths[0], *(len(i) for i in index))
+    strcols = [[" " * index_width] + [i.ljust(index_width) for i in index]]
+    widths = [index_width]
+    for column, min_width in zip(columns, min_widths[1:]):
+        values = [row[column] for row in rows]
+        texts = _format_column(values)
+        # Numeric column headers get the same leading space as their values.
+        header = " " + column if all(isinstance(v, (int, float)) for v in values) else column
+        width = max(min_width, len(header), *(len(t) for t in texts))
+        strcols.append([header.rjust(width)] + [t.rjust(width) for t in texts])
+        widths.append(width)
+    return [" ".join(line) for line in zip(*strcols)], widths
+
+
+def format_table(columns: Sequence[str], rows: List[Dict[str, Any]]) -> str:
+    """
+    Render records as the same plain-text table pandas' DataFrame.to_string() prints, without
+    importing pandas.
+    """
+    if not rows:
+        return f"Empty DataFrame\nColumns: [{', '.join(columns)}]\nIndex: []"
+    return "\n".join(_table_lines(columns, rows)[0])
+
+
+def iter_table(columns: Sequence[str], chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    """
+    Render chunks of records like format_table, yielding each chunk's text as soon as it is
+    formatted so a large result prints progressively without being held in memory.
+
+    The header and column widths come from the first chunk; a later chunk with wider values
+    widens the columns from there on. A result in one chunk renders exactly like format_table.
+    """
+    widths: Optional[List[int]] = None
+    start = 0
+    for rows in chunks:
+        if not rows:
+            continue
+        lines, widths = _table_lines(columns, rows, start, widths)
+        yield "\n".join(lines if start == 0 else lines[1:])
+        start += len(rows)
+    if widths is None:
+        yield format_table(columns, [])
+
+
+def write_result(reader: "pa.RecordBatchReader", output_format: str, sink: BinaryIO) -> int:
+    """
+    Stream record batches from `reader` to `sink` without materializing a DataFrame.
+
+    Supports "csv", "json" (one JSON object per line), "parquet" and "arrow" (Arrow IPC stream).
+    Returns the number of rows written.
+
+    Raises:
+        ValueError: If the output format is not supported.
+    """
+    # Imported here so plain-table output never loads pyarrow.
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    rows = 0
+
+    if output_format == "csv":
+        with pa_csv.CSVWriter(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+
+    elif output_format == "json":
+        for batch in reader:
+            sink.write("".join(json.dumps(row) + "\n" for row in batch.to_pylist()).encode())
+            rows += batch.num_rows
+
+    elif output_format == "parquet":
+        with pq.ParquetWriter(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+
+    elif output_format == "arrow":
+        with pa.ipc.new_stream(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+
+    else:
+        raise ValueError(f"Unsupported streaming output format '{output_format}'")
+
+    sink.flush()
+    return rows
+
+
+def emit_text(text: str, output_file: Optional[str] = None) -> None:
+    """Print `text`, or write it to `output_file` if given."""
+    if output_file:
+        with open(output_file, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def emit_chunks(texts: Iterable[str], output_file: Optional[str] = None) -> None:
+    """Print each of `texts` as it arrives, or write them to `output_file` if given."""
+    if output_file:
+        with open(output_file, "w") as f:
+            for text in texts:
+                f.write(text + "\n")
+    else:
+        for text in texts:
+            print(text, flush=True)
+
+
+def emit_stream(reader: "pa.RecordBatchReader", output_format: str, output_file: Optional[str] = None) -> int:
+    """Stream `reader` in `output_format` to `output_file`, or to stdout if not given."""
+    if output_file:
+        with open(output_file, "wb") as sink:
+            return write_result(reader, output_format, sink)
+    return write_result(reader, output_format, sys.stdout.buffer)
@@ -0,0 +1,108 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import duckdb
+
+Listener = Callable[[Dict[str, Any]], None]
+
+_listeners: List[Listener] = []
+
+
+def subscribe(listener: Listener) -> Callable[[], None]:
+    """
+    Call `listener` with every profile event the Client and DataLoader publish, and return a
+    function that unsubscribes it.
+
+    Events are dicts with an "event" key ("query", "batch_query", "compare" or "load"),
+    "phases_ms" timings and event-specific fields; see Client.query_detection_stats and
+    DataLoader.load_data.
+    """
+    _listeners.append(listener)
+    return lambda: unsubscribe(listener)
+
+
+def unsubscribe(listener: Listener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def has_listeners() -> bool:
+    return bool(_listeners)
+
+
+def publish(event: Dict[str, Any]) -> None:
+    """Deliver `event` to every listener; a failing listener is logged, not raised."""
+    for listener in list(_listeners):
+        try:
+            listener(event)
+        except Exception:
+            logging.exception("Profile listener failed")
+
+
+class PhaseTimer:
+    """Accumulates wall-clock milliseconds per named phase, in the order phases first ran."""
+
+    def __init__(self):
+        self.phases_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self.phases_ms[name] = self.phases_ms.get(name, 0.0) + elapsed_ms
+
+
+def _operators(node: Dict[str, Any], depth: int, out: List[Dict[str, Any]]) -> None:
+    if node.get("operator_type"):
+        out.append({
+            "depth": depth,
+            "operator": node["operator_type"],
+            "name": node.get("operator_name", "").strip(),
+            "timing_ms": node.get("operator_timing", 0.0) * 1000,
+            "rows": node.get("operator_cardinality", 0),
+            "rows_scanned": node.get("operator_rows_scanned", 0),
+            "extra_info": node.get("extra_info") or {},
+        })
+        depth += 1
+    for child in node.get("children", []):
+        _operators(child, depth, out)
+
+
+def explain_analyze(conn: "duckdb.DuckDBPyConnection", query: str, params: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Run `query` under DuckDB's EXPLAIN ANALYZE and summarize its JSON profile: total latency,
+    the part of it spent binding, optimizing and planning, rows scanned and returned, and
+    per-operator timings and cardinalities in plan order.
+    """
+    conn.execute("PRAGMA enable_profiling = 'json'")
+    # The detailed mode adds the planner and optimizer timings.
+    conn.execute("SET profiling_mode = 'detailed'")
+    try:
+        plan = conn.execute(f"EXPLAIN ANALYZE {query}", params or []).fetchall()[0][1]
+    finally:
+        conn.execute("PRAGMA disable_profiling")
+        conn.execute("RESET profiling_mode")
+
+    profile = json.loads(plan)
+    operators: List[Dict[str, Any]] = []
+    _operators(profile, 0, operators)
+    # The root operator is EXPLAIN_ANALYZE itself.
+    operators = [dict(op, depth=op["depth"] - 1) for op in operators if op["operator"] != "EXPLAIN_ANALYZE"]
+    return {
+        "latency_ms": profile.get("latency", 0.0) * 1000,
+        "planning_ms": sum(profile.get(key, 0.0) for key in ("planner", "all_optimizers", "physical_planner")) * 1000,
+        "cpu_time_ms": profile.get("cpu_time", 0.0) * 1000,
+        "rows_scanned": profile.get("cumulative_rows_scanned"),
+        "rows_returned": operators[0]["rows"] if operators else 0,
+        "bytes_read": profile.get("total_bytes_read"),
+        "operators": operators,
+    }
@@ -0,0 +1,280 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import duckdb
+from client import Client
+from data_loader import DataLoader
+from snapshots import SnapshotStore, resolve
+from utils import LIST_FILTERS, configure_logging, parse_filters, query_kwargs
+
+DB_PATH = os.environ.get("DB_PATH", "duckdb/interview_table.duckdb")
+
+
+class ClientPool:
+    """
+    A fixed pool of Clients, each on its own cursor of one read-only DuckDB connection,
+    so concurrent requests share the database's buffer cache without serializing.
+
+    When `db_path` is a snapshot pointer (see SnapshotStore), each request checks where it
+    points, and after a load publishes a new snapshot the pool opens that one and moves new
+    requests to it. Clients of the old snapshot finish their queries and are closed on return,
+    and the old connection once all of them are.
+
+    Given `conn`, the cursors are taken from it instead (the pool does not close it); this
+    is how a server that ingests into its own database shares it with its readers.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, conn: Optional[duckdb.DuckDBPyConnection] = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.size = size
+        self._owns_conn = conn is None
+        self._store = SnapshotStore(db_path) if conn is None else None
+        self._snapshot = self._store.current() if self._store is not None else None
+        self._lock = threading.Lock()
+        # Connections of replaced snapshots, with their Clients not yet returned.
+        self._retired: List[Tuple[duckdb.DuckDBPyConnection, Set[Client]]] = []
+        self.conn = duckdb.connect(database=resolve(db_path), read_only=True) if conn is None else conn
+        self._clients = {Client(self.conn.cursor()) for _ in range(size)}
+        self._idle: "queue.Queue[Client]" = queue.Queue()
+        for client in self._clients:
+            self._idle.put(client)
+        logging.info(f"Opened '{db_path}' {'read-only ' if self._owns_conn else ''}with {size} cursor(s).")
+
+    def _follow_snapshot(self) -> None:
+        if self._store is None:
+            return
+        current = self._store.current()
+        if current is None or current == self._snapshot:
+            return
+        with self._lock:
+            if current == self._snapshot:
+                return
+            retired = (self.conn, set(self._clients))
+            self.conn = duckdb.connect(database=str(current), read_only=True)
+            self._clients = {Client(self.conn.cursor()) for _ in range(self.size)}
+            while True:
+                try:
+                    idle = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                self._retire(idle, retired)
+            self._retired.append(retired)
+            for client in self._clients:
+                self._idle.put(client)
+            self._close_retired()
+            self._snapshot = current
+            logging.info(f"Switched to snapshot '{current.name}'.")
+
+    def _retire(self, client: Client, retired: Tuple[duckdb.DuckDBPyConnection, Set[Client]]) -> None:
+        client.conn.close()
+        retired[1].discard(client)
+
+    def _close_retired(self) -> None:
+        for conn, busy in self._retired:
+            if not busy:
+                conn.close()
+        self._retired = [entry for entry in self._retired if entry[1]]
+
+    @contextmanager
+    def client(self) -> Iterator[Client]:
+        self._follow_snapshot()
+        client = self._idle.get()
+        try:
+            yield client
+        finally:
+            with self._lock:
+                retired = next((entry for entry in self._retired if client in entry[1]), None)
+                if retired is None:
+                    self._idle.put(client)
+                else:
+                    self._retire(client, retired)
+                    self._close_retired()
+
+    def close(self) -> None:
+        while not self._idle.empty():
+            self._idle.get_nowait().conn.close()
+        for conn, _busy in self._retired:
+            conn.close()
+        if self._owns_conn:
+            self.conn.close()
+
+
+class IngestThread(threading.Thread):
+    """
+    Runs DataLoader.watch in the background. Each poll commits in one transaction, and each
+    query runs on its own cursor, so the server's readers always see a consistent snapshot.
+    """
+
+    def __init__(self, loader: DataLoader, interval: float, min_file_age: float):
+        super().__init__(name="ingest", daemon=True)
+        self.loader = loader
+        self.interval = interval
+        self.min_file_age = min_file_age
+        self.stop_event = threading.Event()
+
+    def run(self) -> None:
+        self.loader.watch(interval=self.interval, min_file_age=self.min_file_age, stop=self.stop_event)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.join()
+        self.loader.close()
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over a ClientPool.
+
+    GET  /health               -> {"status": "ok"}
+    GET  /query?vehicles=car   -> {"columns": [...], "rows": [{...}, ...]}
+    POST /query  {"vehicles": ["car"], "min_distance": 5}
+    """
+
+    server: "QueryServer"
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _run_query(self, raw: Dict[str, Any]) -> None:
+        try:
+            args = parse_filters(raw)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            with self.server.pool.client() as client:
+                rows = client.query_detection_stats(**query_kwargs(args), result_format="records")
+        except duckdb.Error as e:
+            logging.exception("Query failed")
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, {"columns": Client.RESULT_COLUMNS, "rows": rows})
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif url.path == "/query":
+            raw: Dict[str, Any] = {
+                key: values if key.replace("-", "_") in LIST_FILTERS else values[-1]
+                for key, values in parse_qs(url.query).items()
+            }
+            self._run_query(raw)
+        else:
+            self._send_json(404, {"error": f"Unknown path '{url.path}'"})
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/query":
+            self._send_json(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            raw = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(raw, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        self._run_query(raw)
+
+    def log_message(self, format: str, *args) -> None:
+        logging.info("%s - %s", self.address_string(), format % args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Threaded HTTP server that answers detection-stats queries from a warm ClientPool."""
+
+    daemon_threads = True
+
+    def __init__(self, address, pool: ClientPool, ingest: Optional[IngestThread] = None):
+        self.pool = pool
+        self.ingest = ingest
+        super().__init__(address, QueryHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.close()
+        if self.ingest is not None:
+            self.ingest.stop()
+
+
+def create_server(
+    db_path: str,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    pool_size: int = 4,
+    watch_path: Optional[str] = None,
+    poll_interval: float = 2.0,
+    min_file_age: float = 1.0,
+) -> QueryServer:
+    """
+    Open the database and bind the server; call serve_forever() on the result to run it.
+
+    With `watch_path` the server also ingests parquet files from that directory into the
+    database it serves, polling every `poll_interval` seconds (see DataLoader.watch).
+
+    Raises:
+        ValueError: If `watch_path` is given and `db_path` is a snapshot pointer, as
+            published snapshots must never be written.
+    """
+    if watch_path is None:
+        return QueryServer((host, port), ClientPool(db_path, pool_size))
+
+    if SnapshotStore(db_path).current() is not None:
+        raise ValueError(f"--watch writes the database directly, but '{db_path}' is a snapshot pointer; serve a plain database file.")
+    loader = DataLoader(watch_path, db_path)
+    loader.watch(min_file_age=min_file_age, max_polls=1)
+    ingest = IngestThread(loader, poll_interval, min_file_age)
+    server = QueryServer((host, port), ClientPool(db_path, pool_size, conn=loader.conn), ingest)
+    ingest.start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Detection Success Analyzer query server")
+
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--pool-size", type=int, default=4, help="Number of read-only cursors serving requests (default: 4)")
+    parser.add_argument("--watch", type=str, default=None, metavar="DATA_PATH", help="Also ingest new parquet files from this directory into the served database")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between --watch polls (default: 2)")
+    parser.add_argument("--min-file-age", type=float, default=1.0, help="With --watch, only load files unmodified for this many seconds (default: 1)")
+    parser.add_argument("-v", "--verbose", action="store_const", dest="loglevel", const=logging.INFO, default=logging.WARNING, help="Enable INFO level logging")
+
+    args = parser.parse_args(argv)
+    if args.pool_size < 1:
+        parser.error("--pool-size must be at least 1.")
+
+    configure_logging(args.loglevel)
+
+    try:
+        server = create_server(DB_PATH, args.host, args.port, args.pool_size, args.watch, args.poll_interval, args.min_file_age)
+    except ValueError as e:
+        parser.error(str(e))
+    logging.warning(f"Serving detection stats on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
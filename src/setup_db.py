@@ -1,19 +1,133 @@
 import argparse
+import json
 import os
+import sys
+from datetime import datetime
 from data_loader import DataLoader
+from profiling import subscribe
+from snapshots import SnapshotStore
 
 DB_PATH = os.environ.get("DB_PATH", "duckdb/interview_table.duckdb")
 
 
+def report_ingest(event: dict, profile: bool) -> None:
+    """Print one line per load that changed the table, with its throughput and lag."""
+    if event["event"] != "load" or not (event["loaded_files"] or event["dropped_files"]):
+        return
+    line = f"{datetime.now():%Y-%m-%d %H:%M:%S} loaded {event['loaded_files']} file(s)"
+    if event["loaded_files"]:
+        line += f", {event['loaded_rows']} rows at {event['rows_per_sec']:,.0f} rows/s, max lag {event['max_lag_s']:.1f}s"
+        if event["quarantined_rows"]:
+            line += f", {event['quarantined_rows']} row(s) quarantined"
+    if event["dropped_files"]:
+        line += f"; dropped {event['dropped_files']} file(s)"
+    print(line, flush=True)
+    if profile:
+        print(json.dumps(event, indent=2), file=sys.stderr)
+
+
+def watch(loader: DataLoader, args: argparse.Namespace) -> None:
+    if args.full_rebuild:
+        loader.load_data(full_rebuild=True)
+    subscribe(lambda event: report_ingest(event, args.profile))
+    print(f"Watching '{args.data_path}' every {args.poll_interval:g}s; press Ctrl+C to stop.", flush=True)
+    try:
+        # Release the database between polls so main.py can open it read-only.
+        loader.watch(interval=args.poll_interval, min_file_age=args.min_file_age, hold_connection=False)
+    except KeyboardInterrupt:
+        pass
+
+
+def load_snapshot(args: argparse.Namespace, loader_kwargs: dict) -> None:
+    """
+    Load into a new snapshot of DB_PATH, check its row counts, and publish it atomically,
+    so readers of the current snapshot are never blocked or shown a partial load.
+    """
+    store = SnapshotStore(DB_PATH, keep=args.keep_snapshots)
+    path = store.prepare()
+    try:
+        with DataLoader(db_path=str(path), **loader_kwargs) as loader:
+            version = loader.data_version()
+            loader.load_data(full_rebuild=args.full_rebuild)
+            rows = loader.verify()
+            # Every change to the data, sample or layout bumps the version, not only loaded files.
+            changed = loader.data_version() != version
+            loader.conn.execute("CHECKPOINT")
+            if args.profile:
+                print(json.dumps(loader.last_profile, indent=2), file=sys.stderr)
+    except BaseException:
+        store.discard(path)
+        raise
+
+    if not changed and store.current() is not None:
+        store.discard(path)
+        print(f"No changes; '{DB_PATH}' still points at '{store.current().name}'.")
+        return
+    store.publish(path)
+    print(f"Published '{path.name}' ({rows} rows) as '{DB_PATH}'.")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Detection Success Analyzer DB setup")
 
-    parser.add_argument("--data-path", type=str, required=True, help="Path to directory containing parquet files.")
+    parser.add_argument("--data-path", type=str, default=None, help="Path to directory containing parquet files (required unless --rollback).")
+    parser.add_argument("--validation-workers", type=int, default=None, help="Number of parallel validation workers (default: CPU count).")
+    parser.add_argument("--validation-executor", choices=DataLoader.VALIDATION_EXECUTORS, default="thread", help="Run validation in a thread or process pool (default: thread).")
+    parser.add_argument("--full-rebuild", action="store_true", help="Replace the loaded table and manifest by reloading every file; kept if none is valid.")
+    parser.add_argument("--cluster", action="store_true", help="Keep the loaded rows sorted by clip, vehicle and frame with compact ENUM columns, re-clustering after each load that changes data (not with --watch).")
+    parser.add_argument("--sample-rate", type=float, default=None, help="Keep a stratified sample of this fraction of the rows for approximate queries (main.py --approx); changing it resamples.")
+    parser.add_argument("--profile", action="store_true", help="Print load phase timings and per-file hash and validation timings as JSON to stderr.")
+    parser.add_argument("--watch", action="store_true", help="Keep running and load new, changed and deleted files as they appear in --data-path.")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between --watch polls (default: 2).")
+    parser.add_argument("--min-file-age", type=float, default=1.0, help="With --watch, only load files unmodified for this many seconds, so partly written files are skipped (default: 1).")
+    parser.add_argument("--keep-snapshots", type=int, default=3, help="Loads write a new database snapshot and swap it in atomically; keep this many for --rollback (default: 3).")
+    parser.add_argument("--rollback", type=int, nargs="?", const=1, default=None, metavar="STEPS", help="Point the database back STEPS snapshots (default: 1) and exit.")
+    parser.add_argument("--in-place", action="store_true", help="Load directly into the current database instead of a new snapshot; readers are locked out while it runs.")
+    parser.add_argument("--index-only", action="store_true", help="Skip loading; validate the files and write a sidecar index for querying them in place (main.py --parquet-index).")
+    parser.add_argument("--index-path", type=str, default=None, help="Where to write the sidecar index (default: <data-path>/_detection_index.json).")
 
     args = parser.parse_args()
+    if args.watch and args.index_only:
+        parser.error("--watch cannot be combined with --index-only.")
+    if args.watch and args.cluster:
+        parser.error("--watch cannot be combined with --cluster, which rewrites the whole table; cluster with a separate load.")
+    if args.keep_snapshots < 1:
+        parser.error("--keep-snapshots must be at least 1.")
+    if args.rollback is not None:
+        try:
+            print(f"'{DB_PATH}' now points at '{SnapshotStore(DB_PATH).rollback(args.rollback).name}'.")
+        except ValueError as e:
+            parser.error(str(e))
+        return
+    if args.data_path is None:
+        parser.error("the following arguments are required: --data-path")
+    if (args.watch or args.in_place) and SnapshotStore(DB_PATH).current() is not None:
+        # Writing the published snapshot would break readers and loads that copy it.
+        parser.error(f"--watch and --in-place write the database directly, but '{DB_PATH}' is a snapshot pointer; point DB_PATH at a plain database file.")
+    if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+        parser.error("--sample-rate must be greater than 0 and at most 1.")
+
+    loader_kwargs = dict(
+        data_path=args.data_path,
+        validation_workers=args.validation_workers,
+        validation_executor=args.validation_executor,
+        clustered=args.cluster,
+        sample_rate=args.sample_rate,
+    )
+    if not (args.index_only or args.watch or args.in_place):
+        load_snapshot(args, loader_kwargs)
+        return
 
-    loader = DataLoader(data_path=args.data_path, db_path=DB_PATH)
-    loader.load_data()
+    # --watch commits small batches often, so it writes in place rather than copying snapshots.
+    loader = DataLoader(db_path=":memory:" if args.index_only else DB_PATH, **loader_kwargs)
+    if args.index_only:
+        print(loader.build_parquet_index(args.index_path))
+    elif args.watch:
+        watch(loader, args)
+    else:
+        loader.load_data(full_rebuild=args.full_rebuild)
+        if args.profile:
+            print(json.dumps(loader.last_profile, indent=2), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+
+class SnapshotStore:
+    """
+    Versioned database files published through an atomically swapped pointer.
+
+    Snapshots live in `<db_path>.snapshots/` as `<version>.duckdb`, and `db_path` is a
+    symlink to the current one. A load writes a new snapshot that no reader has open, and
+    publishing it replaces the symlink with a rename, which is atomic: readers opening
+    `db_path` get either the old or the new snapshot, and readers that already have the
+    old one open keep reading it undisturbed. The newest `keep` snapshots are kept so the
+    pointer can be rolled back.
+    """
+
+    NAME_PATTERN = re.compile(r"^(\d+)\.duckdb$")
+
+    def __init__(self, db_path: str, keep: int = 3):
+        if keep < 1:
+            raise ValueError("keep must be at least 1.")
+        self.db_path = Path(db_path)
+        self.directory = Path(f"{db_path}.snapshots").resolve()
+        self.keep = keep
+
+    def snapshots(self) -> List[Path]:
+        """Snapshot files, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        found = [p for p in self.directory.iterdir() if self.NAME_PATTERN.match(p.name)]
+        return sorted(found, key=self.version)
+
+    def version(self, path: Path) -> int:
+        return int(self.NAME_PATTERN.match(path.name).group(1))
+
+    def current(self) -> Optional[Path]:
+        """The snapshot `db_path` points at, or None if it is a plain database file or missing."""
+        if not self.db_path.is_symlink():
+            return None
+        return (self.db_path.parent / os.readlink(self.db_path)).resolve()
+
+    def prepare(self) -> Path:
+        """
+        Path for the next snapshot, seeded with a copy of the current database (if any) so
+        the loader only has to apply what changed.
+
+        Published snapshots are never written again, so copying one while readers have it
+        open is safe. A plain database file at `db_path` (from before snapshots) is copied
+        the same way; it must not be open for writing.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        versions = [self.version(p) for p in self.snapshots()]
+        path = self.directory / f"{max(versions, default=0) + 1:06d}.duckdb"
+        source = self.current() or (self.db_path if self.db_path.is_file() else None)
+        if source is not None:
+            shutil.copyfile(source, path)
+            if Path(f"{source}.wal").exists():
+                shutil.copyfile(f"{source}.wal", f"{path}.wal")
+        return path
+
+    def _point_to(self, path: Path) -> None:
+        # Build the new symlink beside db_path, then rename it over db_path in one step.
+        link = self.db_path.with_name(f".{self.db_path.name}.tmp")
+        if link.is_symlink() or link.exists():
+            link.unlink()
+        link.symlink_to(os.path.relpath(path, self.db_path.parent))
+        os.replace(link, self.db_path)
+
+    def publish(self, path: Path) -> None:
+        """Point `db_path` at snapshot `path` atomically and drop snapshots beyond `keep`."""
+        self._point_to(path)
+        logging.info(f"Published snapshot '{path.name}' as '{self.db_path}'.")
+        self.prune()
+
+    def discard(self, path: Path) -> None:
+        """Delete an unpublished snapshot, e.g. after a failed load."""
+        for leftover in (path, Path(f"{path}.wal")):
+            if leftover.exists():
+                leftover.unlink()
+
+    def prune(self) -> None:
+        # Readers still holding a removed file keep reading it until they close it.
+        current = self.current()
+        for path in self.snapshots()[:-self.keep]:
+            if path != current:
+                self.discard(path)
+                logging.debug(f"Removed old snapshot '{path.name}'.")
+
+    def rollback(self, steps: int = 1) -> Path:
+        """
+        Point `db_path` back `steps` snapshots before the current one and return it.
+
+        Raises:
+            ValueError: If fewer older snapshots are kept.
+        """
+        snapshots = self.snapshots()
+        current = self.current()
+        if current not in snapshots:
+            raise ValueError(f"'{self.db_path}' does not point at a snapshot in '{self.directory}'.")
+        index = snapshots.index(current) - steps
+        if steps < 1 or index < 0:
+            raise ValueError(f"Only {snapshots.index(current)} older snapshot(s) are kept.")
+        target = snapshots[index]
+        self._point_to(target)
+        logging.info(f"Rolled '{self.db_path}' back to snapshot '{target.name}'.")
+        return target
+
+
+def resolve(db_path: str) -> str:
+    """The file to open for `db_path`: its current snapshot if it is a snapshot pointer."""
+    current = SnapshotStore(db_path).current()
+    return str(current) if current is not None else db_path
@@ -1,27 +1,136 @@
 import argparse
+import json
 import logging
-from typing import Union
+from typing import Any, Dict, List, Optional, Union
 
 
-def validate_args(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+def add_query_arguments(parser: argparse.ArgumentParser) -> None:
     """
-    Validate CLI arguments after parsing.
+    Add the detection-stats filter arguments shared by the CLI and the query server.
+    """
+    parser.add_argument("--vehicles", type=str, nargs="*", default=None, help="Vehicle types to include, e.g. --vehicles car truck")
+    parser.add_argument("--clip-names", type=str, nargs="*", default=None, help="Clip names to filter, e.g. --clip-names clip1 clip2")
+    parser.add_argument("--min-frame-id", type=int, default=None, help="Minimum frame index to include")
+    parser.add_argument("--max-frame-id", type=int, default=None, help="Maximum frame index to include")
+    parser.add_argument("--min-distance", type=int, default=1, help="Minimum distance to consider (default: 1)")
+    parser.add_argument("--max-distance", type=int, default=100, help="Maximum distance to consider (default: 100)")
+    parser.add_argument("--distance-bin-size", type=int, default=10, help="Distance bin size (default: 10)")
+    parser.add_argument("--min-frames", type=int, default=1, help="Minimum number of frames per bin to consider.")
+
+
+LIST_FILTERS = {"vehicles", "clip_names"}
+
+
+def _filter_defaults() -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(add_help=False)
+    add_query_arguments(parser)
+    return vars(parser.parse_args([]))
+
+
+def parse_filters(raw: Dict[str, Any]) -> argparse.Namespace:
+    """
+    Build a filter namespace from a dict of parameters named like the CLI options
+    (`vehicles`, `clip_names`, `min_distance`, ...; dashes are accepted too).
 
     Raises:
-        SystemExit via parser.error if any validation fails.
+        ValueError: On unknown parameters, malformed values or invalid combinations.
+    """
+    args = _filter_defaults()
+    for key, value in raw.items():
+        name = key.replace("-", "_")
+        if name not in args:
+            raise ValueError(f"Unknown parameter '{key}'")
+        if name in LIST_FILTERS:
+            args[name] = [str(v) for v in (value if isinstance(value, list) else [value])]
+        elif value is not None:
+            if isinstance(value, list):
+                value = value[-1]
+            try:
+                args[name] = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Parameter '{key}' must be an integer, got {value!r}")
+
+    namespace = argparse.Namespace(**args)
+    error = find_arg_error(namespace)
+    if error is not None:
+        raise ValueError(error)
+    return namespace
+
+
+def load_specs(path: str) -> List[argparse.Namespace]:
+    """
+    Load a list of filter specs from a JSON or YAML (.yaml/.yml) file; see parse_filters
+    for the accepted keys.
+
+    Raises:
+        ValueError: If the file is not a list of objects or a spec is invalid.
+    """
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+
+            specs = yaml.safe_load(f)
+        else:
+            specs = json.load(f)
+
+    if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+        raise ValueError(f"Spec file '{path}' must contain a list of objects")
+
+    parsed = []
+    for i, spec in enumerate(specs):
+        try:
+            parsed.append(parse_filters(spec))
+        except ValueError as e:
+            raise ValueError(f"Spec {i} in '{path}': {e}")
+    return parsed
+
+
+def query_kwargs(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Map parsed filter arguments onto Client.query_detection_stats keyword arguments.
+    """
+    return {
+        "vehicle_types": args.vehicles,
+        "clip_names": args.clip_names,
+        "min_frame_id": args.min_frame_id,
+        "max_frame_id": args.max_frame_id,
+        "min_distance": args.min_distance,
+        "max_distance": args.max_distance,
+        "distance_bin_size": args.distance_bin_size,
+        "min_frames": args.min_frames,
+    }
+
+
+def find_arg_error(args: argparse.Namespace) -> Optional[str]:
+    """
+    Return a message describing the first invalid filter argument, or None if all are valid.
     """
     if args.max_distance < args.min_distance:
-        parser.error(f"--max-distance ({args.max_distance}) must be >= --min-distance ({args.min_distance})")
+        return f"--max-distance ({args.max_distance}) must be >= --min-distance ({args.min_distance})"
 
     if args.min_frame_id is not None and args.max_frame_id is not None:
         if args.max_frame_id < args.min_frame_id:
-            parser.error(f"--max-frame-id ({args.max_frame_id}) must be >= --min-frame-id ({args.min_frame_id})")
+            return f"--max-frame-id ({args.max_frame_id}) must be >= --min-frame-id ({args.min_frame_id})"
 
     if args.distance_bin_size <= 0:
-        parser.error("--distance-bin-size must be a positive integer.")
+        return "--distance-bin-size must be a positive integer."
 
     if args.min_frames < 1:
-        parser.error("--min-frames must be at least 1.")
+        return "--min-frames must be at least 1."
+
+    return None
+
+
+def validate_args(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """
+    Validate CLI arguments after parsing.
+
+    Raises:
+        SystemExit via parser.error if any validation fails.
+    """
+    error = find_arg_error(args)
+    if error is not None:
+        parser.error(error)
 
 
 def configure_logging(level: Union[int, str]) -> None:
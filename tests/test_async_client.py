@@ -0,0 +1,89 @@
+import asyncio
+
+import duckdb
+import pytest
+
+from src.async_client import AsyncClient
+from src.client import Client
+
+from tests.test_utils import duckdb_conn
+
+
+@pytest.fixture
+def endless_conn():
+    # A view over ten billion rows, so any query runs until it is interrupted.
+    conn = duckdb.connect(database=":memory:")
+    conn.execute(
+        """
+        CREATE VIEW interview_table AS
+        SELECT 'clip1' AS clip_name, x AS frame_id, 'car' AS vehicle_type,
+               x % 2 = 0 AS detection, (x % 100 + 1)::INTEGER AS distance
+        FROM range(10000000000) t(x)
+        """
+    )
+    yield conn
+    conn.close()
+
+
+def test_async_client_gather_matches_client(duckdb_conn):
+    specs = [
+        {"vehicle_types": ["car"]},
+        {"vehicle_types": ["truck"], "distance_bin_size": 25},
+        {"clip_names": ["clip2"], "min_frame_id": 2},
+        {"min_frames": 2},
+        {},
+    ]
+
+    async def fan_out():
+        async with AsyncClient(duckdb_conn, pool_size=2) as client:
+            return await asyncio.gather(*(client.query_detection_stats(**spec, result_format="records") for spec in specs))
+
+    expected = [Client(duckdb_conn).query_detection_stats(**spec, result_format="records") for spec in specs]
+    assert asyncio.run(fan_out()) == expected
+
+
+def test_async_client_batch_matches_client(duckdb_conn):
+    specs = [{"vehicle_types": ["car"]}, {"max_distance": 50}]
+
+    async def batch():
+        async with AsyncClient(duckdb_conn, pool_size=1) as client:
+            return await client.query_detection_stats_batch(specs, result_format="arrow", split=False)
+
+    assert asyncio.run(batch()).equals(Client(duckdb_conn).query_detection_stats_batch(specs, result_format="arrow", split=False))
+
+
+def test_async_client_timeout_interrupts_query(endless_conn):
+    async def run():
+        async with AsyncClient(endless_conn, pool_size=1) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.query_detection_stats(timeout=0.2)
+            # The cursor went back to the pool and still works.
+            assert client._idle.qsize() == 1
+            assert client.clients[0].conn.execute("SELECT 1").fetchone() == (1,)
+
+    asyncio.run(asyncio.wait_for(run(), timeout=30))
+
+
+def test_async_client_cancel_interrupts_query(endless_conn):
+    async def run():
+        async with AsyncClient(endless_conn, pool_size=2) as client:
+            task = asyncio.create_task(client.query_detection_stats())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert client._idle.qsize() == 2
+
+    asyncio.run(asyncio.wait_for(run(), timeout=30))
+
+
+def test_async_client_rejects_reader_and_bad_pool(duckdb_conn):
+    with pytest.raises(ValueError, match="pool_size"):
+        AsyncClient(duckdb_conn, pool_size=0)
+
+    async def reader():
+        async with AsyncClient(duckdb_conn) as client:
+            await client.query_detection_stats(result_format="reader")
+
+    with pytest.raises(ValueError, match="reader"):
+        asyncio.run(reader())
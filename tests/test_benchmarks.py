@@ -0,0 +1,33 @@
+import duckdb
+
+from benchmarks.bench_scaling import percentile
+from benchmarks.generate import generate
+from src.data_loader import DataLoader
+
+
+def test_generate_writes_loadable_files_with_requested_shape(tmp_path):
+    paths = generate(str(tmp_path), rows=10_000, files=3, clips=7, vehicle_types=12, detection_rate=0.5, chunk_rows=1_500)
+    assert len(paths) == 3
+
+    with DataLoader(str(tmp_path), db_path=":memory:") as loader:
+        loader.load_data("interview_table")
+        stats = loader.get_connection().execute(
+            """
+            SELECT COUNT(*), COUNT(DISTINCT clip_name), COUNT(DISTINCT vehicle_type),
+                   MIN(frame_id), MAX(frame_id), AVG(detection::INT)
+            FROM interview_table
+            """
+        ).fetchone()
+
+    assert stats[:5] == (10_000, 7, 12, 0, 539)
+    assert 0.45 < stats[5] < 0.55
+
+    again = generate(str(tmp_path / "again"), rows=10_000, files=3, clips=7, vehicle_types=12, detection_rate=0.5, chunk_rows=1_500)
+    assert duckdb.sql(f"SELECT * FROM '{paths[1]}' EXCEPT ALL SELECT * FROM '{again[1]}'").fetchall() == []
+
+
+def test_percentile_nearest_rank():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(samples, 50) == 3.0
+    assert percentile(samples, 95) == 5.0
+    assert percentile([7.0], 95) == 7.0
@@ -0,0 +1,45 @@
+import pytest
+
+from src.cache import QueryCache
+
+
+def test_cache_lru_eviction():
+    cache = QueryCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "hits": 3, "misses": 1, "evictions": 1, "expirations": 0, "invalidations": 0}
+
+
+def test_cache_ttl_expiration(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+
+    cache = QueryCache(max_size=4, ttl=10)
+    cache.put("a", 1)
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+
+
+def test_cache_invalidated_on_data_version_change():
+    cache = QueryCache()
+    cache.put("a", 1, data_version=1)
+    assert cache.get("a", data_version=1) == 1
+    assert cache.get("a", data_version=2) is None
+    assert cache.invalidations == 1
+    assert len(cache) == 0
+
+
+def test_cache_rejects_bad_config():
+    with pytest.raises(ValueError):
+        QueryCache(max_size=0)
+    with pytest.raises(ValueError):
+        QueryCache(ttl=0)
@@ -1,3 +1,7 @@
+import duckdb
+import pandas as pd
+import pytest
+
 from src.client import Client
 
 from tests.test_utils import duckdb_conn
@@ -30,6 +34,20 @@ def test_query_detection_stats_filters(duckdb_conn):
     assert all((df["clip_name"].isin(["clip1", "clip2", "clip3"])))
 
 
+def test_list_filters_keep_one_query_shape(duckdb_conn):
+    client = Client(duckdb_conn)
+    two, two_params = client._build_query(["car", "truck"], ["clip1", "clip2"], None, None, 1, 100, 10, 1)
+    three, three_params = client._build_query(["car", "truck"], ["clip1", "clip2", "clip3"], None, None, 1, 100, 10, 1)
+    assert two == three and len(two_params) == len(three_params)
+
+    df = client.query_detection_stats(clip_names=["clip1", "clip3", "missing"])
+    assert set(df["clip_name"]) == {"clip1", "clip3"}
+    pd.testing.assert_frame_equal(
+        client.query_detection_stats(vehicle_types=["car", "bus"]),
+        client.query_detection_stats(vehicle_types=["car"]),
+    )
+
+
 def test_query_detection_stats_distance_bin_and_min_frames(duckdb_conn):
     client = Client(duckdb_conn)
 
@@ -57,3 +75,423 @@ def test_query_detection_stats_no_data(duckdb_conn):
         "detected_frames",
         "success_rate",
     ]
+
+
+@pytest.fixture
+def rollup_conn(duckdb_conn):
+    rows = duckdb_conn.execute("SELECT * FROM interview_table").df()
+    conn = duckdb.connect(database=":memory:")
+    conn.register("rows", rows)
+    conn.execute("CREATE TABLE interview_table AS SELECT * FROM rows")
+    conn.execute("""
+    CREATE TABLE interview_table_rollup AS
+    SELECT vehicle_type, clip_name, distance,
+           CAST(COUNT(*) AS BIGINT) AS total_frames,
+           CAST(SUM(CASE WHEN detection THEN 1 ELSE 0 END) AS BIGINT) AS detected_frames
+    FROM interview_table
+    GROUP BY vehicle_type, clip_name, distance
+    """)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"distance_bin_size": 25, "min_frames": 2},
+        {"vehicle_types": ["truck"], "min_distance": 20, "max_distance": 60},
+        {"clip_names": ["clip1", "clip3"], "distance_bin_size": 5},
+    ],
+)
+def test_query_detection_stats_rollup_matches_raw(duckdb_conn, rollup_conn, params):
+    rollup_client = Client(rollup_conn)
+    assert rollup_client.has_rollup
+
+    expected = Client(duckdb_conn).query_detection_stats(**params)
+    actual = rollup_client.query_detection_stats(**params)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_query_detection_stats_frame_filter_bypasses_rollup(rollup_conn):
+    # Corrupt the rollup: frame-id filtered queries must still come from the raw rows.
+    rollup_conn.execute("UPDATE interview_table_rollup SET total_frames = 1000")
+    df = Client(rollup_conn).query_detection_stats(min_frame_id=1)
+    assert df["total_frames"].sum() == 9
+
+
+def test_query_detection_stats_cache_normalizes_filters(duckdb_conn):
+    client = Client(duckdb_conn, cache_size=4)
+
+    first = client.query_detection_stats(vehicle_types=["truck", "car"])
+    second = client.query_detection_stats(vehicle_types=["car", "truck"])
+    client.query_detection_stats(vehicle_types=None)
+    client.query_detection_stats(vehicle_types=[])
+
+    pd.testing.assert_frame_equal(first, second)
+    stats = client.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert Client(duckdb_conn).cache_stats() is None
+
+
+def test_query_detection_stats_arrow_formats(duckdb_conn):
+    import pyarrow as pa
+
+    client = Client(duckdb_conn)
+    expected = client.query_detection_stats(distance_bin_size=20)
+
+    table = client.query_detection_stats(distance_bin_size=20, result_format="arrow")
+    assert isinstance(table, pa.Table)
+    assert table.column_names == list(expected.columns)
+    pd.testing.assert_frame_equal(table.to_pandas(), expected)
+
+    reader = client.query_detection_stats(distance_bin_size=20, result_format="reader", batch_size=2)
+    assert isinstance(reader, pa.RecordBatchReader)
+    assert reader.read_all().equals(table)
+
+    records = client.query_detection_stats(distance_bin_size=20, result_format="records")
+    assert records == expected.to_dict(orient="records")
+    assert list(records[0]) == Client.RESULT_COLUMNS
+
+    with pytest.raises(ValueError, match="result_format"):
+        client.query_detection_stats(result_format="xml")
+
+
+BATCH_SPECS = [
+    {},
+    {"vehicle_types": ["car"], "distance_bin_size": 5, "max_distance": 40},
+    {"clip_names": ["clip2", "clip3"], "distance_bin_size": 25, "min_frames": 2},
+    {"min_frame_id": 2, "distance_bin_size": 20},
+    {"min_frame_id": 2, "max_frame_id": 2, "vehicle_types": ["truck"]},
+    {"vehicle_types": ["nonexistent_vehicle"]},
+    # Same rows as specs above, so raw-row specs share their scan.
+    {"vehicle_types": ["car"], "min_distance": 30},
+    {"min_frame_id": 2, "distance_bin_size": 5, "max_distance": 50, "min_frames": 2},
+    {"min_frame_id": 2, "max_frame_id": 2, "vehicle_types": ["truck", "truck"], "distance_bin_size": 50},
+]
+
+
+@pytest.mark.parametrize("use_rollup", [False, True])
+def test_query_detection_stats_batch_matches_single_queries(duckdb_conn, rollup_conn, use_rollup):
+    client = Client(rollup_conn if use_rollup else duckdb_conn)
+
+    for specs in (BATCH_SPECS, BATCH_SPECS[:3]):
+        results = client.query_detection_stats_batch(specs)
+        assert len(results) == len(specs)
+        for spec, result in zip(specs, results):
+            pd.testing.assert_frame_equal(result, client.query_detection_stats(**spec))
+
+
+def test_query_detection_stats_batch_combined(duckdb_conn):
+    client = Client(duckdb_conn)
+    combined = client.query_detection_stats_batch(BATCH_SPECS[:2], result_format="arrow", split=False)
+
+    assert combined.column_names[0] == "spec_id"
+    assert set(combined.column("spec_id").to_pylist()) == {0, 1}
+    assert client.query_detection_stats_batch([], split=False).empty
+
+    with pytest.raises(ValueError, match="Unknown query parameter"):
+        client.query_detection_stats_batch([{"vehicles": ["car"]}])
+
+
+def test_parquet_index_mode_matches_ingested_table(tmp_path):
+    from src.data_loader import DataLoader
+
+    rows = pd.DataFrame(
+        [
+            ("clip1", 1, "car", True, 5),
+            ("clip1", 2, "truck", False, 15),
+            ("clip2", 10, "car", True, 35),
+            ("clip2", 11, "bus", False, 45),
+            ("clip3", 20, "car", False, 65),
+        ],
+        columns=["clip_name", "frame_id", "vehicle_type", "detection", "distance"],
+    )
+    for i, clip in enumerate(["clip1", "clip2", "clip3"]):
+        rows[rows["clip_name"] == clip].to_parquet(tmp_path / f"part_{i}.parquet", index=False)
+
+    with DataLoader(str(tmp_path), db_path=":memory:") as loader:
+        loader.load_data()
+        index_path = loader.build_parquet_index(str(tmp_path / "index.json"))
+        ingested = Client(loader.get_connection())
+        in_place = Client.from_parquet_index(str(index_path))
+
+        assert in_place._prune_files(None, ["clip2"], None, None) == [str(tmp_path / "part_1.parquet")]
+        assert in_place._prune_files(["bus"], None, None, None) == [str(tmp_path / "part_1.parquet")]
+        assert in_place._prune_files(None, None, 12, None) == [str(tmp_path / "part_2.parquet")]
+
+        for params in [{}, {"clip_names": ["clip2"]}, {"vehicle_types": ["car"], "min_frame_id": 2}, {"max_frame_id": 0}]:
+            pd.testing.assert_frame_equal(
+                in_place.query_detection_stats(**params),
+                ingested.query_detection_stats(**params),
+            )
+        specs = [{"clip_names": ["clip1"]}, {"vehicle_types": ["bus"], "distance_bin_size": 25}]
+        for expected, actual in zip(in_place.query_detection_stats_batch(specs), [
+            ingested.query_detection_stats(**spec) for spec in specs
+        ]):
+            pd.testing.assert_frame_equal(expected, actual)
+
+
+def test_clip_index_skips_files_and_windows_no_clip_matches(tmp_path):
+    from src.data_loader import DataLoader
+
+    # Each file holds an early and a late clip, so file-level frame ranges overlap every window.
+    rows = pd.DataFrame(
+        [
+            ("clip1", 1, "car", True, 5),
+            ("clip1", 2, "bus", False, 15),
+            ("clip2", 1000, "car", True, 35),
+            ("clip3", 10, "truck", False, 45),
+            ("clip4", 2000, "car", False, 65),
+            ("clip4", 2001, "truck", True, 75),
+        ],
+        columns=["clip_name", "frame_id", "vehicle_type", "detection", "distance"],
+    )
+    for i, clips in enumerate([["clip1", "clip2"], ["clip3", "clip4"]]):
+        rows[rows["clip_name"].isin(clips)].to_parquet(tmp_path / f"part_{i}.parquet", index=False)
+
+    with DataLoader(str(tmp_path), db_path=":memory:") as loader:
+        loader.load_data()
+        index_path = loader.build_parquet_index(str(tmp_path / "index.json"))
+        ingested = Client(loader.get_connection())
+        in_place = Client.from_parquet_index(str(index_path))
+        assert ingested.has_clip_index
+
+        assert in_place._prune_files(None, None, 500, 1500) == [str(tmp_path / "part_0.parquet")]
+        assert in_place._prune_files(["truck"], None, 1500, None) == [str(tmp_path / "part_1.parquet")]
+        for client in (ingested, in_place):
+            assert client._resolve_clips(None, None, 5, 1500) == ["clip2", "clip3"]
+            assert client._resolve_clips(["bus"], None, None, 1500) == ["clip1"]
+            assert client._resolve_clips(None, ["clip1", "clip4"], 1500, None) == ["clip4"]
+            assert client._resolve_clips(None, None, 3, 9) == []
+            assert client._resolve_clips(["car"], None, None, None) is None
+
+        for params in [
+            {"min_frame_id": 5, "max_frame_id": 1500},
+            {"clip_names": ["clip1", "clip4"], "min_frame_id": 1500},
+            {"vehicle_types": ["car"], "max_frame_id": 1000},
+            {"min_frame_id": 3, "max_frame_id": 9},
+        ]:
+            expected = ingested.query_detection_stats(**params)
+            ingested.has_clip_index = False
+            pd.testing.assert_frame_equal(ingested.query_detection_stats(**params), expected)
+            ingested.has_clip_index = True
+            pd.testing.assert_frame_equal(in_place.query_detection_stats(**params), expected)
+        assert ingested.query_detection_stats(min_frame_id=3, max_frame_id=9).empty
+
+
+def test_approximate_mode_estimates_large_groups_and_answers_thin_ones_exactly(tmp_path, monkeypatch):
+    from benchmarks.generate import generate
+    from src.data_loader import DataLoader
+
+    generate(str(tmp_path), rows=60_000, files=2, clips=4, vehicle_types=3, detection_rate=0.6)
+    monkeypatch.setattr(DataLoader, "SAMPLE_MIN_STRATUM_ROWS", 0)
+    with DataLoader(str(tmp_path), db_path=":memory:", sample_rate=0.2) as loader:
+        loader.load_data()
+        conn = loader.get_connection()
+        exact = Client(conn).query_detection_stats().set_index(["vehicle_type", "clip_name", "distance_bin"])
+        client = Client(conn, approximate=True, min_samples=100)
+        approx = client.query_detection_stats().set_index(["vehicle_type", "clip_name", "distance_bin"])
+
+        assert list(approx.reset_index().columns) == client.result_columns
+        estimated, thin = approx[approx["estimated"]], approx[~approx["estimated"]]
+        assert len(estimated) and len(thin)
+        truth = exact.loc[estimated.index]
+        assert ((estimated["total_frames"] - truth["total_frames"]).abs() < 0.2 * truth["total_frames"]).all()
+        covered = (estimated["success_rate_low"] <= truth["success_rate"]) & (truth["success_rate"] <= estimated["success_rate_high"])
+        assert covered.mean() > 0.8
+        pd.testing.assert_frame_equal(
+            thin[["total_frames", "detected_frames", "success_rate"]], exact.loc[thin.index, ["total_frames", "detected_frames", "success_rate"]]
+        )
+
+    with duckdb.connect(":memory:") as conn:
+        conn.execute("CREATE TABLE interview_table (clip_name VARCHAR)")
+        with pytest.raises(ValueError, match="sample"):
+            Client(conn, approximate=True)
+
+
+def test_approximate_mode_answers_unsampled_groups_exactly(tmp_path, monkeypatch):
+    from benchmarks.generate import generate
+    from src.data_loader import DataLoader
+
+    generate(str(tmp_path), rows=20_000, files=1, clips=2, vehicle_types=2, detection_rate=0.6)
+    tiny = [("tiny_clip", i, "vehicle_0", i % 2 == 0, 15) for i in range(3)]
+    pd.DataFrame(tiny, columns=["clip_name", "frame_id", "vehicle_type", "detection", "distance"]).to_parquet(
+        tmp_path / "tiny.parquet", index=False
+    )
+    monkeypatch.setattr(DataLoader, "SAMPLE_MIN_STRATUM_ROWS", 0)
+    with DataLoader(str(tmp_path), db_path=":memory:", sample_rate=0.05) as loader:
+        loader.load_data()
+        conn = loader.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM interview_table_sample WHERE clip_name = 'tiny_clip'").fetchone() == (0,)
+
+        keys = ["vehicle_type", "clip_name", "distance_bin"]
+        exact, client = Client(conn), Client(conn, approximate=True, min_samples=5)
+        for filters in [{}, {"min_frame_id": 1}, {"min_frames": 200}]:
+            expected = exact.query_detection_stats(**filters).set_index(keys)
+            approx = client.query_detection_stats(**filters).set_index(keys)
+            assert approx.index.sort_values().equals(expected.index.sort_values())
+            # Groups estimated near min_frames are exact, so none is wrongly kept or dropped.
+            assert (approx.loc[approx["estimated"], "total_frames"] >= 2 * filters.get("min_frames", 1)).all()
+
+        row = client.query_detection_stats(clip_names=["tiny_clip"], result_format="records")
+        assert [(r["total_frames"], r["detected_frames"], r["estimated"]) for r in row] == [(3, 2, False)]
+
+
+def test_compare_detection_stats_joins_datasets_with_deltas(tmp_path):
+    from src.data_loader import DataLoader
+
+    def write(directory, car_detected, truck_rows):
+        directory.mkdir()
+        rows = [("clip1", i, "car", i < car_detected, 5) for i in range(200)] + truck_rows
+        pd.DataFrame(rows, columns=["clip_name", "frame_id", "vehicle_type", "detection", "distance"]).to_parquet(
+            directory / "part.parquet", index=False
+        )
+        return directory
+
+    baseline_dir = write(tmp_path / "baseline", 100, [("clip2", 0, "truck", True, 55)])
+    candidate_dir = write(tmp_path / "candidate", 160, [("clip3", 0, "truck", False, 55)])
+    baseline_db = str(tmp_path / "baseline.duckdb")
+    with DataLoader(str(baseline_dir), db_path=baseline_db) as loader:
+        loader.load_data()
+    with DataLoader(str(candidate_dir), db_path=":memory:") as loader:
+        index_path = loader.build_parquet_index(str(tmp_path / "candidate.json"))
+
+    client = Client(duckdb.connect(database=":memory:"))
+    expected = [
+        ("car", "clip1", 0.0, 200, 100, 0.5, 200, 160, 0.8, pytest.approx(0.3), True),
+        ("truck", "clip2", 50.0, 1, 1, 1.0, None, None, None, None, False),
+        ("truck", "clip3", 50.0, None, None, None, 1, 0, 0.0, None, False),
+    ]
+    for candidate in [str(candidate_dir), str(index_path)]:
+        records = client.compare_detection_stats(baseline_db, candidate, result_format="records")
+        assert [tuple(row[c] for c in Client.COMPARE_RESULT_COLUMNS) for row in records] == expected
+
+    # Each side is filtered exactly like query_detection_stats, min_frames included.
+    table = client.compare_detection_stats(baseline_db, str(candidate_dir), min_frames=2, result_format="arrow")
+    assert table.column_names == Client.COMPARE_RESULT_COLUMNS
+    assert table.column("vehicle_type").to_pylist() == ["car"]
+
+    # A dataset compared with itself never differs.
+    same = client.compare_detection_stats(baseline_db, baseline_db)
+    assert (same["delta"] == 0).all() and not same["significant"].any()
+
+    with pytest.raises(FileNotFoundError):
+        client.compare_detection_stats(baseline_db, str(tmp_path / "missing.duckdb"))
+
+
+@pytest.mark.parametrize("client_kwargs", [{}, {"cache_size": 8}])
+def test_query_detection_stats_orders_and_pages_in_sql(duckdb_conn, client_kwargs):
+    client = Client(duckdb_conn, **client_kwargs)
+    full = client.query_detection_stats(distance_bin_size=20)
+    keys = Client.GROUP_FIELDS + ["distance_bin"]
+
+    worst = full.sort_values(["success_rate"] + keys, ascending=[False] + [True] * 3).reset_index(drop=True)
+    top = client.query_detection_stats(distance_bin_size=20, order_by="success_rate", descending=True, limit=3)
+    pd.testing.assert_frame_equal(top, worst.head(3))
+
+    pages = [client.query_detection_stats(distance_bin_size=20, limit=2, offset=offset) for offset in range(0, len(full), 2)]
+    pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True), full)
+
+    with pytest.raises(ValueError, match="order_by"):
+        client.query_detection_stats(order_by="distance")
+    with pytest.raises(ValueError, match="offset"):
+        client.query_detection_stats(offset=-1)
+
+
+def test_iter_detection_stats_yields_chunks(duckdb_conn):
+    client = Client(duckdb_conn)
+    expected = client.query_detection_stats(result_format="records")
+
+    chunks = list(client.iter_detection_stats(batch_size=2))
+    assert [len(chunk) for chunk in chunks] == [2] * (len(expected) // 2) + [len(expected) % 2] * (len(expected) % 2)
+    assert [row for chunk in chunks for row in chunk] == expected
+    assert client.last_profile["rows"] == len(expected)
+
+    batches = list(client.iter_detection_stats(result_format="arrow", batch_size=4, order_by="total_frames", limit=5))
+    assert sum(batch.num_rows for batch in batches) == 5
+    assert batches[0].schema.names == Client.RESULT_COLUMNS
+
+    # Stopping early still publishes the profile of what was fetched.
+    stream = client.iter_detection_stats(batch_size=1)
+    next(stream)
+    stream.close()
+    assert client.last_profile["rows"] == 1
+
+
+def test_query_grouped_stats_subtotals(duckdb_conn):
+    client = Client(duckdb_conn, cache_size=8)
+    rollup = client.query_grouped_stats(["vehicle_type", "clip_name"], subtotals="rollup", result_format="records")
+
+    groups = [row for row in rollup if row["grouping_id"] == 0]
+    plain = client.query_grouped_stats(["vehicle_type", "clip_name"], result_format="records")
+    assert [{k: v for k, v in row.items() if k != "grouping_id"} for row in groups] == plain
+    # One subtotal per vehicle type, right after its clips, and the grand total last.
+    assert [(row["vehicle_type"], row["grouping_id"], row["total_frames"]) for row in rollup if row["grouping_id"]] == [
+        ("car", 1, 5), ("truck", 1, 4), (None, 3, 9)
+    ]
+    assert rollup[3]["vehicle_type"] == "car" and rollup[3]["grouping_id"] == 1
+    assert rollup[-1]["detected_frames"] == 6 and rollup[-1]["success_rate"] == pytest.approx(6 / 9)
+
+    cube = client.query_grouped_stats(["vehicle_type", "clip_name"], subtotals="cube", result_format="records")
+    per_clip = {row["clip_name"]: row["total_frames"] for row in cube if row["grouping_id"] == 2}
+    assert per_clip == {"clip1": 3, "clip2": 3, "clip3": 3}
+    assert len(cube) == len(rollup) + 3
+
+    # min_frames filters subtotals too, and a repeat is answered from the cache.
+    assert [row["grouping_id"] for row in client.query_grouped_stats(["vehicle_type"], "rollup", min_frames=5, result_format="records")] == [0, 1]
+    client.query_grouped_stats(["vehicle_type", "clip_name"], subtotals="rollup", result_format="records")
+    assert client.cache_stats()["hits"] == 1
+
+
+def test_query_grouped_stats_computed_dimensions(tmp_path):
+    from src.data_loader import DataLoader
+
+    rows = pd.DataFrame(
+        [
+            ("PNT1_Det4_210125_152642_0000_s001", 1, "car", True, 5),
+            ("PNT1_Det4_210126_101500_0000_s001", 1, "car", False, 15),
+            ("PNT1_Mega_201214_090000_0001_s002", 1, "truck", True, 25),
+            ("PNT1_Mega_201214_090000_0001_s002", 2, "car", True, 55),
+            ("unparsed", 1, "car", False, 65),
+        ],
+        columns=["clip_name", "frame_id", "vehicle_type", "detection", "distance"],
+    )
+    rows.to_parquet(tmp_path / "part.parquet", index=False)
+
+    with DataLoader(str(tmp_path), db_path=":memory:") as loader:
+        loader.load_data()
+        client = Client(loader.get_connection(), dimensions={"camera": "regexp_extract(CAST(clip_name AS VARCHAR), '_(s[0-9]+)$', 1)"})
+
+        families = client.query_grouped_stats(["clip_family"], result_format="records")
+        assert [(row["clip_family"], row["total_frames"]) for row in families] == [("PNT1_Det4", 2), ("PNT1_Mega", 2), (None, 1)]
+
+        dates = client.query_grouped_stats(["clip_date", "distance_bin"], distance_bin_size=50)
+        assert [str(d) for d in dates["clip_date"].dropna()] == ["2020-12-14", "2020-12-14", "2021-01-25", "2021-01-26"]
+        assert dates["distance_bin"].tolist() == [0, 50, 0, 0, 50]
+
+        cameras = client.query_grouped_stats(["camera"], result_format="records")
+        assert [(row["camera"], row["total_frames"]) for row in cameras] == [("", 1), ("s001", 2), ("s002", 2)]
+
+        # The rollup table answers queries without a frame window; the raw rows must agree.
+        assert client._exact_source(None, None, None, None, 1, 100)[0] != client._exact_source(None, None, 1, None, 1, 100)[0]
+        for subtotals in [None, "rollup", "cube"]:
+            pd.testing.assert_frame_equal(
+                client.query_grouped_stats(["clip_family", "vehicle_type"], subtotals),
+                client.query_grouped_stats(["clip_family", "vehicle_type"], subtotals, min_frame_id=0),
+            )
+
+
+def test_query_grouped_stats_rejects_bad_arguments(duckdb_conn):
+    client = Client(duckdb_conn)
+    with pytest.raises(ValueError, match="Unknown dimension"):
+        client.query_grouped_stats(["vehicle_type", "camera"])
+    with pytest.raises(ValueError, match="repeat"):
+        client.query_grouped_stats(["clip_name", "clip_name"])
+    with pytest.raises(ValueError, match="at least one"):
+        client.query_grouped_stats([])
+    with pytest.raises(ValueError, match="subtotals"):
+        client.query_grouped_stats(["clip_name"], subtotals="grouping sets")
+    with pytest.raises(ValueError, match="identifiers"):
+        Client(duckdb_conn, dimensions={"clip name": "clip_name"})
@@ -1,3 +1,4 @@
+import json
 import pytest
 import pandas as pd
 from pathlib import Path
@@ -104,14 +105,14 @@ def test_validate_file_accepts_good_file(parquet_interview_data):
 
 
 def test_validate_file_rejects_bad_file(tmp_path):
-    # Create parquet with invalid distance values
+    # Create parquet with a wrong distance type
     df = pd.DataFrame(
         {
             "clip_name": ["clip_001"],
             "frame_id": [1],
             "vehicle_type": ["car"],
             "detection": [True],
-            "distance": [500],
+            "distance": [50.5],
         }
     )
     bad_file = tmp_path / "bad_distance.parquet"
@@ -119,3 +120,380 @@ def test_validate_file_rejects_bad_file(tmp_path):
 
     loader = DataLoader(str(tmp_path), db_path=":memory:")
     assert loader._validate_file(bad_file) is False
+
+
+def test_validate_file_counts_out_of_range_rows(tmp_path):
+    # Out-of-range distances are quarantined row by row rather than failing the file
+    df = pd.DataFrame(
+        {
+            "clip_name": ["clip_001", "clip_001"],
+            "frame_id": [1, 2],
+            "vehicle_type": ["car", "car"],
+            "detection": [True, False],
+            "distance": [500, 20],
+        }
+    )
+    bad_file = tmp_path / "bad_distance.parquet"
+    df.to_parquet(bad_file)
+
+    loader = DataLoader(str(tmp_path), db_path=":memory:")
+    assert loader._validate_file(bad_file) is True
+    assert loader.quarantined_rows[str(bad_file)] == 1
+
+
+def _row_count(loader):
+    return loader.get_connection().execute("SELECT COUNT(*) FROM interview_table").fetchone()[0]
+
+
+def test_load_data_incremental_appends_only_new_files(parquet_interview_data, monkeypatch):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+    assert _row_count(loader) == 6
+
+    validated = []
+    original = DataLoader._validate_file
+    monkeypatch.setattr(DataLoader, "_validate_file", lambda self, f: validated.append(f.name) or original(self, f))
+
+    df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    loader.load_data("interview_table")
+
+    assert validated == ["interview_data_part_2.parquet"]
+    assert _row_count(loader) == 7
+    manifest = loader.get_connection().execute("SELECT row_count FROM interview_table_manifest ORDER BY file_id").fetchall()
+    assert manifest == [(3,), (3,), (1,)]
+
+
+def test_load_data_replaces_changed_and_drops_deleted_files(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+
+    df = pd.DataFrame([{"clip_name": "clip_009", "frame_id": 1, "vehicle_type": "bus", "detection": False, "distance": 99}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_0.parquet", index=False)
+    (parquet_interview_data / "interview_data_part_1.parquet").unlink()
+    loader.load_data("interview_table")
+
+    df = loader.get_connection().execute("SELECT * FROM interview_table").fetchdf()
+    assert len(df) == 1
+    assert df["clip_name"].tolist() == ["clip_009"]
+
+
+def test_load_data_full_rebuild(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+    loader.load_data("interview_table", full_rebuild=True)
+
+    assert _row_count(loader) == 6
+    assert loader.get_connection().execute("SELECT COUNT(*) FROM interview_table_manifest").fetchone()[0] == 2
+
+
+def test_full_rebuild_without_valid_files_keeps_existing_rows(parquet_interview_data, tmp_path):
+    db_path = str(tmp_path / "rebuild.duckdb")
+    with DataLoader(str(parquet_interview_data), db_path=db_path) as loader:
+        loader.load_data("interview_table")
+
+    bad_dir = tmp_path / "bad"
+    bad_dir.mkdir()
+    pd.DataFrame({"clip_name": ["clip_001"], "frame_id": [1]}).to_parquet(bad_dir / "incomplete.parquet")
+    with DataLoader(str(bad_dir), db_path=db_path) as loader:
+        with pytest.raises(RuntimeError, match="No valid Parquet files found"):
+            loader.load_data("interview_table", full_rebuild=True)
+
+        assert _row_count(loader) == 6
+        assert loader.verify("interview_table") == 6
+
+
+def test_load_data_replaces_pre_manifest_table_only_after_validation(parquet_interview_data, tmp_path):
+    loader = DataLoader(str(tmp_path), db_path=":memory:")
+    conn = loader.get_connection()
+    conn.execute("CREATE TABLE interview_table AS SELECT 'clip_009' AS clip_name, 1 AS frame_id")
+    pd.DataFrame({"clip_name": ["clip_001"], "frame_id": [1]}).to_parquet(tmp_path / "incomplete.parquet")
+
+    with pytest.raises(RuntimeError, match="No valid Parquet files found"):
+        loader.load_data("interview_table")
+    assert conn.execute("SELECT clip_name FROM interview_table").fetchall() == [("clip_009",)]
+
+    loader.data_path = parquet_interview_data
+    loader.load_data("interview_table")
+    assert _row_count(loader) == 6
+
+
+def _write_distances(path, distances, write_statistics=True):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    n = len(distances)
+    table = pa.table(
+        {
+            "clip_name": pa.array(["clip_001"] * n, pa.string()),
+            "frame_id": pa.array(range(n), pa.int64()),
+            "vehicle_type": pa.array(["car"] * n, pa.string()),
+            "detection": pa.array([True] * n, pa.bool_()),
+            "distance": pa.array(distances, pa.int64()),
+        }
+    )
+    pq.write_table(table, path, write_statistics=write_statistics, row_group_size=2)
+
+
+def test_validate_file_uses_footer_statistics(tmp_path, monkeypatch):
+    good_file = tmp_path / "good.parquet"
+    _write_distances(good_file, [1, 50, 100, 7])
+
+    def fail_read(*args, **kwargs):
+        raise AssertionError("column should not be scanned when statistics are present")
+
+    monkeypatch.setattr("pyarrow.parquet.ParquetFile.iter_batches", fail_read)
+    loader = DataLoader(str(tmp_path), db_path=":memory:")
+    assert loader._validate_file(good_file) is True
+    assert str(good_file) in loader.validation_timings
+
+
+def test_validate_file_scans_column_without_statistics(tmp_path, monkeypatch):
+    good_file = tmp_path / "good.parquet"
+    bad_file = tmp_path / "bad.parquet"
+    _write_distances(good_file, [1, 50, 100, 7], write_statistics=False)
+    _write_distances(bad_file, [1, 50, 0, 7, None, 101], write_statistics=False)
+
+    # Batches smaller than a row group still count every row.
+    monkeypatch.setattr(DataLoader, "VALIDATION_BATCH_ROWS", 1)
+    loader = DataLoader(str(tmp_path), db_path=":memory:")
+    assert loader._validate_file(good_file) is True
+    assert loader._validate_file(bad_file) is True
+    assert loader.quarantined_rows == {str(good_file): 0, str(bad_file): 3}
+
+
+@pytest.mark.parametrize("executor", DataLoader.VALIDATION_EXECUTORS)
+def test_validate_files_in_pool(tmp_path, executor):
+    _write_distances(tmp_path / "a.parquet", [1, 2])
+    _write_distances(tmp_path / "b.parquet", [101, 2])
+    _write_distances(tmp_path / "c.parquet", [3, 4])
+    (tmp_path / "d.parquet").write_text("not parquet")
+
+    loader = DataLoader(str(tmp_path), db_path=":memory:", validation_workers=2, validation_executor=executor)
+    valid = loader._validate_files(sorted(tmp_path.glob("*.parquet")))
+
+    assert [f.name for f in valid] == ["a.parquet", "b.parquet", "c.parquet"]
+    assert loader.quarantined_rows[str(tmp_path / "b.parquet")] == 1
+    assert len(loader.validation_timings) == 4
+
+
+def test_load_data_maintains_rollup_incrementally(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+
+    df = pd.DataFrame([{"clip_name": "clip_001", "frame_id": 9, "vehicle_type": "car", "detection": False, "distance": 30}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    (parquet_interview_data / "interview_data_part_1.parquet").unlink()
+    loader.load_data("interview_table")
+
+    conn = loader.get_connection()
+    rollup = conn.execute(
+        "SELECT * FROM interview_table_rollup ORDER BY vehicle_type, clip_name, distance"
+    ).fetchall()
+    expected = conn.execute(
+        """
+        SELECT vehicle_type, clip_name, distance, COUNT(*), SUM(CASE WHEN detection THEN 1 ELSE 0 END)
+        FROM interview_table
+        GROUP BY ALL
+        ORDER BY vehicle_type, clip_name, distance
+        """
+    ).fetchall()
+    assert rollup == expected
+    assert ("car", "clip_001", 30, 2, 1) in rollup
+
+
+def test_load_data_maintains_clip_index(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+
+    df = pd.DataFrame([
+        {"clip_name": "clip_003", "frame_id": 100, "vehicle_type": "car", "detection": True, "distance": 5},
+        {"clip_name": "clip_003", "frame_id": 140, "vehicle_type": "bus", "detection": False, "distance": 7},
+    ])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    (parquet_interview_data / "interview_data_part_0.parquet").unlink()
+    loader.load_data("interview_table")
+
+    conn = loader.get_connection()
+    clip_index = conn.execute(
+        "SELECT clip_name, min_frame_id, max_frame_id, row_count, vehicle_types "
+        "FROM interview_table_clip_index ORDER BY clip_name"
+    ).fetchall()
+    assert clip_index == [
+        ("clip_001", 1, 2, 2, ["car", "truck"]),
+        ("clip_002", 3, 3, 1, ["bike"]),
+        ("clip_003", 100, 140, 2, ["bus", "car"]),
+    ]
+    assert loader.verify("interview_table") == 5
+
+
+def test_load_data_bumps_data_version_and_invalidates_client_cache(parquet_interview_data):
+    from src.client import Client
+
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+    client = Client(loader.get_connection(), cache_size=8)
+    assert client.data_version() == 1
+
+    assert len(client.query_detection_stats()) == 3
+    loader.load_data("interview_table")
+    assert client.data_version() == 1
+    client.query_detection_stats()
+    assert client.cache_stats()["hits"] == 1
+
+    df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    loader.load_data("interview_table")
+
+    assert client.data_version() == 2
+    assert len(client.query_detection_stats()) == 4
+    assert client.cache_stats()["invalidations"] == 1
+
+
+def test_build_parquet_index_skips_invalid_files(parquet_interview_data):
+    (parquet_interview_data / "bad.parquet").write_text("this is not a parquet file")
+
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    index_path = loader.build_parquet_index()
+
+    files = json.loads(index_path.read_text())["files"]
+    assert [Path(entry["path"]).name for entry in files] == [
+        "interview_data_part_0.parquet",
+        "interview_data_part_1.parquet",
+    ]
+    assert files[0]["clip_names"] == ["clip_001", "clip_002"]
+    assert files[0]["vehicle_types"] == ["bike", "car", "truck"]
+    assert (files[0]["min_frame_id"], files[0]["max_frame_id"], files[0]["num_rows"]) == (1, 3, 3)
+    assert files[0]["clips"] == [
+        {"clip_name": "clip_001", "min_frame_id": 1, "max_frame_id": 2, "num_rows": 2, "vehicle_types": ["car", "truck"]},
+        {"clip_name": "clip_002", "min_frame_id": 3, "max_frame_id": 3, "num_rows": 1, "vehicle_types": ["bike"]},
+    ]
+    assert not loader._table_exists("interview_table")
+
+
+def test_clustered_load_uses_compact_sorted_layout(parquet_interview_data):
+    from src.client import Client
+
+    plain = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    plain.load_data("interview_table")
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:", clustered=True)
+    loader.load_data("interview_table")
+
+    conn = loader.get_connection()
+    types = dict(conn.execute(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'interview_table'"
+    ).fetchall())
+    assert types["clip_name"].startswith("ENUM") and types["vehicle_type"].startswith("ENUM")
+    assert types["distance"] == "UTINYINT"
+    keys = conn.execute("SELECT clip_name::VARCHAR, vehicle_type::VARCHAR, frame_id FROM interview_table").fetchall()
+    assert keys == sorted(keys)
+    assert {"bytes_before", "bytes_after", "clip_frame_filter_ms_after"} <= set(loader.layout_report)
+
+    expected, client = Client(plain.get_connection()), Client(conn)
+    for filters in [{}, {"clip_names": ["clip_001", "missing"]}, {"vehicle_types": ["car"], "min_frame_id": 2}]:
+        pd.testing.assert_frame_equal(client.query_detection_stats(**filters), expected.query_detection_stats(**filters))
+
+
+def test_clustered_load_clusters_an_unchanged_table(parquet_interview_data, tmp_path):
+    db_path = str(tmp_path / "interview.duckdb")
+    with DataLoader(str(parquet_interview_data), db_path=db_path) as loader:
+        loader.load_data("interview_table")
+        version = loader.data_version()
+
+    with DataLoader(str(parquet_interview_data), db_path=db_path, clustered=True) as loader:
+        loader.load_data("interview_table")
+        assert loader._is_compact("interview_table")
+        assert loader.data_version() > version
+        assert loader.verify() == 6
+
+
+def test_watch_rejects_clustered_loader(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:", clustered=True)
+    with pytest.raises(ValueError, match="re-cluster"):
+        loader.watch("interview_table", max_polls=1)
+
+
+def test_clustered_load_extends_enums_for_new_values(parquet_interview_data):
+    from src.client import Client
+
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:", clustered=True)
+    loader.load_data("interview_table")
+    client = Client(loader.get_connection())
+    assert client.query_detection_stats(clip_names=["clip_003"]).empty
+
+    df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "bus", "detection": True, "distance": 5}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    loader.load_data("interview_table")
+
+    result = client.query_detection_stats(clip_names=["clip_003"], vehicle_types=["bus"])
+    assert result[["vehicle_type", "clip_name", "total_frames"]].values.tolist() == [["bus", "clip_003", 1]]
+    assert loader._is_compact("interview_table")
+
+
+def test_watch_loads_settled_files_and_skips_rejected_ones(parquet_interview_data, monkeypatch):
+    import os
+    import time
+
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.watch("interview_table", max_polls=1, min_file_age=0)
+    assert _row_count(loader) == 6
+    assert loader.last_profile["rows_per_sec"] > 0
+    assert loader.last_profile["max_lag_s"] >= 0
+
+    fresh = parquet_interview_data / "interview_data_part_2.parquet"
+    pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}]).to_parquet(fresh, index=False)
+    (parquet_interview_data / "bad.parquet").write_text("not parquet")
+    loader.watch("interview_table", max_polls=1, min_file_age=60)
+    assert _row_count(loader) == 6
+    assert loader.last_profile["loaded_files"] == 0
+
+    old = time.time() - 120
+    os.utime(fresh, (old, old))
+    os.utime(parquet_interview_data / "bad.parquet", (old, old))
+    loader.watch("interview_table", max_polls=1, min_file_age=60)
+    assert _row_count(loader) == 7
+    assert str(parquet_interview_data / "bad.parquet") in loader.rejected_files
+
+    validated = []
+    monkeypatch.setattr(loader, "_validate_file", lambda f: validated.append(f) or False)
+    loader.watch("interview_table", max_polls=2, interval=0, min_file_age=60)
+    assert validated == []
+
+
+def test_load_data_maintains_stratified_sample(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:", sample_rate=0.5)
+    loader.load_data("interview_table")
+    conn = loader.get_connection()
+    sample = "SELECT file_id, clip_name, frame_id, weight FROM interview_table_sample ORDER BY ALL"
+    # Every stratum is below SAMPLE_MIN_STRATUM_ROWS, so it is kept whole.
+    assert conn.execute("SELECT COUNT(*), SUM(weight) FROM interview_table_sample").fetchone() == (6, 6.0)
+
+    (parquet_interview_data / "interview_data_part_1.parquet").unlink()
+    loader.load_data("interview_table")
+    assert [row[0] for row in conn.execute(sample).fetchall()] == [1, 1, 1]
+
+    loader.sample_rate = None
+    loader.load_data("interview_table")
+    assert conn.execute("SELECT sample_rate FROM interview_table_sample_rate").fetchone()[0] == 0.5
+    assert len(conn.execute(sample).fetchall()) == 3
+
+
+def test_load_data_quarantines_out_of_range_rows(parquet_interview_data):
+    _write_distances(parquet_interview_data / "mixed.parquet", [5, 0, 100, None, 250])
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+    conn = loader.get_connection()
+
+    assert loader.verify("interview_table") == 8
+    assert conn.execute("SELECT COUNT(*) FROM interview_table WHERE clip_name = 'clip_001' AND vehicle_type = 'car' AND frame_id IN (0, 2)").fetchone()[0] == 2
+    quarantine = conn.execute(
+        "SELECT file_row_number, distance, reason FROM interview_table_quarantine ORDER BY file_row_number"
+    ).fetchall()
+    assert quarantine == [(1, 0, "distance 0 outside 1 to 100"), (3, None, "distance is null"), (4, 250, "distance 250 outside 1 to 100")]
+    files = {Path(f["path"]).name: f for f in loader.last_profile["files"]}
+    assert (files["mixed.parquet"]["rows"], files["mixed.parquet"]["quarantined_rows"]) == (2, 3)
+    assert loader.last_profile["quarantined_rows"] == 3
+
+    (parquet_interview_data / "mixed.parquet").unlink()
+    loader.load_data("interview_table")
+    assert conn.execute("SELECT COUNT(*) FROM interview_table_quarantine").fetchone()[0] == 0
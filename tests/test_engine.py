@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from src.client import Client
+from src.data_loader import DataLoader
+from src.engine import ProcessEngine
+from tests.test_data_loader import parquet_interview_data
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    with ProcessEngine(workers=2, memory_limit="256MB", temp_directory=str(tmp_path_factory.mktemp("spill"))) as engine:
+        yield engine
+
+
+def test_process_engine_matches_single_connection(parquet_interview_data, engine):
+    df = pd.DataFrame(
+        [("clip_002", 7, "car", False, 12), ("clip_003", 1, "bus", True, 99)],
+        columns=["clip_name", "frame_id", "vehicle_type", "detection", "distance"],
+    )
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    index_path = DataLoader(str(parquet_interview_data), db_path=":memory:").build_parquet_index()
+
+    expected = Client.from_parquet_index(str(index_path))
+    client = Client.from_parquet_index(str(index_path), engine=engine)
+    for params in [
+        {},
+        {"min_frames": 2},
+        {"vehicle_types": ["car"], "distance_bin_size": 7},
+        {"clip_names": ["clip_002"], "min_frame_id": 2},
+        {"clip_names": ["missing"]},
+    ]:
+        pd.testing.assert_frame_equal(client.query_detection_stats(**params), expected.query_detection_stats(**params))
+    assert list(client.last_profile["phases_ms"])[:2] == ["map", "build"]
+
+    engine.files_per_task = 2
+    assert engine.shards(["a", "b", "c"]) == [["a", "b"], ["c"]]
+    assert client.query_detection_stats(result_format="reader").read_all().equals(
+        expected.query_detection_stats(result_format="arrow")
+    )
+
+
+def test_process_engine_applies_worker_settings(engine):
+    (settings,) = engine.map([("SELECT current_setting('memory_limit') AS m, current_setting('threads') AS t", [])])
+    assert settings.to_pylist() == [{"m": "244.1 MiB", "t": 1}]
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", code], cwd=SRC_PATH, capture_output=True, text=True)
+
+
+def test_cli_startup_does_not_import_heavy_modules():
+    result = _run(
+        "import json, sys\n"
+        "sys.argv = ['main.py', '--min-frames', '0']\n"
+        "import main\n"
+        "try:\n"
+        "    main.main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(json.dumps(sorted({'pandas', 'pyarrow', 'numpy', 'duckdb'} & set(sys.modules))))"
+    )
+    assert "--min-frames must be at least 1" in result.stderr
+    assert json.loads(result.stdout) == []
+
+
+def test_compare_argument_errors_do_not_import_heavy_modules():
+    result = _run(
+        "import json, sys\n"
+        "sys.argv = ['main.py', 'compare', '--baseline', 'a.duckdb', '--candidate', 'b.duckdb', '--confidence', '1.5']\n"
+        "import main\n"
+        "try:\n"
+        "    main.main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(json.dumps(sorted({'pandas', 'pyarrow', 'numpy', 'duckdb'} & set(sys.modules))))"
+    )
+    assert "--confidence must be between 0 and 1" in result.stderr
+    assert json.loads(result.stdout) == []
@@ -0,0 +1,68 @@
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.output import format_table, iter_table, write_result
+
+
+@pytest.fixture
+def reader():
+    table = pa.table({"vehicle_type": ["car", "truck", "car"], "total_frames": [3, 1, 2], "success_rate": [0.5, 1.0, 0.0]})
+    return pa.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=2))
+
+
+def test_write_result_csv(reader):
+    sink = io.BytesIO()
+    assert write_result(reader, "csv", sink) == 3
+    lines = sink.getvalue().decode().splitlines()
+    assert lines[0] == '"vehicle_type","total_frames","success_rate"'
+    assert lines[2] == '"truck",1,1'
+
+
+def test_write_result_json(reader):
+    sink = io.BytesIO()
+    write_result(reader, "json", sink)
+    rows = [json.loads(line) for line in sink.getvalue().decode().splitlines()]
+    assert rows[1] == {"vehicle_type": "truck", "total_frames": 1, "success_rate": 1.0}
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_write_result_binary_round_trip(reader, output_format):
+    sink = io.BytesIO()
+    write_result(reader, output_format, sink)
+    sink.seek(0)
+    table = pq.read_table(sink) if output_format == "parquet" else pa.ipc.open_stream(sink).read_all()
+    assert table.column("total_frames").to_pylist() == [3, 1, 2]
+
+
+def test_write_result_rejects_table_format(reader):
+    with pytest.raises(ValueError):
+        write_result(reader, "table", io.BytesIO())
+
+
+def test_format_table_matches_pandas_to_string():
+    import pandas as pd
+
+    df = pd.DataFrame({
+        "vehicle_type": ["car", "truck"] * 6,
+        "distance_bin": [0.0, 10.0] * 6,
+        "total_frames": [3, 1200] * 6,
+        "success_rate": [0.5, 0.25] * 5 + [1.0, 0.123456789],
+    })
+    assert format_table(list(df.columns), df.to_dict(orient="records")) == df.to_string()
+    assert format_table(list(df.columns), []) == df.iloc[:0].to_string()
+
+
+def test_iter_table_prints_chunks_with_one_header():
+    columns = ["vehicle_type", "total_frames"]
+    rows = [{"vehicle_type": "car", "total_frames": i} for i in range(12)]
+    assert list(iter_table(columns, [rows])) == [format_table(columns, rows)]
+    assert list(iter_table(columns, iter([]))) == [format_table(columns, [])]
+
+    lines = "\n".join(iter_table(columns, [rows[:4], [], rows[4:]])).splitlines()
+    assert len(lines) == 13 and lines[0] == format_table(columns, rows[:4]).splitlines()[0]
+    assert [line.split()[0] for line in lines[1:]] == [str(i) for i in range(12)]
+    assert [line.split()[-1] for line in lines[1:]] == [str(i) for i in range(12)]
@@ -0,0 +1,74 @@
+import pandas as pd
+
+# Imported the way src modules import each other, so listeners see what Client publishes.
+import profiling
+from src.client import Client
+from src.data_loader import DataLoader
+
+from tests.test_data_loader import parquet_interview_data
+from tests.test_utils import duckdb_conn
+
+
+def test_phase_timer_accumulates_repeated_phases():
+    timer = profiling.PhaseTimer()
+    with timer.phase("execute"):
+        pass
+    timer.add("execute", 2.0)
+    timer.add("fetch", 1.0)
+    assert list(timer.phases_ms) == ["execute", "fetch"]
+    assert timer.phases_ms["execute"] >= 2.0
+
+
+def test_query_publishes_phases_and_explain_analyze(duckdb_conn):
+    events = []
+    unsubscribe = profiling.subscribe(events.append)
+    try:
+        client = Client(duckdb_conn, profile=True)
+        result = client.query_detection_stats(clip_names=["clip1"], min_frame_id=2)
+    finally:
+        unsubscribe()
+    assert events == [client.last_profile]
+    client.query_detection_stats()
+    assert len(events) == 1
+
+    event = events[0]
+    assert event["event"] == "query" and event["rows"] == len(result) == 2
+    assert event["cache"] == "disabled"
+    assert set(event["phases_ms"]) == {"build", "execute", "fetch", "convert"}
+    explain = event["explain_analyze"]
+    assert explain["rows_returned"] == 2 and explain["rows_scanned"] == 9
+    assert 0 < explain["planning_ms"] < explain["latency_ms"]
+    assert any(op["operator"] == "TABLE_SCAN" for op in explain["operators"])
+
+
+def test_profiled_reader_still_streams_every_row(duckdb_conn):
+    client = Client(duckdb_conn, profile=True)
+    expected = Client(duckdb_conn).query_detection_stats(result_format="arrow")
+
+    reader = client.query_detection_stats(result_format="reader")
+    assert reader.read_all().equals(expected)
+    assert client.last_profile["cache"] == "bypass"
+    assert "explain_analyze" in client.last_profile
+
+
+def test_load_profile_reports_each_file(parquet_interview_data):
+    loader = DataLoader(str(parquet_interview_data), db_path=":memory:")
+    loader.load_data("interview_table")
+    assert loader.last_profile["loaded_rows"] == 6
+    assert {"prepare", "plan", "validate", "insert", "rollup", "commit"} <= set(loader.last_profile["phases_ms"])
+
+    pd.DataFrame([{"clip_name": "c", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 500}]).to_parquet(
+        parquet_interview_data / "interview_data_part_2.parquet", index=False
+    )
+    (parquet_interview_data / "interview_data_part_1.parquet").unlink()
+    loader.load_data("interview_table")
+
+    files = {f["path"].rsplit("/", 1)[-1]: f for f in loader.last_profile["files"]}
+    assert {name: f["status"] for name, f in files.items()} == {
+        "interview_data_part_0.parquet": "unchanged",
+        "interview_data_part_1.parquet": "dropped",
+        "interview_data_part_2.parquet": "loaded",
+    }
+    assert (files["interview_data_part_2.parquet"]["rows"], files["interview_data_part_2.parquet"]["quarantined_rows"]) == (0, 1)
+    assert files["interview_data_part_2.parquet"]["validate_ms"] is not None
+    assert files["interview_data_part_2.parquet"]["hash_ms"] is not None
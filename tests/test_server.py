@@ -0,0 +1,103 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.data_loader import DataLoader
+from src.server import create_server, parse_filters
+
+from tests.test_data_loader import parquet_interview_data
+
+
+@pytest.fixture
+def server_url(parquet_interview_data, tmp_path):
+    db_path = str(tmp_path / "interview.duckdb")
+    with DataLoader(str(parquet_interview_data), db_path=db_path) as loader:
+        loader.load_data("interview_table")
+
+    server = create_server(db_path, port=0, pool_size=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url):
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def test_server_health_and_query(server_url):
+    assert _get(f"{server_url}/health") == {"status": "ok"}
+
+    payload = _get(f"{server_url}/query?vehicles=car&vehicles=truck&min_frames=2")
+    assert payload["columns"][-1] == "success_rate"
+    assert {row["vehicle_type"] for row in payload["rows"]} == {"car", "truck"}
+    assert all(row["total_frames"] >= 2 for row in payload["rows"])
+
+
+def test_server_post_matches_get(server_url):
+    body = _post(f"{server_url}/query", {"clip_names": ["clip_002"], "distance_bin_size": 5})
+    assert body == _get(f"{server_url}/query?clip-names=clip_002&distance-bin-size=5")
+    assert [row["distance_bin"] for row in body["rows"]] == [10]
+
+
+def test_server_rejects_invalid_filters(server_url):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _post(f"{server_url}/query", {"min_distance": 50, "max_distance": 10})
+    assert excinfo.value.code == 400
+    assert "--max-distance" in json.load(excinfo.value)["error"]
+
+
+def test_parse_filters():
+    args = parse_filters({"vehicles": "car", "min-frame-id": "3"})
+    assert args.vehicles == ["car"]
+    assert args.min_frame_id == 3
+    assert args.distance_bin_size == 10
+
+    with pytest.raises(ValueError, match="Unknown parameter"):
+        parse_filters({"limit": 5})
+
+
+def test_server_watch_ingests_new_files_while_serving(parquet_interview_data, tmp_path):
+    import time
+
+    import pandas as pd
+
+    server = create_server(
+        str(tmp_path / "interview.duckdb"), port=0, pool_size=2,
+        watch_path=str(parquet_interview_data), poll_interval=0.05, min_file_age=0,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert {row["clip_name"] for row in _get(f"{url}/query")["rows"]} == {"clip_001", "clip_002"}
+
+        df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}])
+        df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            rows = _get(f"{url}/query?clip_names=clip_003")["rows"]
+            if rows:
+                break
+            time.sleep(0.05)
+        assert rows == [{
+            "vehicle_type": "car", "clip_name": "clip_003", "distance_bin": 0.0,
+            "total_frames": 1, "detected_frames": 1, "success_rate": 1.0,
+        }]
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not server.ingest.is_alive()
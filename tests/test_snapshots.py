@@ -0,0 +1,148 @@
+import pandas as pd
+import pytest
+
+from src.client import Client
+from src.data_loader import DataLoader
+from src.snapshots import SnapshotStore, resolve
+from tests.test_data_loader import parquet_interview_data
+
+
+def _load_snapshot(store, data_path):
+    path = store.prepare()
+    with DataLoader(str(data_path), db_path=str(path)) as loader:
+        loader.load_data()
+        rows = loader.verify()
+    store.publish(path)
+    return rows
+
+
+def test_snapshots_publish_atomically_and_roll_back(parquet_interview_data, tmp_path):
+    db_path = tmp_path / "interview_table.duckdb"
+    store = SnapshotStore(str(db_path), keep=2)
+
+    assert _load_snapshot(store, parquet_interview_data) == 6
+    assert resolve(str(db_path)) == str(store.snapshots()[0])
+    reader = Client.open(str(db_path))
+
+    df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    # The new snapshot is written while the reader holds the current one open.
+    assert _load_snapshot(store, parquet_interview_data) == 7
+    assert reader.query_detection_stats()["total_frames"].sum() == 6
+    assert Client.open(str(db_path)).query_detection_stats()["total_frames"].sum() == 7
+
+    _load_snapshot(store, parquet_interview_data)
+    assert [path.name for path in store.snapshots()] == ["000002.duckdb", "000003.duckdb"]
+    # Pruning removed the file the reader has open; it keeps reading it until closed.
+    assert reader.query_detection_stats()["total_frames"].sum() == 6
+
+    assert store.rollback().name == "000002.duckdb"
+    assert store.current() == store.snapshots()[0]
+    with pytest.raises(ValueError, match="older snapshot"):
+        store.rollback()
+
+
+def test_verify_rejects_mismatched_counts(parquet_interview_data):
+    with DataLoader(str(parquet_interview_data), db_path=":memory:") as loader:
+        loader.load_data()
+        loader.conn.execute("DELETE FROM interview_table_rows WHERE frame_id = 1")
+        with pytest.raises(RuntimeError, match="Row count check failed"):
+            loader.verify()
+
+
+def test_load_snapshot_publishes_sample_only_changes(parquet_interview_data, tmp_path, monkeypatch, capsys):
+    import argparse
+
+    from src import setup_db
+
+    db_path = tmp_path / "interview_table.duckdb"
+    monkeypatch.setattr(setup_db, "DB_PATH", str(db_path))
+    args = argparse.Namespace(keep_snapshots=3, full_rebuild=False, profile=False)
+    loader_kwargs = {"data_path": str(parquet_interview_data)}
+
+    setup_db.load_snapshot(args, loader_kwargs)
+    setup_db.load_snapshot(args, loader_kwargs)
+    assert "No changes" in capsys.readouterr().out
+    assert SnapshotStore(str(db_path)).current().name == "000001.duckdb"
+
+    # Only the sample rate changes, and the resampled snapshot is still published.
+    setup_db.load_snapshot(args, dict(loader_kwargs, sample_rate=0.5))
+    assert SnapshotStore(str(db_path)).current().name == "000002.duckdb"
+    assert Client.open(str(db_path), approximate=True).query_detection_stats()["total_frames"].sum() > 0
+
+
+def test_pools_follow_published_snapshots(parquet_interview_data, tmp_path):
+    import asyncio
+
+    from src.async_client import AsyncClient
+    from src.server import ClientPool
+
+    db_path = tmp_path / "interview_table.duckdb"
+    store = SnapshotStore(str(db_path))
+    _load_snapshot(store, parquet_interview_data)
+    pool = ClientPool(str(db_path), size=2)
+    async_client = AsyncClient.open(str(db_path), pool_size=2)
+
+    def pool_total():
+        with pool.client() as client:
+            return client.query_detection_stats()["total_frames"].sum()
+
+    def async_total():
+        return asyncio.run(async_client.query_detection_stats())["total_frames"].sum()
+
+    assert pool_total() == async_total() == 6
+    with pool.client() as busy:
+        df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}])
+        df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+        _load_snapshot(store, parquet_interview_data)
+
+        assert pool_total() == async_total() == 7
+        # A query already holding a Client of the old snapshot finishes on it.
+        assert busy.query_detection_stats()["total_frames"].sum() == 6
+        assert len(pool._retired) == 1
+    assert pool._retired == [] and async_client._retired == []
+    assert pool_total() == 7
+
+    pool.close()
+    async_client.close()
+
+
+def test_async_client_switches_snapshot_once_off_the_event_loop(parquet_interview_data, tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    from src.async_client import AsyncClient
+
+    db_path = tmp_path / "interview_table.duckdb"
+    store = SnapshotStore(str(db_path))
+    _load_snapshot(store, parquet_interview_data)
+    async_client = AsyncClient.open(str(db_path), pool_size=2)
+    connect_threads = []
+    connect = AsyncClient._connect
+
+    def recording_connect(self, snapshot):
+        connect_threads.append(threading.current_thread().name)
+        return connect(self, snapshot)
+
+    monkeypatch.setattr(AsyncClient, "_connect", recording_connect)
+    df = pd.DataFrame([{"clip_name": "clip_003", "frame_id": 1, "vehicle_type": "car", "detection": True, "distance": 5}])
+    df.to_parquet(parquet_interview_data / "interview_data_part_2.parquet", index=False)
+    _load_snapshot(store, parquet_interview_data)
+
+    async def gather_totals():
+        results = await asyncio.gather(*(async_client.query_detection_stats() for _ in range(6)))
+        return [result["total_frames"].sum() for result in results]
+
+    assert asyncio.run(gather_totals()) == [7] * 6
+    assert len(connect_threads) == 1 and connect_threads[0].startswith("async-client")
+    assert async_client._retired == []
+    async_client.close()
+
+
+def test_watch_refuses_snapshot_pointer(parquet_interview_data, tmp_path):
+    from src.server import create_server
+
+    db_path = tmp_path / "interview_table.duckdb"
+    _load_snapshot(SnapshotStore(str(db_path)), parquet_interview_data)
+    with pytest.raises(ValueError, match="snapshot pointer"):
+        create_server(str(db_path), port=0, watch_path=str(parquet_interview_data))
@@ -1,6 +1,8 @@
 import pytest
 import duckdb
 
+from src.utils import load_specs
+
 
 @pytest.fixture(scope="module")
 def duckdb_conn():
@@ -36,3 +38,18 @@ def duckdb_conn():
     yield conn
 
     conn.close()
+
+
+def test_load_specs_json_and_yaml(tmp_path):
+    json_file = tmp_path / "specs.json"
+    json_file.write_text('[{"vehicles": ["car"], "distance_bin_size": 25}, {}]')
+    yaml_file = tmp_path / "specs.yaml"
+    yaml_file.write_text("- vehicles: [car]\n  distance-bin-size: 25\n- {}\n")
+
+    assert load_specs(str(json_file)) == load_specs(str(yaml_file))
+    assert load_specs(str(json_file))[0].distance_bin_size == 25
+
+    bad_file = tmp_path / "bad.json"
+    bad_file.write_text('[{"max_distance": 0}]')
+    with pytest.raises(ValueError, match="Spec 0"):
+        load_specs(str(bad_file))